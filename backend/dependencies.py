@@ -4,12 +4,14 @@ from fastapi import HTTPException
 from databricks.sdk import WorkspaceClient
 from functools import lru_cache
 
+from backend.util.api_call_controls import install_api_call_controls
+
 logger = logging.getLogger(__name__)
 
 @lru_cache(maxsize=1)
 def create_workspace_client():
     logger.info("Creating new WorkspaceClient instance")
-    return WorkspaceClient()
+    return install_api_call_controls(WorkspaceClient())
 
 def get_workspace_client():
     client = create_workspace_client()
@@ -22,7 +24,7 @@ def get_workspace_client_with_env_vars():
     Returns a WorkspaceClient instance or raises an HTTPException.
     """
     try:
-        client = WorkspaceClient()
+        client = install_api_call_controls(WorkspaceClient())
         logger.info("Successfully created WorkspaceClient with default credentials")
         return client
     except Exception as e:
@@ -36,7 +38,7 @@ def get_workspace_client_with_env_vars():
                 detail="Missing required Databricks credentials. Please check environment variables."
             )
         try:
-            client = WorkspaceClient(host=host, token=token)
+            client = install_api_call_controls(WorkspaceClient(host=host, token=token))
             logger.info("Successfully created WorkspaceClient with environment variables")
             return client
         except Exception as e:
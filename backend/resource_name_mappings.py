@@ -47,7 +47,6 @@ def get_resource_name_mappings(client: WorkspaceClient):
         return {}
 
 def update_resource_name_mappings(client: WorkspaceClient, mappings: dict):
-    client = WorkspaceClient()
     config = {"compute_name_mappings": mappings}
     try:
         config_content = json.dumps(config, indent=2)
@@ -4,6 +4,7 @@ from .api_export_router import router as export_router
 from .api_validation_router import router as import_validation_router
 from .api_import_router import router as import_router
 from .api_delete_router import router as delete_router
+from .api_task_events_router import router as task_events_router
 
 # Create the main API router
 router = APIRouter()
@@ -14,3 +15,4 @@ router.include_router(export_router)
 router.include_router(import_validation_router)
 router.include_router(import_router)
 router.include_router(delete_router)
+router.include_router(task_events_router)
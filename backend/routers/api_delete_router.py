@@ -1,5 +1,4 @@
 from fastapi import APIRouter, HTTPException, Depends
-from threading import Thread
 import uuid
 import logging
 from databricks.sdk import WorkspaceClient
@@ -7,12 +6,15 @@ from databricks.sdk import WorkspaceClient
 from backend.dependencies import get_workspace_client
 from backend.schemas.tasks import DeleteTaskRequest, DeleteTaskResponse, DeleteStatusResponse, JobDeleteStatus
 from backend.task_manager import TaskManager
+from backend.task_scheduler import TaskScheduler, TaskQueueFullError
 from backend.worker_jobs_delete import JobDeleteTaskComponent
+from backend.util.artifact_store import get_artifact_store
 
 router = APIRouter(prefix="/api")
 logger = logging.getLogger(__name__)
 
 task_manager = TaskManager()
+task_scheduler = TaskScheduler()
 
 
 @router.post("/delete/start", response_model=DeleteTaskResponse)
@@ -20,32 +22,39 @@ async def start_delete(
     request: DeleteTaskRequest,
     client: WorkspaceClient = Depends(get_workspace_client)
 ):
-    # Check for any existing running delete tasks
-    running_tasks = [task for task_id, task in task_manager.tasks.items() 
-                    if isinstance(task, JobDeleteTaskComponent) and task.status == 'running']
-    if running_tasks:
+    artifact_set = get_artifact_store().open_set(request.artifactSetId)
+    if artifact_set is None:
+        raise HTTPException(status_code=410, detail="Validated job definitions are no longer available, please validate again")
+
+    delete_task_id = str(uuid.uuid4())
+    # Only one deletion runs at a time, in all the app processes
+    if not task_manager.acquire_run_lock('delete', delete_task_id):
         logger.warning("Attempted to start new deletion while another deletion is running")
         raise HTTPException(
             status_code=409,
             detail="Another delete task is currently running. Please wait for it to complete."
         )
-
-    delete_task_id = str(uuid.uuid4())
-    logger.info(f"Starting new delete task with ID: {delete_task_id}, tempDir: {request.tempDir}")
-    
-    # Create delete task component
-    delete_task = JobDeleteTaskComponent(
-        delete_task_id=delete_task_id,
-        client=client,
-        temp_dir=request.tempDir,
-        job_statuses=request.jobStatuses
-    )
+    logger.info(f"Starting new delete task with ID: {delete_task_id}, artifactSetId: {request.artifactSetId}")
     
-    # Add task to task manager
-    task_manager.add_task(delete_task_id, delete_task)
-    
-    # Start processing in background thread
-    Thread(target=delete_task.process_delete_task).start()
+    try:
+        # Create delete task component
+        delete_task = JobDeleteTaskComponent(
+            delete_task_id=delete_task_id,
+            client=client,
+            artifact_set=artifact_set,
+            job_statuses=request.jobStatuses
+        )
+        
+        # Add task to task manager, and queue it
+        task_manager.add_task(delete_task_id, delete_task, 'delete', build_delete_status)
+        try:
+            task_scheduler.submit(delete_task_id, 'delete', delete_task.process_delete_task)
+        except TaskQueueFullError as e:
+            task_manager.remove_task(delete_task_id)
+            raise HTTPException(status_code=429, detail=str(e))
+    except BaseException:
+        task_manager.release_run_lock('delete', delete_task_id)
+        raise
     
     return DeleteTaskResponse(deleteTaskId=delete_task_id)
 
@@ -54,9 +63,16 @@ async def delete_status(delete_task_id: str):
     logger.debug(f"Status request for delete task {delete_task_id}")
     task = task_manager.get_task(delete_task_id)
     if not task:
+        # Task of another app process, or of a previous run of the app
+        task_state = task_manager.get_stored_task_state(delete_task_id, 'delete')
+        if task_state is not None:
+            return DeleteStatusResponse(**task_state)
         logger.warning(f"Delete task {delete_task_id} not found")
         raise HTTPException(status_code=404, detail="Delete task not found")
-    
+
+    return build_delete_status(task)
+
+def build_delete_status(task: JobDeleteTaskComponent) -> DeleteStatusResponse:
     # Transform dict to list and convert to model instances
     job_delete_statuses = [
         JobDeleteStatus(
@@ -73,5 +89,6 @@ async def delete_status(delete_task_id: str):
         output=task.output,
         progress=task.progress,
         jobDeleteStatuses=job_delete_statuses,
-        logRecords=task.log_handler.get_logs()
+        logRecords=task.log_handler.get_logs(),
+        queuePosition=task_scheduler.get_queue_position(task.delete_task_id)
     ) 
\ No newline at end of file
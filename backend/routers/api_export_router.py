@@ -1,36 +1,37 @@
 from fastapi import APIRouter, HTTPException, Depends
-from threading import Thread
+from typing import List, Optional
 import uuid
+import re
 import logging
 from databricks.sdk import WorkspaceClient
 
 from backend.dependencies import get_workspace_client
-from backend.schemas.tasks import ExportTaskResponse, ExportStatusResponse
+from backend.schemas.tasks import ExportTaskRequest, ExportTaskResponse, ExportStatusResponse, JobSelectorRequest, ResumableRun
 from backend.worker_jobs_export import export_task
 from backend.task_manager import TaskManager
+from backend.task_scheduler import TaskScheduler, TaskQueueFullError
+from backend.util.job_selector import JobSelector
+from backend.util.run_journal import RunJournal, list_resumable_runs
 
 router = APIRouter(prefix="/api")
 logger = logging.getLogger(__name__)
 
 task_manager = TaskManager()
+task_scheduler = TaskScheduler()
 
-@router.post("/export/start", response_model=ExportTaskResponse)
-async def start_export(client: WorkspaceClient = Depends(get_workspace_client)):
-    # Check for any existing running export tasks
-    running_tasks = [task for task_id, task in task_manager.tasks.items() 
-                    if isinstance(task, dict) and task.get('type') == 'export' and task.get('status') == 'running']
-    if running_tasks:
+def acquire_export_run_lock(export_task_id: str):
+    """Only one export runs at a time, in all the app processes"""
+    if not task_manager.acquire_run_lock('export', export_task_id):
         logger.warning("Attempted to start new export while another export is running")
         raise HTTPException(
             status_code=409,
             detail="Another export task is currently running. Please wait for it to complete."
         )
 
-    export_task_id = str(uuid.uuid4())
-    logger.info(f"Starting new export task with ID: {export_task_id}")
-    
+def start_export_task(export_task_id: str, client: WorkspaceClient, incremental: bool, selector: JobSelector, journal: RunJournal):
     #TBD refactor to create ExportTaskComponent instance similarly to import tasks
     task_manager.add_task(export_task_id, {
+        'task_id': export_task_id,
         'type': 'export',
         'status': 'running',
         'output': 'Starting export process...\n',
@@ -40,25 +41,105 @@ async def start_export(client: WorkspaceClient = Depends(get_workspace_client)):
             'exported_modified': 0,
             'exported_unchanged': 0,
             'failed_jobs': 0,
-            'deleted_files': 0
+            'deleted_files': 0,
+            'api_calls_saved': 0,
+            'skipped_by_fingerprint': 0,
+            'files_from_mirror': 0,
+            'resolver_cache_hits': 0,
+            'resolver_cache_misses': 0,
+            'resumed_completed': 0
         }
-    })
+    }, 'export', build_export_status)
+
+    try:
+        task_scheduler.submit(export_task_id, 'export', export_task, export_task_id, client, incremental, selector, journal)
+    except TaskQueueFullError as e:
+        # Nothing was exported, the run can be resumed later
+        journal.record_finished('rejected')
+        journal.close()
+        task_manager.remove_task(export_task_id)
+        raise HTTPException(status_code=429, detail=str(e))
 
-    Thread(target=export_task, args=(export_task_id, client)).start()
+@router.post("/export/start", response_model=ExportTaskResponse)
+def start_export(
+    request: Optional[ExportTaskRequest] = None,
+    client: WorkspaceClient = Depends(get_workspace_client)
+):
+    request = request or ExportTaskRequest()
+    try:
+        selector = JobSelector.from_request(request.selector)
+    except re.error as e:
+        raise HTTPException(status_code=400, detail=f"Invalid job name regex: {str(e)}")
+
+    export_task_id = str(uuid.uuid4())
+    acquire_export_run_lock(export_task_id)
+    logger.info(f"Starting new export task with ID: {export_task_id}, incremental: {request.incremental}, selector: {selector.describe()}")
+    
+    try:
+        journal = RunJournal.create(export_task_id, 'export', {
+            'incremental': request.incremental,
+            'selector': request.selector.model_dump() if request.selector else None
+        })
+        start_export_task(export_task_id, client, request.incremental, selector, journal)
+    except BaseException:
+        task_manager.release_run_lock('export', export_task_id)
+        raise
     
     return ExportTaskResponse(exportTaskId=export_task_id)
 
+@router.get("/export/resumable", response_model=List[ResumableRun])
+def resumable_exports():
+    """Export runs that stopped before completing successfully (app restart or crash)"""
+    return [ResumableRun(**run) for run in list_resumable_runs('export')]
+
+@router.post("/export/{export_task_id}/resume", response_model=ExportTaskResponse)
+def resume_export(
+    export_task_id: str,
+    client: WorkspaceClient = Depends(get_workspace_client)
+):
+    acquire_export_run_lock(export_task_id)
+    try:
+        resume_export_task(export_task_id, client)
+    except BaseException:
+        task_manager.release_run_lock('export', export_task_id)
+        raise
+
+    return ExportTaskResponse(exportTaskId=export_task_id)
+
+def resume_export_task(export_task_id: str, client: WorkspaceClient):
+    journal = RunJournal.open_existing(export_task_id)
+    if journal is None or journal.kind != 'export':
+        raise HTTPException(status_code=404, detail="No journal found for this export task")
+    if journal.finished_status == 'completed':
+        journal.close()
+        raise HTTPException(status_code=409, detail="Export task already completed successfully")
+
+    selector_params = journal.params.get('selector')
+    selector = JobSelector.from_request(JobSelectorRequest(**selector_params) if selector_params else None)
+    logger.info(f"Resuming export task {export_task_id}: {len(journal.completed)} jobs exported, {len(journal.in_flight)} in flight")
+    journal.record_resumed()
+    # The resumed task keeps its ID, so that clients can keep polling it
+    start_export_task(export_task_id, client, journal.params.get('incremental', True), selector, journal)
+
 @router.get("/export/{export_task_id}/status", response_model=ExportStatusResponse)
 async def export_status(export_task_id: str):
     logger.debug(f"Status request for task {export_task_id}")
     task_info = task_manager.get_task(export_task_id)
     if not task_info:
+        # Task of another app process, or of a previous run of the app
+        task_state = task_manager.get_stored_task_state(export_task_id, 'export')
+        if task_state is not None:
+            return ExportStatusResponse(**task_state)
         logger.warning(f"Export task {export_task_id} not found")
         raise HTTPException(status_code=404, detail="Export task not found")
     
     logger.debug(f"Returning status for task {export_task_id}: {task_info['status']}")
+    return build_export_status(task_info)
+
+def build_export_status(task_info) -> ExportStatusResponse:
     return ExportStatusResponse(
         status=task_info["status"],
         output=task_info["output"],
-        progress=task_info["progress"]
+        progress=task_info["progress"],
+        queuePosition=task_scheduler.get_queue_position(task_info.get("task_id"))
     ) 
\ No newline at end of file
@@ -1,70 +1,154 @@
 from fastapi import APIRouter, HTTPException, Depends
-from threading import Thread
+from typing import List
 import uuid
 import logging
 from databricks.sdk import WorkspaceClient
 import json
 
 from backend.dependencies import get_workspace_client
-from backend.schemas.tasks import ImportTaskRequest, ImportTaskResponse, ImportStatusResponse
+from backend.schemas.tasks import ImportTaskRequest, ImportTaskResponse, ImportStatusResponse, ResumableRun
 from backend.task_manager import TaskManager
+from backend.task_scheduler import TaskScheduler, TaskQueueFullError
 from backend.worker_jobs_import import JobImportTaskComponent
+from backend.util.run_journal import RunJournal, list_resumable_runs
+from backend.util.artifact_store import ArtifactSet, get_artifact_store
 
 router = APIRouter(prefix="/api")
 logger = logging.getLogger(__name__)
 
 task_manager = TaskManager()
+task_scheduler = TaskScheduler()
 
 
-@router.post("/import/start", response_model=ImportTaskResponse)
-async def start_import(
-    request: ImportTaskRequest,
-    client: WorkspaceClient = Depends(get_workspace_client)
-):
-    # Check for any existing running import tasks
-    running_tasks = [task for task_id, task in task_manager.tasks.items() 
-                    if isinstance(task, JobImportTaskComponent) and task.status == 'running']
-    if running_tasks:
+def acquire_import_run_lock(import_task_id: str):
+    """Only one import runs at a time, in all the app processes"""
+    if not task_manager.acquire_run_lock('import', import_task_id):
         logger.warning("Attempted to start new import while another import is running")
         raise HTTPException(
             status_code=409,
             detail="Another import task is currently running. Please wait for it to complete."
         )
 
+def submit_import_task(import_task: JobImportTaskComponent):
+    try:
+        task_scheduler.submit(import_task.import_task_id, 'import', import_task.process_import_task)
+    except TaskQueueFullError as e:
+        # Nothing was imported, the run can be resumed later
+        import_task.journal.record_finished('rejected')
+        import_task.journal.close()
+        task_manager.remove_task(import_task.import_task_id)
+        raise HTTPException(status_code=429, detail=str(e))
+
+def open_artifact_set(artifact_set_id: str) -> ArtifactSet:
+    artifact_set = get_artifact_store().open_set(artifact_set_id)
+    if artifact_set is None:
+        raise HTTPException(status_code=410, detail="Validated job definitions are no longer available, please validate again")
+    return artifact_set
+
+@router.post("/import/start", response_model=ImportTaskResponse)
+def start_import(
+    request: ImportTaskRequest,
+    client: WorkspaceClient = Depends(get_workspace_client)
+):
     import_task_id = str(uuid.uuid4())
-    logger.info(f"Starting new import task with ID: {import_task_id}, tempDir: {request.tempDir}")
+    acquire_import_run_lock(import_task_id)
+    logger.info(f"Starting new import task with ID: {import_task_id}, artifactSetId: {request.artifactSetId}")
     
-    # Create import task component
-    import_task = JobImportTaskComponent(
+    try:
+        # Create import task component
+        import_task = JobImportTaskComponent(
+            import_task_id=import_task_id,
+            client=client,
+            artifact_set=open_artifact_set(request.artifactSetId),
+            job_statuses=request.jobStatuses,
+            include_deletes=request.includeDeletes,
+            partial_updates=request.partialUpdates
+        )
+        
+        # Add task to task manager, and queue it
+        task_manager.add_task(import_task_id, import_task, 'import', build_import_status)
+        submit_import_task(import_task)
+    except BaseException:
+        task_manager.release_run_lock('import', import_task_id)
+        raise
+    
+    return ImportTaskResponse(importTaskId=import_task_id)
+
+@router.get("/import/resumable", response_model=List[ResumableRun])
+def resumable_imports():
+    """Import runs that stopped before completing successfully (app restart, crash or failures)"""
+    return [ResumableRun(**run) for run in list_resumable_runs('import')]
+
+@router.post("/import/{import_task_id}/resume", response_model=ImportTaskResponse)
+def resume_import(
+    import_task_id: str,
+    client: WorkspaceClient = Depends(get_workspace_client)
+):
+    acquire_import_run_lock(import_task_id)
+    try:
+        import_task = create_resumed_import_task(import_task_id, client)
+        task_manager.add_task(import_task_id, import_task, 'import', build_import_status)
+        submit_import_task(import_task)
+    except BaseException:
+        task_manager.release_run_lock('import', import_task_id)
+        raise
+
+    return ImportTaskResponse(importTaskId=import_task_id)
+
+def create_resumed_import_task(import_task_id: str, client: WorkspaceClient) -> JobImportTaskComponent:
+    journal = RunJournal.open_existing(import_task_id)
+    if journal is None or journal.kind != 'import':
+        raise HTTPException(status_code=404, detail="No journal found for this import task")
+    if journal.finished_status == 'completed':
+        journal.close()
+        raise HTTPException(status_code=409, detail="Import task already completed successfully")
+    try:
+        artifact_set = open_artifact_set(journal.params.get('artifact_set_id'))
+    except HTTPException:
+        journal.close()
+        raise
+
+    logger.info(f"Resuming import task {import_task_id}: {len(journal.completed)} jobs completed, "
+                f"{len(journal.failed)} failed, {len(journal.in_flight)} in flight")
+    journal.record_resumed()
+    # The resumed task keeps its ID, so that clients can keep polling it
+    return JobImportTaskComponent(
         import_task_id=import_task_id,
         client=client,
-        temp_dir=request.tempDir,
-        job_statuses=request.jobStatuses
+        artifact_set=artifact_set,
+        job_statuses=journal.params.get('job_statuses', []),
+        include_deletes=journal.params.get('include_deletes', False),
+        partial_updates=journal.params.get('partial_updates', False),
+        journal=journal
     )
-    
-    # Add task to task manager
-    task_manager.add_task(import_task_id, import_task)
-    
-    # Start processing in background thread
-    Thread(target=import_task.process_import_task).start()
-    
-    return ImportTaskResponse(importTaskId=import_task_id)
 
 @router.get("/import/{import_task_id}/status", response_model=ImportStatusResponse)
 async def import_status(import_task_id: str):
     logger.debug(f"Status request for import task {import_task_id}")
     task = task_manager.get_task(import_task_id)
     if not task:
+        # Task of another app process, or of a previous run of the app
+        task_state = task_manager.get_stored_task_state(import_task_id, 'import')
+        if task_state is not None:
+            return ImportStatusResponse(**task_state)
         logger.warning(f"Import task {import_task_id} not found")
         raise HTTPException(status_code=404, detail="Import task not found")
-    
-   # Transform dict to list and convert to camelCase for API response
+
+    return build_import_status(task)
+
+def build_import_status(task: JobImportTaskComponent) -> ImportStatusResponse:
+    # Transform dict to list and convert to camelCase for API response
     job_import_statuses = [
         {
             "jobName": status["job_name"],
             "taskRequest": status["task_request"],
             "importStatus": status["import_status"],
-            "errorMessage": status.get("error_message")  # Use get() to safely handle missing error messages
+            "errorMessage": status.get("error_message"),  # Use get() to safely handle missing error messages
+            "operation": status.get("operation"),
+            "wave": status.get("wave"),
+            "updateMethod": status.get("update_method"),
+            "payloadBytes": status.get("payload_bytes"),
+            "latencyMs": status.get("latency_ms")
         }
         for status in task.job_import_statuses.values()
     ]
@@ -74,5 +158,6 @@ async def import_status(import_task_id: str):
         output=task.output,
         progress=task.progress,
         jobImportStatuses=job_import_statuses,
-        logRecords=task.log_handler.get_logs()
+        logRecords=task.log_handler.get_logs(),
+        queuePosition=task_scheduler.get_queue_position(task.import_task_id)
     )
\ No newline at end of file
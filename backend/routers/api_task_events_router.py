@@ -0,0 +1,117 @@
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from enum import Enum
+import asyncio
+import json
+import logging
+
+from backend.task_manager import TaskManager
+from backend.task_scheduler import TaskScheduler
+from backend.schemas.tasks import TaskManagerStats
+from backend.util.task_events import TaskEventDiffer
+from .api_export_router import build_export_status
+from .api_validation_router import build_import_validation_status
+from .api_import_router import build_import_status
+from .api_delete_router import build_delete_status
+
+router = APIRouter(prefix="/api")
+logger = logging.getLogger(__name__)
+
+task_manager = TaskManager()
+task_scheduler = TaskScheduler()
+
+# How often the state of a task is checked for a new version to push to subscribers
+EVENTS_CHECK_INTERVAL_SECONDS = 0.5
+
+class TaskType(str, Enum):
+    EXPORT = "export"
+    IMPORT_VALIDATION = "pre-import-validation"
+    IMPORT = "import"
+    DELETE = "delete"
+
+STATUS_BUILDERS = {
+    TaskType.EXPORT: build_export_status,
+    TaskType.IMPORT_VALIDATION: build_import_validation_status,
+    TaskType.IMPORT: build_import_status,
+    TaskType.DELETE: build_delete_status,
+}
+
+def get_task_state(task_type: TaskType, task_id: str):
+    """Status of a task of this app process, else its last state saved by another process, None if unknown"""
+    task = task_manager.get_task(task_id)
+    if task is not None:
+        return STATUS_BUILDERS[task_type](task).model_dump()
+    return task_manager.get_stored_task_state(task_id, task_type.value)
+
+def get_task_or_404(task_type: TaskType, task_id: str):
+    task_state = get_task_state(task_type, task_id)
+    if task_state is None:
+        logger.warning(f"{task_type.value} task {task_id} not found")
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task_state
+
+async def task_events(task_type: TaskType, task_id: str):
+    """
+    Yield incremental events for a task until it reaches a final state.
+
+    Running tasks of this process are only diffed when the task manager published a new version of their
+    state (built once for all subscribers). Other states (finished tasks, tasks of other app processes) are
+    read in a worker thread, as they may be built or loaded from the task store.
+    """
+    differ = TaskEventDiffer()
+    version = None
+
+    while True:
+        published = task_manager.get_published_task_state(task_id, task_type.value)
+        if published is not None and published[0] == version:
+            await asyncio.sleep(EVENTS_CHECK_INTERVAL_SECONDS)
+            continue
+        if published is not None:
+            version, task_state = published
+        else:
+            version = None
+            task_state = await asyncio.to_thread(get_task_state, task_type, task_id)
+        if task_state is None:
+            yield {'type': 'not_found', 'detail': 'Task not found'}
+            return
+
+        events = differ.next_events(task_state)
+        for event in events:
+            yield event
+            if event['type'] == 'done':
+                return
+
+        await asyncio.sleep(EVENTS_CHECK_INTERVAL_SECONDS)
+
+@router.get("/tasks/stats", response_model=TaskManagerStats)
+async def task_manager_stats():
+    """Number of tasks kept in memory, their estimated memory and the evictions so far, and the scheduler queue"""
+    return TaskManagerStats(**task_manager.get_stats(), **task_scheduler.get_stats())
+
+@router.get("/{task_type}/{task_id}/events")
+async def stream_task_events(task_type: TaskType, task_id: str):
+    """Server-Sent Events stream: one 'snapshot' event followed by incremental change events"""
+    await asyncio.to_thread(get_task_or_404, task_type, task_id)
+
+    async def event_source():
+        event_id = 0
+        async for event in task_events(task_type, task_id):
+            event_id += 1
+            yield f"id: {event_id}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@router.websocket("/{task_type}/{task_id}/ws")
+async def websocket_task_events(websocket: WebSocket, task_type: TaskType, task_id: str):
+    """WebSocket stream with the same events as the SSE endpoint, one JSON message per event"""
+    await websocket.accept()
+    try:
+        async for event in task_events(task_type, task_id):
+            await websocket.send_json(event)
+        await websocket.close()
+    except WebSocketDisconnect:
+        logger.debug(f"WebSocket subscriber for {task_type.value} task {task_id} disconnected")
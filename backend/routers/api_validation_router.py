@@ -1,29 +1,45 @@
 from fastapi import APIRouter, HTTPException, Depends
-from threading import Thread
+from typing import Optional
 import uuid
+import re
 import logging
 from databricks.sdk import WorkspaceClient
 
 from backend.dependencies import get_workspace_client
-from backend.schemas.tasks import ImportTaskResponse, ImportValidationStatus
+from backend.schemas.tasks import ImportTaskResponse, ImportValidationStatus, ImportValidationTaskRequest
 from backend.worker_jobs_validate import JobimportValidationTaskComponent
 from backend.task_manager import TaskManager
+from backend.task_scheduler import TaskScheduler, TaskQueueFullError
+from backend.util.job_selector import JobSelector
 
 router = APIRouter(prefix="/api")
 logger = logging.getLogger(__name__)
 
 task_manager = TaskManager()
+task_scheduler = TaskScheduler()
 
 @router.post("/pre-import-validation/start", response_model=ImportTaskResponse)
-async def start_import_validation(client: WorkspaceClient = Depends(get_workspace_client)):
+async def start_import_validation(
+    request: Optional[ImportValidationTaskRequest] = None,
+    client: WorkspaceClient = Depends(get_workspace_client)
+):
+    request = request or ImportValidationTaskRequest()
+    try:
+        selector = JobSelector.from_request(request.selector)
+    except re.error as e:
+        raise HTTPException(status_code=400, detail=f"Invalid job name regex: {str(e)}")
+
     import_validation_task_id = str(uuid.uuid4())
     
-    logger.info(f"Starting new import validation task with ID: {import_validation_task_id}")
-    
-    import_validation_task = JobimportValidationTaskComponent(import_validation_task_id, client)
-    task_manager.add_task(import_validation_task_id, import_validation_task)
+    logger.info(f"Starting new import validation task with ID: {import_validation_task_id}, selector: {selector.describe()}, force refresh: {request.forceRefresh}")
     
-    Thread(target=import_validation_task.process_import_validation_task, args=()).start()
+    import_validation_task = JobimportValidationTaskComponent(import_validation_task_id, client, selector, request.forceRefresh)
+    task_manager.add_task(import_validation_task_id, import_validation_task, 'pre-import-validation', build_import_validation_status)
+    try:
+        task_scheduler.submit(import_validation_task_id, 'pre-import-validation', import_validation_task.process_import_validation_task)
+    except TaskQueueFullError as e:
+        task_manager.remove_task(import_validation_task_id)
+        raise HTTPException(status_code=429, detail=str(e))
     
     return ImportTaskResponse(importTaskId=import_validation_task_id)
 
@@ -32,16 +48,24 @@ async def import_status(import_task_id: str):
     logger.debug(f"Status request for import task {import_task_id}")
     task = task_manager.get_task(import_task_id)
     if not task:
+        # Task of another app process, or of a previous run of the app
+        task_state = task_manager.get_stored_task_state(import_task_id, 'pre-import-validation')
+        if task_state is not None:
+            return ImportValidationStatus(**task_state)
         logger.warning(f"Import task {import_task_id} not found")
         raise HTTPException(status_code=404, detail="Import task not found")
     
     logger.debug(f"Returning status for import task {import_task_id}: {task.status}")
+    return build_import_validation_status(task)
+
+def build_import_validation_status(task: JobimportValidationTaskComponent) -> ImportValidationStatus:
     return ImportValidationStatus(
         status=task.status,
         message=task.message,
         taskIssues=task.validation_task_issues,
         jobStatuses=task.job_validation_statuses,
         logRecords=task.log_handler.get_logs(),
-        tempDir=task.temp_dir if task.temp_dir else None,
-        progress=task.progress_stats
+        artifactSetId=task.artifact_set.artifact_set_id if task.artifact_set else None,
+        progress=task.progress_stats,
+        queuePosition=task_scheduler.get_queue_position(task.import_task_id)
     ) 
\ No newline at end of file
@@ -10,6 +10,7 @@ from pydantic import BaseModel
 import asyncio
 
 from backend.dependencies import get_workspace_client
+from backend.util.dbr_workspace_utils import JOBS_LIST_PAGE_SIZE
 from backend.schemas.workspace import WorkspaceFilesInfo, WorkspaceFolderResponse, WorkflowJobsCount, ComputeClusterMappingsResponse, ComputeClusterMappingsUpdateResponse
 from backend.resource_name_mappings import (
     RESOURCE_NAME_MAPPINGS_FILE_PATH,
@@ -20,8 +21,6 @@ from backend.resource_name_mappings import (
 router = APIRouter(prefix="/api/workspace-info")
 logger = logging.getLogger(__name__)
 
-databricks_semaphore = asyncio.Semaphore(int(os.getenv("NUM_THREADS", "1")))
-
 class AppMode(str, Enum):
     EXPORT = "Export"
     IMPORT = "Import"
@@ -42,60 +41,57 @@ class AppModeResponse(BaseModel):
 
 @router.get("/folder", response_model=WorkspaceFolderResponse)
 async def get_workspace_folder(client: WorkspaceClient = Depends(get_workspace_client)):
-    async with databricks_semaphore:
-        workspace_git_folder = os.getenv("WORKSPACE_GIT_FOLDER_PATH")
-        databricks_host = os.getenv("DATABRICKS_HOST")
+    workspace_git_folder = os.getenv("WORKSPACE_GIT_FOLDER_PATH")
+    databricks_host = os.getenv("DATABRICKS_HOST")
+    
+    try:
+        folder_info = await asyncio.to_thread(client.workspace.get_status, workspace_git_folder)
+        folder_id = folder_info.object_id
         
-        try:
-            folder_info = await asyncio.to_thread(client.workspace.get_status, workspace_git_folder)
-            folder_id = folder_info.object_id
-            
-            return WorkspaceFolderResponse(
-                workspace_git_folder=workspace_git_folder,
-                databricks_host=databricks_host,
-                folder_id=folder_id
-            )
-        except Exception as e:
-            logger.error(f"Error getting folder info: {str(e)}", exc_info=True)
-            raise HTTPException(status_code=500, detail=f"Error getting folder info: {str(e)}")
+        return WorkspaceFolderResponse(
+            workspace_git_folder=workspace_git_folder,
+            databricks_host=databricks_host,
+            folder_id=folder_id
+        )
+    except Exception as e:
+        logger.error(f"Error getting folder info: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error getting folder info: {str(e)}")
 
 @router.get("/files", response_model=WorkspaceFilesInfo)
 async def get_workspace_files_info(client: WorkspaceClient = Depends(get_workspace_client)):
-    async with databricks_semaphore:
-        workspace_git_folder = os.getenv("WORKSPACE_GIT_FOLDER_PATH")
-        try:
-            directory_contents = await asyncio.to_thread(lambda: list(client.workspace.list(workspace_git_folder)))
-            
-            workspace_last_modified = max(
-                (entry.modified_at for entry in directory_contents if entry.modified_at is not None),
-                default=None
-            )
-            json_files = sum(1 for entry in directory_contents if entry.path.endswith('.json'))
+    workspace_git_folder = os.getenv("WORKSPACE_GIT_FOLDER_PATH")
+    try:
+        directory_contents = await asyncio.to_thread(lambda: list(client.workspace.list(workspace_git_folder)))
+        
+        workspace_last_modified = max(
+            (entry.modified_at for entry in directory_contents if entry.modified_at is not None),
+            default=None
+        )
+        json_files = sum(1 for entry in directory_contents if entry.path.endswith('.json'))
+        
+        if workspace_last_modified:
+            workspace_last_modified = datetime.fromtimestamp(workspace_last_modified / 1000)
+            workspace_last_modified_str = workspace_last_modified.strftime("%Y-%m-%d %H:%M:%S")
+        else:
+            workspace_last_modified_str = "No files found"
             
-            if workspace_last_modified:
-                workspace_last_modified = datetime.fromtimestamp(workspace_last_modified / 1000)
-                workspace_last_modified_str = workspace_last_modified.strftime("%Y-%m-%d %H:%M:%S")
-            else:
-                workspace_last_modified_str = "No files found"
-                
-            return WorkspaceFilesInfo(
-                workspace_last_modified=workspace_last_modified_str,
-                json_files_count=json_files
-            )
-        except Exception as e:
-            logger.error(f"Error fetching workspace files info: {str(e)}", exc_info=True)
-            raise HTTPException(status_code=500, detail=f"Error fetching workspace files info: {str(e)}")
+        return WorkspaceFilesInfo(
+            workspace_last_modified=workspace_last_modified_str,
+            json_files_count=json_files
+        )
+    except Exception as e:
+        logger.error(f"Error fetching workspace files info: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error fetching workspace files info: {str(e)}")
 
 @router.get("/jobs-count", response_model=WorkflowJobsCount)
 async def get_workflow_jobs_count(client: WorkspaceClient = Depends(get_workspace_client)):
-    async with databricks_semaphore:
-        try:
-            jobs = await asyncio.to_thread(lambda: list(client.jobs.list()))
-            jobs_count = len(jobs)
-            return WorkflowJobsCount(workflow_jobs_count=jobs_count)
-        except Exception as e:
-            logger.error(f"Error counting workflow jobs: {str(e)}", exc_info=True)
-            raise HTTPException(status_code=500, detail=f"Error counting workflow jobs: {str(e)}")
+    try:
+        jobs = await asyncio.to_thread(lambda: list(client.jobs.list(limit=JOBS_LIST_PAGE_SIZE)))
+        jobs_count = len(jobs)
+        return WorkflowJobsCount(workflow_jobs_count=jobs_count)
+    except Exception as e:
+        logger.error(f"Error counting workflow jobs: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error counting workflow jobs: {str(e)}")
 
 @router.get("/compute-cluster-mappings", response_model=ComputeClusterMappingsResponse)
 def get_compute_cluster_mappings(client: WorkspaceClient = Depends(get_workspace_client)):
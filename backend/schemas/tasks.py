@@ -14,6 +14,29 @@ class ExportTaskProgress(BaseModel):
     exported_unchanged: int
     failed_jobs: int
     deleted_files: int
+    api_calls_saved: int = 0
+    skipped_by_fingerprint: int = 0
+    files_from_mirror: int = 0
+    resolver_cache_hits: int = 0
+    resolver_cache_misses: int = 0
+    resumed_completed: int = 0
+    concurrency_limit: int = 0
+    concurrency_history: List[Dict[str, Any]] = []
+    api_retries: int = 0
+    api_failures: int = 0
+    circuit_breaker_open: bool = False
+    circuit_breaker_opened: int = 0
+
+class JobSelectorRequest(BaseModel):
+    namePatterns: List[str] = []
+    nameRegex: Optional[str] = None
+    tags: List[str] = []
+    creators: List[str] = []
+    runAs: List[str] = []
+
+class ExportTaskRequest(BaseModel):
+    incremental: bool = True
+    selector: Optional[JobSelectorRequest] = None
 
 class ExportTaskResponse(BaseModel):
     exportTaskId: str
@@ -22,10 +45,15 @@ class ExportStatusResponse(BaseModel):
     status: str
     output: str
     progress: ExportTaskProgress
+    queuePosition: Optional[int] = None
 
 class ImportTaskResponse(BaseModel):
     importTaskId: str
 
+class ImportValidationTaskRequest(BaseModel):
+    selector: Optional[JobSelectorRequest] = None
+    forceRefresh: bool = False
+
 class ImportValidationTaskResponse(BaseModel):
     importValidationTaskId: str
 
@@ -36,6 +64,16 @@ class ImportValidationProgress(BaseModel):
     files_transferred: int
     jobs_to_validate: int
     jobs_validated: int
+    files_from_mirror: int = 0
+    api_calls_saved: int = 0
+    fetches_avoided: int = 0
+    definitions_from_cache: int = 0
+    concurrency_limit: int = 0
+    concurrency_history: List[Dict[str, Any]] = []
+    api_retries: int = 0
+    api_failures: int = 0
+    circuit_breaker_open: bool = False
+    circuit_breaker_opened: int = 0
 
 class ImportValidationStatus(BaseModel):
     status: str
@@ -43,18 +81,50 @@ class ImportValidationStatus(BaseModel):
     taskIssues: List[Dict[str, Any]]
     jobStatuses: List[Dict[str, Any]]
     logRecords: List[str]
-    tempDir: Optional[str]
+    artifactSetId: Optional[str]
     progress: ImportValidationProgress
+    queuePosition: Optional[int] = None
 
 class ImportTaskRequest(BaseModel):
     jobStatuses: List[Dict[str, Any]] 
-    tempDir: str
+    artifactSetId: str
+    includeDeletes: bool = False
+    partialUpdates: bool = False
 
 class JobImportStatus(BaseModel):
     jobName: str
     taskRequest: Dict[str, Any]
     importStatus: str
     errorMessage: Optional[str] = None
+    operation: Optional[str] = None
+    wave: Optional[int] = None
+    updateMethod: Optional[str] = None
+    payloadBytes: Optional[int] = None
+    latencyMs: Optional[int] = None
+
+class ResumableRun(BaseModel):
+    runId: str
+    startedAt: Optional[float] = None
+    updatedAt: Optional[float] = None
+    finishedStatus: Optional[str] = None
+    completedJobs: int = 0
+    failedJobs: int = 0
+    inFlightJobs: int = 0
+
+class TaskManagerStats(BaseModel):
+    tasks: int = 0
+    active_tasks: int = 0
+    finished_tasks: int = 0
+    estimated_bytes: int = 0
+    max_bytes: int = 0
+    expired_tasks: int = 0
+    evicted_tasks: int = 0
+    queued_tasks: int = 0
+    running_tasks: int = 0
+    running_tasks_by_type: Dict[str, int] = {}
+    max_running_tasks: int = 0
+    completed_tasks: int = 0
+    rejected_tasks: int = 0
 
 class ImportStatusResponse(BaseModel):
     status: str
@@ -62,12 +132,21 @@ class ImportStatusResponse(BaseModel):
     progress: dict
     jobImportStatuses: List[JobImportStatus] = []
     logRecords: List[str] = []
+    queuePosition: Optional[int] = None
 
 class TaskProgress(BaseModel):
     imported: Optional[int] = 0
     skipped_unchanged: Optional[int] = 0
     deleted: Optional[int] = 0
     failed_jobs: Optional[int] = 0
+    resumed_completed: Optional[int] = 0
+    stale_jobs: Optional[int] = 0
+    concurrency_limit: Optional[int] = 0
+    concurrency_history: List[Dict[str, Any]] = []
+    api_retries: Optional[int] = 0
+    api_failures: Optional[int] = 0
+    circuit_breaker_open: Optional[bool] = False
+    circuit_breaker_opened: Optional[int] = 0
 
 class LogRecord(BaseModel):
     level: str
@@ -75,7 +154,7 @@ class LogRecord(BaseModel):
     timestamp: str
 
 class DeleteTaskRequest(BaseModel):
-    tempDir: str
+    artifactSetId: str
     jobStatuses: List[Dict[str, Any]]
 
 class DeleteTaskResponse(BaseModel):
@@ -92,4 +171,5 @@ class DeleteStatusResponse(BaseModel):
     output: str
     progress: Optional[TaskProgress]
     jobDeleteStatuses: List[JobDeleteStatus] = []
-    logRecords: List[str] = []
\ No newline at end of file
+    logRecords: List[str] = []
+    queuePosition: Optional[int] = None
\ No newline at end of file
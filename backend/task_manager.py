@@ -1,6 +1,76 @@
+import os
+import sys
+import json
+import time
+import logging
+import itertools
 import threading
+from collections import OrderedDict
+
+from backend.util.job_logger import release_job_logger
+from backend.util.task_store import get_task_store, TASK_HEARTBEAT_TIMEOUT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Finished tasks are kept (for status requests) for this long after they finished
+TASK_COMPLETED_TTL_HOURS = float(os.getenv("TASK_COMPLETED_TTL_HOURS", "6"))
+TASK_FAILED_TTL_HOURS = float(os.getenv("TASK_FAILED_TTL_HOURS", "24"))
+# Estimated memory of all tasks above which the least recently used finished tasks are evicted
+TASK_MANAGER_MAX_MB = float(os.getenv("TASK_MANAGER_MAX_MB", "256"))
+
+# How often the state of the running tasks is saved to the task store (with a heartbeat)
+TASK_STORE_SYNC_INTERVAL_SECONDS = float(os.getenv("TASK_STORE_SYNC_INTERVAL_SECONDS", "1"))
+TASK_STORE_PRUNE_INTERVAL_SECONDS = 3600
+
+# Tasks in these states are never evicted
+ACTIVE_TASK_STATUSES = ('pending', 'running', 'in_progress')
+
+def get_task_status(task):
+    """Status of a task, whether it is a component object (validation, import, delete) or a dict (export)"""
+    return task.get('status') if isinstance(task, dict) else getattr(task, 'status', None)
+
+def get_task_ttl_seconds(status: str) -> float:
+    if status and status.startswith('completed'):
+        return TASK_COMPLETED_TTL_HOURS * 3600
+    return TASK_FAILED_TTL_HOURS * 3600
+
+def _estimate_size(value, depth: int = 0) -> int:
+    """Approximate memory of plain data (dicts, lists, strings...), without following other objects"""
+    size = sys.getsizeof(value)
+    if depth > 16:
+        return size
+    if isinstance(value, dict):
+        size += sum(_estimate_size(key, depth + 1) + _estimate_size(item, depth + 1) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_estimate_size(item, depth + 1) for item in value)
+    return size
+
+def estimate_task_bytes(task) -> int:
+    """Approximate memory held by a task: its state (statuses, diffs, progress...) and its captured logs"""
+    if isinstance(task, dict):
+        return _estimate_size(task)
+    size = sum(_estimate_size(value) for value in vars(task).values() if isinstance(value, (dict, list, tuple, set, str)))
+    log_handler = getattr(task, 'log_handler', None)
+    if log_handler is not None:
+        size += _estimate_size(log_handler.get_logs())
+    return size
+
 
 class TaskManager:
+    """
+    Process-wide store of the tasks, by task ID.
+
+    Running tasks are always kept. Finished tasks expire after a TTL depending on their final status, and when
+    the estimated memory of all tasks exceeds TASK_MANAGER_MAX_MB the least recently used finished tasks are
+    evicted first. Tasks are evicted on each new task and periodically by the sync thread, evicted tasks release
+    their logger and log handlers.
+
+    Tasks added with a task type and a status builder are also saved in the task store (see TaskStore) while
+    they run and once finished, so that their status can be served by the other app processes and after
+    a restart (get_stored_task_state). The run locks of the tasks are released when they finish.
+    Each saved state of a running task is also published with a new version (get_published_task_state),
+    so that event subscribers only compute changes when there are some.
+    """
     _instance = None
     _lock = threading.Lock()
 
@@ -9,20 +79,220 @@ class TaskManager:
             with cls._lock:
                 if cls._instance is None:
                     cls._instance = super(TaskManager, cls).__new__(cls)
-                    cls._instance.tasks = {}
+                    # Least recently used first
+                    cls._instance.tasks = OrderedDict()
+                    cls._instance._tasks_lock = threading.RLock()
+                    cls._instance._finished_at = {}
+                    # Size estimates of finished tasks (they no longer grow)
+                    cls._instance._finished_sizes = {}
+                    cls._instance.max_bytes = TASK_MANAGER_MAX_MB * 1024 * 1024
+                    cls._instance.expired_tasks = 0
+                    cls._instance.evicted_tasks = 0
+                    # Tasks saved in the task store: task ID -> (task type, status builder), until their final state is saved
+                    cls._instance._stored_tasks = {}
+                    cls._instance._stored_states = {}
+                    # Last saved state of the running tasks: task ID -> (version, task type, status response)
+                    cls._instance._published_states = {}
+                    cls._instance._state_versions = itertools.count(1)
+                    # Run locks held by the tasks of this process: task ID -> kind
+                    cls._instance._run_locks = {}
+                    cls._instance._sync_thread = None
         return cls._instance
 
-    def add_task(self, task_id, task_info):
-        self._instance.tasks[task_id] = task_info
+    def add_task(self, task_id, task_info, task_type: str = None, build_status=None):
+        with self._tasks_lock:
+            self._forget(task_id)
+            self.tasks[task_id] = task_info
+            if task_type and build_status:
+                self._stored_tasks[task_id] = (task_type, build_status)
+                self._stored_states.pop(task_id, None)
+                self._sync_task(task_id, task_info)
+            # The sync thread also evicts the expired tasks
+            self._start_sync_thread()
+        self.evict_tasks()
+
+    def remove_task(self, task_id):
+        """Forget a task that will not run (e.g. rejected by the scheduler)"""
+        with self._tasks_lock:
+            task = self.tasks.pop(task_id, None)
+            self._forget(task_id)
+            if self._stored_tasks.pop(task_id, None):
+                self._stored_states.pop(task_id, None)
+                get_task_store().delete_task(task_id)
+        task_logger = None if isinstance(task, dict) else getattr(task, 'logger', None)
+        if task_logger is not None:
+            release_job_logger(task_logger)
 
     def get_task(self, task_id):
-        if task_id in self._instance.tasks:
-            return self._instance.tasks[task_id]
-        else:
-            return None
+        with self._tasks_lock:
+            task = self.tasks.get(task_id)
+            if task is not None:
+                self.tasks.move_to_end(task_id)
+                self._check_finished(task_id, task)
+            return task
+
+    def get_tasks(self) -> list:
+        """(task ID, task) of all tasks, safe to iterate while tasks are added or evicted"""
+        with self._tasks_lock:
+            return list(self.tasks.items())
 
     def update_task(self, task_id, **kwargs):
-        if task_id in self._instance.tasks:
-            self._instance.tasks [task_id].update(kwargs) 
-        else:
-            raise KeyError(f"Task with ID {task_id} not found")
+        with self._tasks_lock:
+            if task_id in self.tasks:
+                self.tasks[task_id].update(kwargs)
+            else:
+                raise KeyError(f"Task with ID {task_id} not found")
+
+    def _check_finished(self, task_id, task):
+        if task_id not in self._finished_at and get_task_status(task) not in ACTIVE_TASK_STATUSES:
+            self._finished_at[task_id] = time.time()
+
+    def _get_size(self, task_id, task) -> int:
+        if task_id in self._finished_sizes:
+            return self._finished_sizes[task_id]
+        size = estimate_task_bytes(task)
+        if task_id in self._finished_at:
+            self._finished_sizes[task_id] = size
+        return size
+
+    def _forget(self, task_id):
+        self._finished_at.pop(task_id, None)
+        self._finished_sizes.pop(task_id, None)
+        self._published_states.pop(task_id, None)
+
+    def _evict(self, task_id):
+        task = self.tasks.pop(task_id)
+        if task_id in self._stored_tasks:
+            self._sync_task(task_id, task)
+            self._stored_tasks.pop(task_id, None)
+        self._forget(task_id)
+        task_logger = None if isinstance(task, dict) else getattr(task, 'logger', None)
+        if task_logger is not None:
+            release_job_logger(task_logger)
+
+    def evict_tasks(self):
+        """Evict the expired finished tasks, then the least recently used ones while over the memory limit"""
+        now = time.time()
+        with self._tasks_lock:
+            for task_id, task in list(self.tasks.items()):
+                self._check_finished(task_id, task)
+                if task_id in self._finished_at and now - self._finished_at[task_id] > get_task_ttl_seconds(get_task_status(task)):
+                    self._evict(task_id)
+                    self.expired_tasks += 1
+
+            sizes = {task_id: self._get_size(task_id, task) for task_id, task in self.tasks.items()}
+            total_bytes = sum(sizes.values())
+            for task_id in list(self.tasks.keys()):
+                if total_bytes <= self.max_bytes:
+                    break
+                if task_id in self._finished_at:
+                    self._evict(task_id)
+                    total_bytes -= sizes[task_id]
+                    self.evicted_tasks += 1
+                    logger.info(f"Evicted finished task {task_id} (task memory over {self.max_bytes / 1024 / 1024:.0f} MB)")
+
+    def get_stats(self) -> dict:
+        self.evict_tasks()
+        with self._tasks_lock:
+            sizes = {task_id: self._get_size(task_id, task) for task_id, task in self.tasks.items()}
+            return {
+                'tasks': len(self.tasks),
+                'active_tasks': len(self.tasks) - len(self._finished_at),
+                'finished_tasks': len(self._finished_at),
+                'estimated_bytes': sum(sizes.values()),
+                'max_bytes': int(self.max_bytes),
+                'expired_tasks': self.expired_tasks,
+                'evicted_tasks': self.evicted_tasks
+            }
+
+    def acquire_run_lock(self, kind: str, task_id: str) -> bool:
+        """Take the lock allowing one running task of a kind across all app processes, False if another task holds it"""
+        if not get_task_store().acquire_run_lock(kind, task_id):
+            return False
+        with self._tasks_lock:
+            self._run_locks[task_id] = kind
+        self._start_sync_thread()
+        return True
+
+    def release_run_lock(self, kind: str, task_id: str):
+        with self._tasks_lock:
+            self._run_locks.pop(task_id, None)
+        get_task_store().release_run_lock(kind, task_id)
+
+    def get_stored_task_state(self, task_id: str, task_type: str):
+        """Last saved status of a task of another app process (or of a previous run of the app), None if unknown"""
+        stored = get_task_store().load_task(task_id)
+        if stored is None or stored['task_type'] != task_type:
+            return None
+        task_state = stored['task_state']
+        if stored['status'] in ACTIVE_TASK_STATUSES and time.time() - stored['heartbeat_at'] > TASK_HEARTBEAT_TIMEOUT_SECONDS:
+            # Its process stopped while it was running
+            interrupted_message = "Task interrupted: the app process running it stopped"
+            task_state['status'] = 'failed'
+            if 'output' in task_state:
+                task_state['output'] = f"{task_state['output']}\n{interrupted_message}\n"
+            if 'message' in task_state:
+                task_state['message'] = interrupted_message
+        return task_state
+
+    def get_published_task_state(self, task_id: str, task_type: str):
+        """(version, status response) of the last saved state of a running task of this process, None if there is none"""
+        with self._tasks_lock:
+            published = self._published_states.get(task_id)
+        if published is None or published[1] != task_type:
+            return None
+        return published[0], published[2]
+
+    def _sync_task(self, task_id, task):
+        """Save the state of a task to the task store if it changed; once finished, save it a last time and release its run lock"""
+        stored_task = self._stored_tasks.get(task_id)
+        if stored_task is None:
+            return
+        task_type, build_status = stored_task
+        try:
+            task_state = build_status(task).model_dump()
+        except RuntimeError as e:
+            # State modified by the worker threads while it was read, saved on the next sync
+            logger.debug(f"Could not read the state of task {task_id}: {str(e)}")
+            return
+        status = get_task_status(task)
+        serialized = json.dumps(task_state, sort_keys=True, default=str)
+        if self._stored_states.get(task_id) != serialized:
+            with self._tasks_lock:
+                self._published_states[task_id] = (next(self._state_versions), task_type, task_state)
+            get_task_store().save_task(task_id, task_type, status, task_state)
+            self._stored_states[task_id] = serialized
+        if status not in ACTIVE_TASK_STATUSES:
+            self._stored_tasks.pop(task_id, None)
+            self._stored_states.pop(task_id, None)
+            with self._tasks_lock:
+                self._published_states.pop(task_id, None)
+            if task_id in self._run_locks:
+                self.release_run_lock(self._run_locks[task_id], task_id)
+
+    def _start_sync_thread(self):
+        with self._tasks_lock:
+            if self._sync_thread is None:
+                self._sync_thread = threading.Thread(target=self._sync_loop, name="task-store-sync", daemon=True)
+                self._sync_thread.start()
+
+    def _sync_loop(self):
+        pruned_at = 0.0
+        while True:
+            try:
+                with self._tasks_lock:
+                    stored_tasks = [(task_id, self.tasks[task_id]) for task_id in self._stored_tasks if task_id in self.tasks]
+                    alive_task_ids = [task_id for task_id, task in self.tasks.items() if get_task_status(task) in ACTIVE_TASK_STATUSES]
+                    alive_task_ids += [task_id for task_id in self._run_locks if task_id not in alive_task_ids]
+                # Status responses are built outside of the lock, status requests do not wait for them
+                for task_id, task in stored_tasks:
+                    if task_id in self._stored_tasks:
+                        self._sync_task(task_id, task)
+                get_task_store().heartbeat(alive_task_ids)
+                self.evict_tasks()
+                if time.time() - pruned_at > TASK_STORE_PRUNE_INTERVAL_SECONDS:
+                    pruned_at = time.time()
+                    get_task_store().prune(pruned_at - max(TASK_COMPLETED_TTL_HOURS, TASK_FAILED_TTL_HOURS) * 3600)
+            except Exception as e:
+                logger.error(f"Could not sync the tasks to the task store: {str(e)}", exc_info=True)
+            time.sleep(TASK_STORE_SYNC_INTERVAL_SECONDS)
@@ -0,0 +1,142 @@
+import os
+import bisect
+import logging
+import itertools
+import threading
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Tasks running at the same time in this app process (size of the fixed worker pool)
+SCHEDULER_MAX_RUNNING_TASKS = int(os.getenv("SCHEDULER_MAX_RUNNING_TASKS", "4"))
+# Validations running at the same time (each one uses its own pool of API request threads)
+SCHEDULER_MAX_RUNNING_VALIDATIONS = int(os.getenv("SCHEDULER_MAX_RUNNING_VALIDATIONS", "2"))
+# Tasks waiting for a worker, above which new tasks are rejected
+SCHEDULER_MAX_QUEUED_TASKS = int(os.getenv("SCHEDULER_MAX_QUEUED_TASKS", "16"))
+
+# Tasks of a type running at the same time (imports, deletes and exports are also limited by their run lock)
+TASK_TYPE_LIMITS = {
+    'pre-import-validation': SCHEDULER_MAX_RUNNING_VALIDATIONS,
+    'import': 1,
+    'delete': 1,
+    'export': 1,
+}
+
+# Queued tasks start by priority (lowest first), then in submission order. Imports and deletes apply changes
+# already reviewed by an admin, they do not wait behind new validations or exports.
+TASK_TYPE_PRIORITIES = {
+    'import': 0,
+    'delete': 0,
+    'pre-import-validation': 1,
+    'export': 1,
+}
+
+
+class TaskQueueFullError(Exception):
+    """Raised when a task is submitted while SCHEDULER_MAX_QUEUED_TASKS tasks are already waiting"""
+
+
+class TaskScheduler:
+    """
+    Runs the tasks of the app process on a fixed pool of worker threads.
+
+    Submitted tasks wait in a priority queue (FIFO within a priority) until a worker is free and fewer tasks of
+    their type than its limit are running; tasks of a type at its limit do not block the tasks of other types.
+    When too many tasks are waiting, new tasks are rejected instead of piling up.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(TaskScheduler, cls).__new__(cls)
+                    cls._instance._init()
+        return cls._instance
+
+    def _init(self):
+        self.max_running_tasks = max(SCHEDULER_MAX_RUNNING_TASKS, 1)
+        self.max_queued_tasks = max(SCHEDULER_MAX_QUEUED_TASKS, 0)
+        self._condition = threading.Condition()
+        # (priority, sequence, task ID, task type, target), kept in start order
+        self._queue = []
+        # Task ID -> position (from 1) in the queue, updated when the queue changes
+        self._positions = {}
+        self._sequence = itertools.count()
+        self._running = {}
+        self._workers = []
+        self.completed_tasks = 0
+        self.rejected_tasks = 0
+
+    def submit(self, task_id: str, task_type: str, target: Callable, *args):
+        """Queue a task, raises TaskQueueFullError if the queue is full"""
+        with self._condition:
+            if len(self._queue) >= self.max_queued_tasks and not self._can_start_now(task_type):
+                self.rejected_tasks += 1
+                raise TaskQueueFullError(f"{len(self._queue)} tasks are already waiting to run, please retry later")
+            priority = TASK_TYPE_PRIORITIES.get(task_type, 1)
+            bisect.insort(self._queue, (priority, next(self._sequence), task_id, task_type, lambda: target(*args)))
+            self._update_positions()
+            self._start_workers()
+            self._condition.notify_all()
+        position = self.get_queue_position(task_id)
+        if position:
+            logger.info(f"Task {task_id} ({task_type}) queued at position {position}")
+
+    def get_queue_position(self, task_id: str) -> Optional[int]:
+        """Position (from 1) of a waiting task in the start order, None if it is not waiting"""
+        with self._condition:
+            return self._positions.get(task_id)
+
+    def get_stats(self) -> dict:
+        with self._condition:
+            return {
+                'queued_tasks': len(self._queue),
+                'running_tasks': sum(self._running.values()),
+                'running_tasks_by_type': dict(self._running),
+                'max_running_tasks': self.max_running_tasks,
+                'completed_tasks': self.completed_tasks,
+                'rejected_tasks': self.rejected_tasks
+            }
+
+    def _update_positions(self):
+        self._positions = {entry[2]: position for position, entry in enumerate(self._queue, start=1)}
+
+    def _can_start_now(self, task_type: str) -> bool:
+        return (sum(self._running.values()) < self.max_running_tasks
+                and self._running.get(task_type, 0) < TASK_TYPE_LIMITS.get(task_type, self.max_running_tasks))
+
+    def _take_next_task(self):
+        """First queued task whose type is under its limit, None if there is none"""
+        for index, entry in enumerate(self._queue):
+            if self._running.get(entry[3], 0) < TASK_TYPE_LIMITS.get(entry[3], self.max_running_tasks):
+                del self._queue[index]
+                self._update_positions()
+                return entry
+        return None
+
+    def _start_workers(self):
+        while len(self._workers) < self.max_running_tasks:
+            worker = threading.Thread(target=self._worker_loop, name=f"task-worker-{len(self._workers)}", daemon=True)
+            self._workers.append(worker)
+            worker.start()
+
+    def _worker_loop(self):
+        while True:
+            with self._condition:
+                entry = self._take_next_task()
+                while entry is None:
+                    self._condition.wait()
+                    entry = self._take_next_task()
+                _, _, task_id, task_type, run = entry
+                self._running[task_type] = self._running.get(task_type, 0) + 1
+            try:
+                run()
+            except Exception as e:
+                logger.error(f"Task {task_id} ({task_type}) failed with an unhandled exception: {str(e)}", exc_info=True)
+            finally:
+                with self._condition:
+                    self._running[task_type] -= 1
+                    self.completed_tasks += 1
+                    self._condition.notify_all()
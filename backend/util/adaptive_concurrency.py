@@ -0,0 +1,136 @@
+import os
+import time
+import logging
+import threading
+from collections import deque
+from typing import Optional
+
+from databricks.sdk.errors import TooManyRequests, TemporarilyUnavailable, DatabricksError
+
+logger = logging.getLogger(__name__)
+
+# Initial limit of in-flight Databricks API requests (the limit then adapts between 1 and MAX_NUM_THREADS)
+NUM_THREADS = int(os.getenv("NUM_THREADS", "4"))
+MAX_NUM_THREADS = max(int(os.getenv("MAX_NUM_THREADS", "16")), NUM_THREADS)
+
+# A request family (e.g. jobs.get) is slowing down when its latency average exceeds this multiple of its baseline
+LATENCY_TOLERANCE = 2.0
+# The latency baseline of a request family is its lowest latency over the current and the previous window
+# of this duration, so that it is stable under steady load and outdated lows are forgotten after two windows
+LATENCY_BASELINE_WINDOW_SECONDS = 30.0
+# Multiplicative decrease factor on throttling or climbing latency
+DECREASE_FACTOR = 0.5
+
+def is_overload_error(error: BaseException) -> bool:
+    """Whether an API error means that the workspace is overloaded (HTTP 429 / 503 or rate limit errors)"""
+    if isinstance(error, (TooManyRequests, TemporarilyUnavailable)):
+        return True
+    if isinstance(error, DatabricksError):
+        return error.error_code == 'REQUEST_LIMIT_EXCEEDED' or 'RPC token bucket limit has been exceeded' in str(error)
+    return False
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD (additive increase, multiplicative decrease) limit on concurrent Databricks API requests.
+
+    The limit grows by about one for every 'limit' successful requests while latencies are stable, and is
+    cut by DECREASE_FACTOR when a request is throttled (HTTP 429 / 503) or when the latency of a request
+    family climbs above LATENCY_TOLERANCE times its baseline (its minimum latency over fixed time windows).
+    Latencies are tracked per request family, as e.g. listing and downloading calls have very different
+    normal latencies. Like in TCP congestion control, requests started before the last decrease do not
+    trigger another one, so that one burst of throttled requests only halves the limit once.
+    """
+
+    def __init__(self, initial_limit: int = NUM_THREADS, min_limit: int = 1, max_limit: int = MAX_NUM_THREADS, history_size: int = 50,
+                 baseline_window_seconds: float = LATENCY_BASELINE_WINDOW_SECONDS):
+        self.min_limit = min_limit
+        self.max_limit = max(max_limit, min_limit)
+        self._limit = float(min(max(initial_limit, min_limit), self.max_limit))
+        self._in_flight = 0
+        self._condition = threading.Condition()
+        self._latency_averages = {}
+        # Request family -> [start of the current window, minimum of the current window, minimum of the previous window]
+        self._latency_windows = {}
+        self.baseline_window_seconds = baseline_window_seconds
+        self._last_decrease = 0.0
+        self.history = deque(maxlen=history_size)
+        self._record('initial')
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def _record(self, reason: str):
+        self.history.append({'time': round(time.time(), 3), 'limit': self.limit, 'reason': reason})
+
+    def acquire(self):
+        """Wait for a free slot"""
+        with self._condition:
+            while self._in_flight >= self.limit:
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self, family: str, started_at: float, overloaded: bool = False):
+        """Free the slot of a request sent at started_at (time.monotonic)"""
+        with self._condition:
+            self._in_flight -= 1
+            if overloaded:
+                self._decrease('throttled', started_at)
+            elif self._is_latency_climbing(family, time.monotonic() - started_at):
+                self._decrease(f'latency of {family}', started_at)
+            elif self._limit < self.max_limit:
+                previous_limit = self.limit
+                self._limit = min(self._limit + 1.0 / self._limit, float(self.max_limit))
+                if self.limit != previous_limit:
+                    self._record('increase')
+            self._condition.notify_all()
+
+    def _is_latency_climbing(self, family: str, latency: float) -> bool:
+        average = self._latency_averages.get(family)
+        average = latency if average is None else 0.8 * average + 0.2 * latency
+        self._latency_averages[family] = average
+        now = time.monotonic()
+        window = self._latency_windows.get(family)
+        if window is None:
+            window = self._latency_windows[family] = [now, latency, None]
+        elif now - window[0] >= self.baseline_window_seconds:
+            window[:] = [now, latency, window[1]]
+        else:
+            window[1] = min(window[1], latency)
+        baseline = window[1] if window[2] is None else min(window[1], window[2])
+        return average > baseline * LATENCY_TOLERANCE
+
+    def _decrease(self, reason: str, started_at: float):
+        if started_at < self._last_decrease or self._limit <= self.min_limit:
+            return
+        self._last_decrease = time.monotonic()
+        previous_limit = self.limit
+        self._limit = max(self._limit * DECREASE_FACTOR, float(self.min_limit))
+        self._record(f'decrease ({reason})')
+        logger.warning(f"API concurrency limit decreased from {previous_limit} to {self.limit} ({reason})")
+
+    def get_progress_stats(self, history_size: int = 10) -> dict:
+        """Current limit and recent history, for task progress"""
+        with self._condition:
+            return {
+                'concurrency_limit': self.limit,
+                'concurrency_history': list(self.history)[-history_size:]
+            }
+
+
+_limiter: Optional[AdaptiveConcurrencyLimiter] = None
+_limiter_lock = threading.Lock()
+
+def get_concurrency_limiter() -> AdaptiveConcurrencyLimiter:
+    """Process-wide limiter, shared by all tasks (export, validation, import and delete)"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = AdaptiveConcurrencyLimiter()
+        return _limiter
+
+def get_worker_pool_size() -> int:
+    """Thread pool size of a task: NUM_THREADS, or the current limit of the limiter when it grew above it
+    (the limiter still bounds the concurrent API requests of all tasks together)"""
+    return min(max(NUM_THREADS, get_concurrency_limiter().limit), MAX_NUM_THREADS)
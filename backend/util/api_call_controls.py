@@ -0,0 +1,117 @@
+import re
+import time
+import logging
+from urllib.parse import urlparse
+
+from databricks.sdk import WorkspaceClient
+
+from backend.util.adaptive_concurrency import get_concurrency_limiter, is_overload_error
+from backend.util.rate_limiter import get_api_rate_limiter
+from backend.util.api_retries import (
+    API_MAX_RETRIES, get_circuit_breaker, get_retry_stats, get_retry_reason, get_backoff_seconds, is_idempotent_request
+)
+
+logger = logging.getLogger(__name__)
+
+_API_PATH_PATTERN = re.compile(r'^/api/[^/]+/([^/]+)(?:/([^/]+))?')
+
+def get_request_family(method: str, url: str) -> str:
+    """Request family used for latency tracking, e.g. 'GET jobs/get' or 'GET workspace/export'"""
+    path = urlparse(url).path
+    match = _API_PATH_PATTERN.match(path)
+    if not match:
+        return f"{method} {path}"
+    return f"{method} {'/'.join(part for part in match.groups() if part)}"
+
+def install_api_call_controls(client: WorkspaceClient) -> WorkspaceClient:
+    """
+    Route every HTTP request of the client through the process-wide adaptive concurrency limiter,
+    the per API family request rate limits (token buckets), the retry layer and the circuit breaker.
+
+    The hook is installed on each individual HTTP attempt, so that throttled attempts are seen by the
+    limiter and no slot is held while waiting before a retry. The hook owns the retries: failed requests
+    are retried with jittered exponential backoff (at least the Retry-After of throttled requests), only
+    when the error is retryable, and the retries of the SDK are disabled so that they do not add up.
+    """
+    # _BaseClient._perform is one HTTP attempt; fall back to the public ApiClient.do
+    target = getattr(client.api_client, '_api_client', None)
+    attribute = '_perform'
+    if target is None or not hasattr(target, attribute):
+        target, attribute = client.api_client, 'do'
+
+    original = getattr(target, attribute)
+    if getattr(original, '_api_call_controls', False):
+        return client
+
+    limiter = get_concurrency_limiter()
+    rate_limiter = get_api_rate_limiter()
+    circuit_breaker = get_circuit_breaker()
+    retry_stats = get_retry_stats()
+
+    def controlled_call(method, *args, **kwargs):
+        # url (_perform) or path (do) is the first argument after the method
+        url = (args[0] if args else None) or kwargs.get('url') or kwargs.get('path') or ''
+        family = get_request_family(method, url)
+        idempotent = is_idempotent_request(method, url)
+        # A streamed request body can only be sent again if it can be rewound
+        data = kwargs.get('data')
+        rewindable = data is None or (hasattr(data, 'seek') and hasattr(data, 'tell'))
+        data_position = data.tell() if data is not None and rewindable else None
+
+        retry = 0
+        while True:
+            circuit_breaker.wait_until_closed()
+            limiter.acquire()
+            # Latency is measured from the actual send, after waiting for the rate limit
+            rate_limiter.acquire(url)
+            started_at = time.monotonic()
+            error = None
+            try:
+                response = original(method, *args, **kwargs)
+            except Exception as e:
+                error = e
+            finally:
+                limiter.release(family, started_at, error is not None and is_overload_error(error))
+
+            if error is None:
+                circuit_breaker.record_success()
+                return response
+
+            retry_after = getattr(error, 'retry_after_secs', None)
+            if is_overload_error(error):
+                circuit_breaker.record_overload(retry_after)
+            retry_reason = get_retry_reason(error, idempotent) if rewindable else None
+            if retry_reason is None or retry >= API_MAX_RETRIES:
+                retry_stats.record_failure()
+                if retry_after is not None:
+                    # Retried here already: prevent the SDK from retrying again
+                    error.retry_after_secs = None
+                raise error
+
+            retry += 1
+            retry_stats.record_retry()
+            backoff_seconds = get_backoff_seconds(retry, retry_after)
+            logger.info(f"Retrying {family} ({retry_reason}, retry {retry}/{API_MAX_RETRIES}) in {backoff_seconds:.1f}s")
+            time.sleep(backoff_seconds)
+            if data_position is not None:
+                data.seek(data_position)
+
+    controlled_call._api_call_controls = True
+    setattr(target, attribute, controlled_call)
+    if attribute == '_perform':
+        # Retries are handled by controlled_call (the SDK still retries errors with a Retry-After, which is cleared)
+        target._is_retryable = lambda error: None
+    logger.info(f"API call controls installed (initial concurrency limit {limiter.limit}, max {limiter.max_limit})")
+    return client
+
+def get_api_call_stats() -> dict:
+    """Process-wide state of the API call controls, for task progress"""
+    circuit_breaker = get_circuit_breaker()
+    retry_stats = get_retry_stats()
+    return {
+        **get_concurrency_limiter().get_progress_stats(),
+        'api_retries': retry_stats.retries,
+        'api_failures': retry_stats.failures,
+        'circuit_breaker_open': circuit_breaker.is_open,
+        'circuit_breaker_opened': circuit_breaker.times_opened
+    }
@@ -0,0 +1,160 @@
+import os
+import time
+import random
+import logging
+import threading
+from typing import Optional
+from urllib.parse import urlparse
+
+import requests
+from databricks.sdk.errors import DatabricksError, InternalError, DeadlineExceeded
+
+from backend.util.adaptive_concurrency import is_overload_error
+
+logger = logging.getLogger(__name__)
+
+# Retries of a failed Databricks API request (in addition to the first attempt)
+API_MAX_RETRIES = int(os.getenv("API_MAX_RETRIES", "6"))
+# Jittered exponential backoff: a random delay up to min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2^retry)
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 60.0
+
+# Consecutive throttled requests (HTTP 429 / 503) that open the circuit breaker
+CIRCUIT_BREAKER_THRESHOLD = int(os.getenv("CIRCUIT_BREAKER_THRESHOLD", "5"))
+CIRCUIT_BREAKER_MIN_OPEN_SECONDS = 5.0
+CIRCUIT_BREAKER_MAX_OPEN_SECONDS = 120.0
+
+# POST requests that are not idempotent: retrying them after an ambiguous failure (the request may have been
+# processed) could e.g. create the same job twice. Other POST requests (reset, update, delete, import with
+# overwrite...) give the same result when repeated.
+NON_IDEMPOTENT_POST_PATHS = ('/jobs/create', '/jobs/run-now', '/jobs/runs/submit', '/clusters/create')
+
+# Messages of errors that are transient, but returned with a non-retryable status code
+TRANSIENT_ERROR_MESSAGES = (
+    "Unexpected error",
+    "Please try again later or try a faster operation.",
+    "Bad Gateway",
+    "does not have any associated worker environments",
+    "Unknown worker environment",
+)
+
+def is_idempotent_request(method: str, url: str) -> bool:
+    if method.upper() != 'POST':
+        return True
+    return not urlparse(url).path.endswith(NON_IDEMPOTENT_POST_PATHS)
+
+def is_ambiguous_error(error: BaseException) -> bool:
+    """Whether an error is transient, but the request may have been processed (server error, lost connection)"""
+    if isinstance(error, (InternalError, DeadlineExceeded, requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(error, DatabricksError):
+        message = str(error)
+        return any(substring in message for substring in TRANSIENT_ERROR_MESSAGES)
+    return False
+
+def get_retry_reason(error: BaseException, idempotent: bool) -> Optional[str]:
+    """Reason to retry a failed request, None if the error is final (client errors, ambiguous non-idempotent requests)"""
+    if is_overload_error(error):
+        # Throttled requests have not been processed: they are retried whatever the method
+        return 'throttled'
+    if is_ambiguous_error(error):
+        return type(error).__name__ if idempotent else None
+    return None
+
+def get_backoff_seconds(retry: int, retry_after: Optional[float] = None) -> float:
+    """Delay before the given retry (1 for the first one): full jitter exponential backoff, at least Retry-After"""
+    backoff = random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** retry))
+    if retry_after:
+        # Honor Retry-After, with some jitter so that the throttled requests do not all come back at once
+        return retry_after + backoff * 0.1
+    return backoff
+
+
+class CircuitBreaker:
+    """
+    Process-wide circuit breaker on workspace throttling.
+
+    After CIRCUIT_BREAKER_THRESHOLD consecutive throttled requests, the circuit opens: all new requests of all
+    tasks wait until it closes, instead of being throttled one after the other. The open period is at least the
+    Retry-After of the last throttled request, and doubles (up to a maximum) each time the circuit opens again
+    before a request succeeds.
+    """
+
+    def __init__(self, threshold: int = CIRCUIT_BREAKER_THRESHOLD,
+                 min_open_seconds: float = CIRCUIT_BREAKER_MIN_OPEN_SECONDS,
+                 max_open_seconds: float = CIRCUIT_BREAKER_MAX_OPEN_SECONDS):
+        self.threshold = max(threshold, 1)
+        self.min_open_seconds = min_open_seconds
+        self.max_open_seconds = max(max_open_seconds, min_open_seconds)
+        self._open_seconds = min_open_seconds
+        self._open_until = 0.0
+        self._consecutive_overloads = 0
+        self._lock = threading.Lock()
+        self.times_opened = 0
+        self.wait_seconds = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        return time.monotonic() < self._open_until
+
+    def wait_until_closed(self):
+        while True:
+            with self._lock:
+                remaining = self._open_until - time.monotonic()
+                if remaining <= 0:
+                    return
+                self.wait_seconds += remaining
+            time.sleep(remaining)
+
+    def record_success(self):
+        with self._lock:
+            self._consecutive_overloads = 0
+            self._open_seconds = self.min_open_seconds
+
+    def record_overload(self, retry_after: Optional[float] = None):
+        with self._lock:
+            self._consecutive_overloads += 1
+            if self._consecutive_overloads < self.threshold or time.monotonic() < self._open_until:
+                return
+            open_seconds = max(self._open_seconds, retry_after or 0)
+            self._open_until = time.monotonic() + open_seconds
+            self._open_seconds = min(self._open_seconds * 2, self.max_open_seconds)
+            self._consecutive_overloads = 0
+            self.times_opened += 1
+        logger.warning(f"Workspace is throttling API requests: pausing all requests for {open_seconds:.0f}s")
+
+
+class RetryStats:
+    """Process-wide counters of the retry layer"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.retries = 0
+        self.failures = 0
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+
+
+_circuit_breaker: Optional[CircuitBreaker] = None
+_retry_stats: Optional[RetryStats] = None
+_singletons_lock = threading.Lock()
+
+def get_circuit_breaker() -> CircuitBreaker:
+    global _circuit_breaker
+    with _singletons_lock:
+        if _circuit_breaker is None:
+            _circuit_breaker = CircuitBreaker()
+        return _circuit_breaker
+
+def get_retry_stats() -> RetryStats:
+    global _retry_stats
+    with _singletons_lock:
+        if _retry_stats is None:
+            _retry_stats = RetryStats()
+        return _retry_stats
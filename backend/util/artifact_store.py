@@ -0,0 +1,260 @@
+import os
+import re
+import json
+import time
+import uuid
+import hashlib
+import logging
+import threading
+from typing import Dict, Optional
+
+from cachetools import LRUCache
+
+from backend.util.local_state import get_local_state_dir
+
+logger = logging.getLogger(__name__)
+
+# Quotas of the garbage collection: artifact sets not used for this long are removed, and the least recently
+# used sets are removed while the artifacts still referenced take more space than this
+ARTIFACT_STORE_MAX_AGE_HOURS = float(os.getenv("ARTIFACT_STORE_MAX_AGE_HOURS", "72"))
+ARTIFACT_STORE_MAX_MB = float(os.getenv("ARTIFACT_STORE_MAX_MB", "512"))
+# Size of the in-memory cache of recently used artifacts (serialized)
+ARTIFACT_CACHE_MAX_MB = float(os.getenv("ARTIFACT_CACHE_MAX_MB", "64"))
+# Unreferenced artifacts younger than this are kept: they may belong to a set that is still being written
+ARTIFACT_GRACE_SECONDS = 3600
+
+# Kinds of artifacts in a set
+VALIDATED_JOBS = 'validated_jobs'
+EXISTING_JOBS = 'existing_jobs'
+JOB_SNAPSHOT = 'job_snapshot'
+
+_ARTIFACT_SET_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+def serialize_artifact(value) -> bytes:
+    """Compact, deterministic JSON: equal values give the same bytes (and the same content hash)"""
+    return json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+class ArtifactSet:
+    """
+    Artifacts published by one validation run (validated and existing job definitions, job snapshot), by kind
+    and name. Only the content hashes are kept in the set: the contents are stored once in the ArtifactStore.
+
+    The set becomes visible to import and delete once saved, under its opaque ID.
+    """
+
+    def __init__(self, store: 'ArtifactStore', artifact_set_id: str, entries: Optional[Dict[str, Dict[str, str]]] = None):
+        self.store = store
+        self.artifact_set_id = artifact_set_id
+        self._entries: Dict[str, Dict[str, str]] = entries or {}
+        self._lock = threading.Lock()
+        self.stored = 0
+        self.deduplicated = 0
+
+    def put(self, kind: str, name: str, value):
+        content_hash, is_new = self.store.put_object(value)
+        with self._lock:
+            self._entries.setdefault(kind, {})[name] = content_hash
+            if is_new:
+                self.stored += 1
+            else:
+                self.deduplicated += 1
+
+    def get(self, kind: str, name: str):
+        """Artifact (a new object on each call, it can be modified), None if the set has none with this name"""
+        content_hash = self._entries.get(kind, {}).get(name)
+        return self.store.get_object(content_hash) if content_hash else None
+
+    def has(self, kind: str, name: str) -> bool:
+        return name in self._entries.get(kind, {})
+
+    def save(self):
+        with self._lock:
+            manifest = {'created_at': time.time(), 'entries': self._entries}
+            self.store.write_manifest(self.artifact_set_id, manifest)
+
+
+class ArtifactStore:
+    """
+    Content-addressed store of validation artifacts in the local app state.
+
+    Artifacts are stored once per distinct content (compact JSON, named by its SHA-256), so that identical job
+    definitions validated by successive runs share their storage. Artifact sets reference them by hash, in a
+    small manifest per set, and are handed out by opaque ID (no local path ever leaves the backend).
+    Recently used artifacts are kept in memory (LRU). collect_garbage removes the sets over the age and size
+    quotas, then the artifacts no longer referenced by any set.
+    """
+
+    def __init__(self, root: Optional[str] = None,
+                 max_age_seconds: float = ARTIFACT_STORE_MAX_AGE_HOURS * 3600,
+                 max_bytes: float = ARTIFACT_STORE_MAX_MB * 1024 * 1024,
+                 cache_max_bytes: float = ARTIFACT_CACHE_MAX_MB * 1024 * 1024):
+        self.root = root or get_local_state_dir("artifacts")
+        self.objects_dir = os.path.join(self.root, "objects")
+        self.sets_dir = os.path.join(self.root, "sets")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.sets_dir, exist_ok=True)
+        self.max_age_seconds = max_age_seconds
+        self.max_bytes = max_bytes
+        self._cache = LRUCache(maxsize=max(int(cache_max_bytes), 1), getsizeof=len)
+        self._cache_lock = threading.Lock()
+        self._gc_lock = threading.Lock()
+
+    def _get_object_path(self, content_hash: str) -> str:
+        return os.path.join(self.objects_dir, content_hash[:2], f"{content_hash}.json")
+
+    def _get_manifest_path(self, artifact_set_id: str) -> str:
+        return os.path.join(self.sets_dir, f"{artifact_set_id}.json")
+
+    def _cache_object(self, content_hash: str, data: bytes):
+        with self._cache_lock:
+            try:
+                self._cache[content_hash] = data
+            except ValueError:
+                # Larger than the whole cache
+                pass
+
+    def put_object(self, value) -> tuple[str, bool]:
+        """Store an artifact, return its content hash and whether its content was not already stored"""
+        data = serialize_artifact(value)
+        content_hash = hashlib.sha256(data).hexdigest()
+        path = self._get_object_path(content_hash)
+        is_new = not os.path.exists(path)
+        if is_new:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        else:
+            # Refresh its age, so that the garbage collection does not take it for an orphan of a failed run
+            os.utime(path)
+        self._cache_object(content_hash, data)
+        return content_hash, is_new
+
+    def get_object(self, content_hash: str):
+        with self._cache_lock:
+            data = self._cache.get(content_hash)
+        if data is None:
+            with open(self._get_object_path(content_hash), 'rb') as f:
+                data = f.read()
+            self._cache_object(content_hash, data)
+        return json.loads(data)
+
+    def new_set(self) -> ArtifactSet:
+        self.collect_garbage()
+        return ArtifactSet(self, uuid.uuid4().hex)
+
+    def open_set(self, artifact_set_id: str) -> Optional[ArtifactSet]:
+        """Saved artifact set, None if the ID is unknown or the set was removed by the garbage collection"""
+        if not artifact_set_id or not _ARTIFACT_SET_ID_PATTERN.match(artifact_set_id):
+            return None
+        path = self._get_manifest_path(artifact_set_id)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            # The age quota applies to the last use of the set
+            os.utime(path)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return ArtifactSet(self, artifact_set_id, manifest.get('entries'))
+
+    def write_manifest(self, artifact_set_id: str, manifest: dict):
+        path = self._get_manifest_path(artifact_set_id)
+        with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, separators=(',', ':'))
+        os.replace(f"{path}.tmp", path)
+
+    def collect_garbage(self) -> dict:
+        """Remove the sets over the quotas, then the unreferenced artifacts. Returns what was removed."""
+        with self._gc_lock:
+            now = time.time()
+            stats = {'sets_removed': 0, 'objects_removed': 0, 'bytes_removed': 0}
+
+            # Sets by last use, most recent first
+            manifests = []
+            for file_name in os.listdir(self.sets_dir):
+                path = os.path.join(self.sets_dir, file_name)
+                if not file_name.endswith('.json'):
+                    if file_name.endswith('.tmp') and now - _get_mtime(path, now) > ARTIFACT_GRACE_SECONDS:
+                        _remove_file(path)
+                    continue
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        entries = json.load(f).get('entries', {})
+                except (OSError, json.JSONDecodeError):
+                    entries = None
+                manifests.append((_get_mtime(path, now), path, entries))
+            manifests.sort(key=lambda manifest: manifest[0], reverse=True)
+
+            object_sizes = {}
+            for dir_path, _, file_names in os.walk(self.objects_dir):
+                for file_name in file_names:
+                    path = os.path.join(dir_path, file_name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    object_sizes[path] = (stat.st_size, stat.st_mtime)
+
+            # Keep the sets within the age quota and, most recently used first, within the size quota.
+            # The most recent set is always kept.
+            referenced = set()
+            referenced_bytes = 0
+            for index, (used_at, path, entries) in enumerate(manifests):
+                set_paths = {
+                    self._get_object_path(content_hash)
+                    for kind_entries in (entries or {}).values() for content_hash in kind_entries.values()
+                } - referenced
+                set_bytes = sum(object_sizes.get(object_path, (0, 0))[0] for object_path in set_paths)
+                expired = now - used_at > self.max_age_seconds
+                over_quota = referenced_bytes + set_bytes > self.max_bytes
+                if entries is None or (index > 0 and (expired or over_quota)):
+                    _remove_file(path)
+                    stats['sets_removed'] += 1
+                    continue
+                referenced |= set_paths
+                referenced_bytes += set_bytes
+
+            for path, (size, modified_at) in object_sizes.items():
+                if path in referenced or now - modified_at < ARTIFACT_GRACE_SECONDS:
+                    continue
+                if _remove_file(path):
+                    stats['objects_removed'] += 1
+                    stats['bytes_removed'] += size
+
+            if stats['sets_removed'] or stats['objects_removed']:
+                with self._cache_lock:
+                    self._cache.clear()
+                logger.info(f"Artifact store garbage collection: removed {stats['sets_removed']} artifact set(s) and "
+                            f"{stats['objects_removed']} artifact(s) ({stats['bytes_removed'] / 1024:.0f} KiB), "
+                            f"{referenced_bytes / 1024:.0f} KiB still referenced")
+            return stats
+
+
+def _get_mtime(path: str, default: float) -> float:
+    try:
+        return os.path.getmtime(path)
+    except FileNotFoundError:
+        return default
+
+def _remove_file(path: str) -> bool:
+    try:
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False
+    except OSError as e:
+        logger.warning(f"Could not remove {path} from the artifact store: {str(e)}")
+        return False
+
+
+_artifact_store: Optional[ArtifactStore] = None
+_artifact_store_lock = threading.Lock()
+
+def get_artifact_store() -> ArtifactStore:
+    global _artifact_store
+    with _artifact_store_lock:
+        if _artifact_store is None:
+            _artifact_store = ArtifactStore()
+        return _artifact_store
@@ -0,0 +1,38 @@
+import re
+import json
+
+from backend.util.job_normalizer import normalize_job_settings
+
+# Top-level attributes of a job that change without any edit of the job definition itself
+VOLATILE_JOB_FIELDS = ('job_id', 'created_time', 'creator_user_name', 'effective_budget_policy_id', 'has_more', 'next_page_token')
+
+# Service principals are identified by their application ID (a UUID) in run_as_user_name
+_APPLICATION_ID_PATTERN = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', re.IGNORECASE)
+
+
+def canonicalize_job(job_dict: dict) -> dict:
+    """
+    Return the canonical form of a job definition (the input is not modified):
+    - volatile top-level attributes (job_id, created_time, creator_user_name, ...) are removed
+    - settings equal to their server-side default are removed (see job_normalizer.SERVER_DEFAULTS)
+    - the legacy top-level run_as_user_name is folded into settings.run_as
+    """
+    canonical = {key: value for key, value in job_dict.items() if key not in VOLATILE_JOB_FIELDS}
+
+    settings = normalize_job_settings(canonical.get('settings') or {})
+
+    run_as_user_name = canonical.pop('run_as_user_name', None)
+    if run_as_user_name and not settings.get('run_as'):
+        if _APPLICATION_ID_PATTERN.match(run_as_user_name):
+            settings['run_as'] = {'service_principal_name': run_as_user_name}
+        else:
+            settings['run_as'] = {'user_name': run_as_user_name}
+
+    if 'settings' in canonical or settings:
+        canonical['settings'] = settings
+    return canonical
+
+
+def dumps_canonical(job_dict: dict) -> str:
+    """Deterministic serialization of the canonical form, used for exported job definition files"""
+    return json.dumps(canonicalize_job(job_dict), indent=2, sort_keys=True, ensure_ascii=False) + "\n"
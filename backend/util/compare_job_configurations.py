@@ -1,3 +1,44 @@
+import json
+import hashlib
+
+from backend.util.canonical_job_json import canonicalize_job
+
+# Keys ignored at any depth (job_id also in run_job_task references, as resolved IDs differ between workspaces)
+IGNORED_KEYS = ('job_id', 'created_time', 'creator_user_name')
+
+# Lists whose entries are matched by a natural key (the Jobs API does not depend on their order)
+KEYED_LISTS = {
+    'tasks': 'task_key',
+    'job_clusters': 'job_cluster_key',
+    'parameters': 'name',
+    'environments': 'environment_key',
+    'depends_on': 'task_key',
+}
+
+def _get_list_key(list_name: str, items: list):
+    """Key attribute of a keyed list, or None if the entries are not all identified by a unique key"""
+    key = KEYED_LISTS.get(list_name)
+    if not key or not all(isinstance(item, dict) and key in item for item in items):
+        return None
+    if len({str(item[key]) for item in items}) != len(items):
+        return None
+    return key
+
+def _normalize_for_hash(value, name=None):
+    if isinstance(value, dict):
+        return {key: _normalize_for_hash(item, key) for key, item in value.items() if key not in IGNORED_KEYS}
+    if isinstance(value, list):
+        items = [_normalize_for_hash(item) for item in value]
+        list_key = _get_list_key(name, items)
+        return sorted(items, key=lambda item: str(item[list_key])) if list_key else items
+    return value
+
+def compute_comparison_hash(canonical_job_config: dict) -> str:
+    """Stable content hash of a job configuration in canonical form (see canonicalize_job): equal hashes
+    mean compare_job_configurations finds no difference"""
+    normalized = _normalize_for_hash(canonical_job_config)
+    return hashlib.sha256(json.dumps(normalized, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')).hexdigest()
+
 def compare_job_configurations(job_config1: dict, job_config2: dict) -> tuple[bool, list]:
     """
     Compare two job configurations and return if they're different and a list of differences.
@@ -11,28 +52,41 @@ def compare_job_configurations(job_config1: dict, job_config2: dict) -> tuple[bo
             is_different: True if configurations are different
             differences: List of string descriptions of differences, limited to first 10
 
-        Ignores differences in job_id, created_time, and creator_user_name
-        Special handling for run_as vs run_as_user_name to avoid false differences
+        Both configurations are compared in their canonical form (see canonicalize_job): volatile attributes,
+        server-default settings and the run_as vs run_as_user_name duality do not cause differences.
+        Ignores differences in job_id (also in run_job_task references)
+        Entries of keyed lists (tasks, job_clusters, parameters, ...) are matched by key, their order is ignored
+
+        Identical configurations (the common case) are detected by equality or comparison hash,
+        the structural walk only runs on a mismatch. The inputs are never modified.
     """
+    canonical1 = canonicalize_job(job_config1)
+    canonical2 = canonicalize_job(job_config2)
+
+    # Plain equality is the cheapest check; the hashes also ignore job_id references
+    if canonical1 == canonical2 or compute_comparison_hash(canonical1) == compute_comparison_hash(canonical2):
+        return False, []
+
     differences = []
     
-    def compare_dict(dict1, dict2, path=""):
-        # Special handling for run_as vs run_as_user_name at top level
-        if not path:  # Only at top level
-            run_as_user_name1 = dict1.get('run_as_user_name')
-            run_as_user_name2 = dict2.get('run_as_user_name')
-            run_as1 = dict1.get('settings', {}).get('run_as', {})
-            run_as2 = dict2.get('settings', {}).get('run_as', {})
-            
-            # If both have run_as_user_name and one has matching run_as, ignore the run_as difference
-            if run_as_user_name1 and run_as_user_name2 and run_as_user_name1 == run_as_user_name2:
-                if run_as1.get('user_name') == run_as_user_name1:
-                    dict1.get('settings', {}).pop('run_as', None)
-                if run_as2.get('user_name') == run_as_user_name2:
-                    dict2.get('settings', {}).pop('run_as', None)
-
+    def compare_dict(dict1, dict2, path="", name=None):
         if isinstance(dict1, list) and isinstance(dict2, list):
-            # Compare lists
+            # Compare keyed lists by key
+            list_key = _get_list_key(name, dict1) and _get_list_key(name, dict2)
+            if list_key:
+                items1 = {str(item[list_key]): item for item in dict1}
+                items2 = {str(item[list_key]): item for item in dict2}
+                for item_key in list(items1) + [item_key for item_key in items2 if item_key not in items1]:
+                    item_path = f"{path}[{list_key}={item_key}]"
+                    if item_key not in items1:
+                        differences.append(f"{item_path}: (added) → {items2[item_key]}")
+                    elif item_key not in items2:
+                        differences.append(f"{item_path}: {items1[item_key]} → (removed)")
+                    else:
+                        compare_dict(items1[item_key], items2[item_key], item_path)
+                return
+
+            # Compare other lists by index
             for i in range(max(len(dict1), len(dict2))):
                 if i >= len(dict1):
                     differences.append(f"{path}[{i}]: (added) → {dict2[i]}")
@@ -50,7 +104,7 @@ def compare_job_configurations(job_config1: dict, job_config2: dict) -> tuple[bo
         for key in set(dict1.keys()) | set(dict2.keys()):
             current_path = f"{path}.{key}" if path else key
 
-            if key in ('job_id', 'created_time', 'creator_user_name'):
+            if key in IGNORED_KEYS:
                 continue
 
             # Key exists in both
@@ -58,7 +112,7 @@ def compare_job_configurations(job_config1: dict, job_config2: dict) -> tuple[bo
                 if isinstance(dict1[key], dict) and isinstance(dict2[key], dict):
                     compare_dict(dict1[key], dict2[key], current_path)
                 elif isinstance(dict1[key], list) and isinstance(dict2[key], list):
-                    compare_dict(dict1[key], dict2[key], current_path)
+                    compare_dict(dict1[key], dict2[key], current_path, key)
                 elif dict1[key] != dict2[key]:
                     differences.append(f"{current_path}: {dict1[key]} → {dict2[key]}")
             # Key only in dict1
@@ -68,11 +122,6 @@ def compare_job_configurations(job_config1: dict, job_config2: dict) -> tuple[bo
             else:
                 differences.append(f"{current_path}: (added) → {dict2[key]}")
     
-    # Create deep copies to avoid modifying the original dicts
-    import copy
-    dict1_copy = copy.deepcopy(job_config1)
-    dict2_copy = copy.deepcopy(job_config2)
-    
-    compare_dict(dict1_copy, dict2_copy)
+    compare_dict(canonical1, canonical2)
 
     return bool(differences), differences[:10]  # Limit to first 10 differences
\ No newline at end of file
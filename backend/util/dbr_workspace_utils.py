@@ -1,10 +1,13 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 from databricks.sdk import WorkspaceClient
-from databricks.sdk.service.jobs import Job, JobSettings, Task, NotebookTask
+from databricks.sdk.service.jobs import BaseJob, Job, JobSettings, Task, NotebookTask
 import logging
 import os
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from backend.util.job_definition_cache import JobDefinitionCache, compute_listing_fingerprint
+
 logger = logging.getLogger(__name__)
     
 
@@ -54,3 +57,147 @@ def get_all_clusters_and_warehouses(client: WorkspaceClient) -> tuple[list, list
     return clusters_dict, warehouses_dict
 
 
+
+# Maximum page size accepted by the Jobs List API
+JOBS_LIST_PAGE_SIZE = 100
+
+def _is_listing_complete(job_dict: dict) -> bool:
+    """An expanded listing entry is complete unless tasks/job_clusters were truncated or run_as is unknown"""
+    if job_dict.get('has_more'):
+        return False
+    # jobs.get returns run_as_user_name, the listing only returns it as settings.run_as
+    return bool(job_dict.get('settings', {}).get('run_as'))
+
+def list_jobs_expanded(client: WorkspaceClient) -> List[BaseJob]:
+    """List all jobs including tasks and job_clusters, using the largest page size"""
+    return list(client.jobs.list(expand_tasks=True, limit=JOBS_LIST_PAGE_SIZE))
+
+def _job_from_listing(job_dict: dict) -> Job:
+    """Job equivalent to jobs.get from a complete expanded listing entry"""
+    job_dict.pop('has_more', None)
+    run_as = job_dict['settings']['run_as']
+    job_dict['run_as_user_name'] = run_as.get('user_name') or run_as.get('service_principal_name')
+    return Job.from_dict(job_dict)
+
+def complete_job_definition(client: WorkspaceClient, listed_job: BaseJob, cache: Optional[JobDefinitionCache] = None) -> tuple[Job, bool]:
+    """
+    Full definition of a single listed job: (job, whether the jobs.get fallback was called).
+    With a cache, the jobs.get fallback is avoided for jobs whose listing entry did not change since cached.
+    """
+    job_dict = listed_job.as_dict()
+    if _is_listing_complete(job_dict):
+        return _job_from_listing(job_dict), False
+
+    listing_fingerprint = compute_listing_fingerprint(job_dict) if cache is not None else None
+    if cache is not None:
+        cached_job_dict = cache.get(listed_job.job_id, listing_fingerprint)
+        if cached_job_dict is not None:
+            return Job.from_dict(cached_job_dict), False
+
+    job = client.jobs.get(job_id=listed_job.job_id)
+    if cache is not None:
+        cache.put(listed_job.job_id, listing_fingerprint, job.as_dict())
+    return job, True
+
+def complete_job_definitions(client: WorkspaceClient, listed_jobs: List[BaseJob], num_threads: int = 1) -> tuple[List[Job], list, dict]:
+    """
+    Turn expanded listing entries into full job definitions.
+
+    Falls back to jobs.get only for jobs whose listing entry is incomplete (more tasks or job clusters
+    than the list endpoint returns, or no run_as in the listed settings).
+    Returns: (jobs, failed_jobs, stats)
+        jobs: Job objects equivalent to jobs.get
+        failed_jobs: listed BaseJob objects whose fallback jobs.get failed
+        stats: API call counts
+    """
+    full_jobs = {}
+    incomplete_jobs = {}
+
+    for base_job in listed_jobs:
+        job_dict = base_job.as_dict()
+        if _is_listing_complete(job_dict):
+            full_jobs[base_job.job_id] = _job_from_listing(job_dict)
+        else:
+            full_jobs[base_job.job_id] = None
+            incomplete_jobs[base_job.job_id] = base_job
+
+    def get_job(job_id):
+        try:
+            return job_id, client.jobs.get(job_id=job_id)
+        except Exception as e:
+            logger.error(f"Failed to get job definition for job_id {job_id}: {str(e)}")
+            return job_id, None
+
+    if incomplete_jobs:
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            for job_id, job in executor.map(get_job, incomplete_jobs):
+                full_jobs[job_id] = job
+
+    jobs = [job for job in full_jobs.values() if job is not None]
+    failed_jobs = [incomplete_jobs[job_id] for job_id, job in full_jobs.items() if job is None]
+    stats = {
+        'get_calls': len(incomplete_jobs),
+        'api_calls_saved': len(full_jobs) - len(incomplete_jobs)
+    }
+    logger.info(f"Fetched {len(jobs)} full job definitions: {stats}")
+    return jobs, failed_jobs, stats
+
+def list_jobs_full(client: WorkspaceClient, num_threads: int = 1) -> tuple[List[Job], list, dict]:
+    """Get full definitions of all jobs from expanded listings (see complete_job_definitions)"""
+    return complete_job_definitions(client, list_jobs_expanded(client), num_threads)
+
+
+class ResourceNameResolver:
+    """
+    Export-scoped ID -> name resolver for clusters, warehouses and jobs.
+
+    Lists clusters, warehouses and jobs once and resolves IDs from in-memory dictionaries
+    instead of calling clusters.get / warehouses.get / jobs.get for every task.
+    IDs missing from the listings (e.g. clusters terminated long ago) fall back to a single
+    get() call, and the result (including "not found") is memoized.
+    """
+
+    def __init__(self, client: WorkspaceClient, jobs_list: list = None):
+        self.client = client
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        self.cluster_names = {cluster.cluster_id: cluster.cluster_name for cluster in client.clusters.list()}
+        self.warehouse_names = {warehouse.id: warehouse.name for warehouse in client.warehouses.list()}
+
+        if jobs_list is None:
+            jobs_list = client.jobs.list()
+        self.job_names = {job.job_id: job.settings.name for job in jobs_list if job.settings}
+
+    def _resolve(self, names: dict, resource_id, fetch_name):
+        with self._lock:
+            if resource_id in names:
+                self.hits += 1
+                return names[resource_id]
+            self.misses += 1
+
+        try:
+            name = fetch_name(resource_id)
+        except Exception:
+            name = None
+
+        with self._lock:
+            names[resource_id] = name
+        return name
+
+    def get_cluster_name(self, cluster_id):
+        return self._resolve(self.cluster_names, cluster_id,
+                             lambda cluster_id: self.client.clusters.get(cluster_id=cluster_id).cluster_name)
+
+    def get_warehouse_name(self, warehouse_id):
+        return self._resolve(self.warehouse_names, warehouse_id,
+                             lambda warehouse_id: self.client.warehouses.get(id=warehouse_id).name)
+
+    def get_job_name(self, job_id):
+        return self._resolve(self.job_names, job_id,
+                             lambda job_id: self.client.jobs.get(job_id=job_id).settings.name)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {'resolver_cache_hits': self.hits, 'resolver_cache_misses': self.misses}
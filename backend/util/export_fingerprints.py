@@ -0,0 +1,71 @@
+import json
+import os
+import hashlib
+import logging
+import threading
+
+from backend.util.local_state import get_local_state_dir, get_state_key
+from backend.util.canonical_job_json import dumps_canonical
+
+logger = logging.getLogger(__name__)
+
+
+def compute_job_fingerprint(job_dict: dict) -> str:
+    """Hash of the canonical form of an exported job definition"""
+    return hashlib.sha256(dumps_canonical(job_dict).encode('utf-8')).hexdigest()
+
+
+class ExportFingerprintStore:
+    """
+    Persisted fingerprints of the last successful export of every job, keyed by job_id.
+
+    Each entry stores the settings fingerprint and the modified_at of the exported file, so that
+    an incremental export can skip jobs whose live settings and Git file are both unchanged.
+    """
+
+    def __init__(self, workspace_host: str, workspace_folder: str):
+        state_dir = get_local_state_dir("export_fingerprints")
+        self.path = os.path.join(state_dir, f"{get_state_key(workspace_host, workspace_folder)}.json")
+        self._lock = threading.Lock()
+        self._previous = self._load()
+        self._current = {}
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable export fingerprints file {self.path}: {str(e)}")
+            return {}
+
+    def is_unchanged(self, job_id, fingerprint: str, file_modified_at) -> bool:
+        previous = self._previous.get(str(job_id))
+        return (previous is not None
+                and file_modified_at is not None
+                and previous.get('fingerprint') == fingerprint
+                and previous.get('file_modified_at') == file_modified_at)
+
+    def record(self, job_id, fingerprint: str, file_modified_at):
+        with self._lock:
+            self._current[str(job_id)] = {
+                'fingerprint': fingerprint,
+                'file_modified_at': file_modified_at
+            }
+
+    def retain(self, job_ids):
+        """Carry over previous fingerprints of jobs not processed in this run"""
+        with self._lock:
+            for job_id in job_ids:
+                previous = self._previous.get(str(job_id))
+                if previous is not None and str(job_id) not in self._current:
+                    self._current[str(job_id)] = previous
+
+    def save(self):
+        """Persist fingerprints recorded during this run, replacing the previous run's fingerprints"""
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            with open(tmp_path, 'w') as f:
+                json.dump(self._current, f)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,100 @@
+from typing import Dict, List, Optional
+
+# Operations of an import plan
+OPERATION_CREATE = 'create'
+OPERATION_RESET = 'reset'
+OPERATION_DELETE = 'delete'
+OPERATION_NOOP = 'noop'
+
+def get_job_reference_name(job_ref) -> Optional[str]:
+    """Name of the job referenced by a run_job_task job_id placeholder (__JOB__<name>__), None for a resolved ID"""
+    if isinstance(job_ref, str) and job_ref.startswith("__JOB__"):
+        return job_ref.replace("__JOB__", "").replace("__", "")
+    return None
+
+
+class ImportPlan:
+    """
+    Import plan computed from validated job statuses (see JobimportValidationTaskComponent).
+
+    Each job gets one operation: create (new job), reset (changed job), delete (deleted job, only with
+    include_deletes) or noop (unchanged, error or deleted without include_deletes). Operations are grouped in
+    topological waves: a job that references (run_job_task) a job created in the same import is planned in a later
+    wave than the referenced job, and deletes come last. Jobs of a wave do not depend on each other.
+    """
+
+    def __init__(self, job_statuses: List[dict], existing_job_names, include_deletes: bool = False):
+        existing_job_names = set(existing_job_names)
+        self.operations: Dict[str, dict] = {}
+        self.waves: List[List[str]] = []
+        # Jobs that cannot be planned (reference cycles between created jobs), with the reason
+        self.unplannable: Dict[str, str] = {}
+
+        for job_status in job_statuses:
+            job_name = job_status.get('job_name')
+            if not job_name:
+                continue
+            status = job_status.get('status')
+            if status in ('new', 'changed'):
+                operation = OPERATION_RESET if job_name in existing_job_names else OPERATION_CREATE
+            elif status == 'deleted' and include_deletes:
+                operation = OPERATION_DELETE
+            else:
+                operation = OPERATION_NOOP
+            self.operations[job_name] = {
+                'job_name': job_name,
+                'operation': operation,
+                'job_references': list(job_status.get('job_references', [])),
+                'depends_on': []
+            }
+
+        # Only references to jobs created by this import constrain the order
+        created_job_names = {name for name, op in self.operations.items() if op['operation'] == OPERATION_CREATE}
+        for op in self.operations.values():
+            if op['operation'] in (OPERATION_CREATE, OPERATION_RESET):
+                op['depends_on'] = sorted({name for name in op['job_references'] if name in created_job_names and name != op['job_name']})
+
+        # Jobs still referenced by imported jobs are not deleted
+        referenced_job_names = {
+            name for op in self.operations.values() if op['operation'] in (OPERATION_CREATE, OPERATION_RESET)
+            for name in op['job_references']
+        }
+        for op in self.operations.values():
+            if op['operation'] == OPERATION_DELETE and op['job_name'] in referenced_job_names:
+                self.unplannable[op['job_name']] = "Job is still referenced by imported jobs"
+
+        self._build_waves()
+
+    def _build_waves(self):
+        remaining = {
+            name: set(op['depends_on']) for name, op in self.operations.items()
+            if op['operation'] in (OPERATION_CREATE, OPERATION_RESET)
+        }
+        while remaining:
+            wave = sorted(name for name, depends_on in remaining.items() if not depends_on)
+            if not wave:
+                for name in sorted(remaining):
+                    self.unplannable[name] = f"Job references form a cycle between new jobs: {', '.join(sorted(remaining))}"
+                break
+            self.waves.append(wave)
+            for name in wave:
+                del remaining[name]
+            for depends_on in remaining.values():
+                depends_on.difference_update(wave)
+
+        deletes = sorted(
+            name for name, op in self.operations.items()
+            if op['operation'] == OPERATION_DELETE and name not in self.unplannable
+        )
+        if deletes:
+            self.waves.append(deletes)
+
+    def get_operation(self, job_name: str) -> Optional[dict]:
+        return self.operations.get(job_name)
+
+    def describe(self) -> str:
+        counts = {}
+        for op in self.operations.values():
+            counts[op['operation']] = counts.get(op['operation'], 0) + 1
+        summary = ", ".join(f"{count} {operation}" for operation, count in sorted(counts.items()))
+        return f"{summary} in {len(self.waves)} wave(s)"
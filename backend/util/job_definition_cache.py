@@ -0,0 +1,80 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Iterable, Optional
+
+from backend.util.local_state import get_local_state_dir, get_state_key
+
+logger = logging.getLogger(__name__)
+
+# Cached definitions older than this are revalidated with jobs.get even if their listing did not change
+JOB_DEFINITION_CACHE_TTL_SECONDS = int(os.getenv("JOB_DEFINITION_CACHE_TTL_SECONDS", "3600"))
+
+def compute_listing_fingerprint(listed_job_dict: dict) -> str:
+    """Hash of an (expanded) job listing entry, used to detect that a job changed since it was cached"""
+    listed = {key: listed_job_dict.get(key) for key in ('settings', 'has_more')}
+    return hashlib.sha256(json.dumps(listed, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
+class JobDefinitionCache:
+    """
+    Persistent (SQLite on local disk) cache of full job definitions of a workspace, keyed by job_id.
+
+    A cached definition is served only while the listing entry of the job is unchanged
+    (same listing fingerprint) and it is not older than the TTL. With force_refresh, nothing is
+    served from the cache but fetched definitions are still stored.
+    """
+
+    def __init__(self, workspace_host: str, ttl_seconds: int = JOB_DEFINITION_CACHE_TTL_SECONDS, force_refresh: bool = False):
+        self.ttl_seconds = ttl_seconds
+        self.force_refresh = force_refresh
+        self.path = os.path.join(get_local_state_dir('job_definition_cache'), f"{get_state_key(workspace_host)}.sqlite")
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS job_definitions ("
+                "job_id INTEGER PRIMARY KEY, listing_fingerprint TEXT NOT NULL, definition TEXT NOT NULL, fetched_at REAL NOT NULL)"
+            )
+
+    def get(self, job_id: int, listing_fingerprint: str) -> Optional[dict]:
+        """Cached job definition, or None if missing, changed since cached or expired"""
+        if self.force_refresh:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT listing_fingerprint, definition, fetched_at FROM job_definitions WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            if row is None or row[0] != listing_fingerprint or time.time() - row[2] > self.ttl_seconds:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return json.loads(row[1])
+
+    def put(self, job_id: int, listing_fingerprint: str, job_dict: dict):
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO job_definitions (job_id, listing_fingerprint, definition, fetched_at) VALUES (?, ?, ?, ?)",
+                (job_id, listing_fingerprint, json.dumps(job_dict), time.time())
+            )
+
+    def retain(self, job_ids: Iterable[int]):
+        """Forget the jobs that no longer exist in the workspace"""
+        job_ids = set(job_ids)
+        with self._lock, self._connection:
+            cached_ids = [row[0] for row in self._connection.execute("SELECT job_id FROM job_definitions")]
+            self._connection.executemany(
+                "DELETE FROM job_definitions WHERE job_id = ?", [(job_id,) for job_id in cached_ids if job_id not in job_ids]
+            )
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -50,6 +50,15 @@ def setup_job_logger(name: str = "job_logger") -> tuple[logging.Logger, StringLi
     
     return logger, string_handler
 
+def release_job_logger(logger: logging.Logger):
+    """Close the handlers of a job logger and forget it (the logging module keeps every named logger forever)"""
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+        if isinstance(handler, StringListHandler):
+            handler.clear()
+    logging.Logger.manager.loggerDict.pop(logger.name, None)
+
 def log_exception(logger: logging.Logger, message: str, e: Exception):
     """Helper function to log exceptions with file and line information"""
     exc_type, exc_value, exc_traceback = sys.exc_info()
@@ -0,0 +1,72 @@
+# Semantic normalization of job settings: values the Jobs API fills in with a default are treated
+# as equal to absent fields, so that hand-edited job definition files without them compare equal
+# to the definitions returned by the API.
+
+# Server-side defaults of job settings, by path in the settings ('*' matches every entry of a list)
+SERVER_DEFAULTS = {
+    'email_notifications': {},
+    'webhook_notifications': {},
+    'notification_settings': {},
+    'timeout_seconds': 0,
+    'max_concurrent_runs': 1,
+    'format': 'MULTI_TASK',
+    'tasks.*.email_notifications': {},
+    'tasks.*.webhook_notifications': {},
+    'tasks.*.notification_settings': {},
+    'tasks.*.timeout_seconds': 0,
+    'tasks.*.max_retries': 0,
+    'tasks.*.retry_on_timeout': False,
+    'tasks.*.run_if': 'ALL_SUCCESS',
+    'tasks.*.disable_auto_optimization': False,
+    'tasks.*.run_job_task.job_parameters': {},
+    'tasks.*.for_each_task.task.run_if': 'ALL_SUCCESS',
+    'tasks.*.for_each_task.task.timeout_seconds': 0,
+}
+
+# Default source of the task files of jobs without git_source (with a git_source, the default is GIT,
+# so an explicit WORKSPACE source is kept)
+WORKSPACE_SOURCE_DEFAULTS = {
+    'tasks.*.notebook_task.source': 'WORKSPACE',
+    'tasks.*.spark_python_task.source': 'WORKSPACE',
+    'tasks.*.sql_task.file.source': 'WORKSPACE',
+    'tasks.*.dbt_task.source': 'WORKSPACE',
+    'tasks.*.for_each_task.task.notebook_task.source': 'WORKSPACE',
+}
+
+_DEFAULT = object()
+
+def _build_tree(defaults: dict) -> dict:
+    tree = {}
+    for path, default in defaults.items():
+        node = tree
+        for part in path.split('.'):
+            node = node.setdefault(part, {})
+        node[_DEFAULT] = default
+    return tree
+
+_SERVER_DEFAULTS_TREE = _build_tree(SERVER_DEFAULTS)
+_SERVER_DEFAULTS_WITHOUT_GIT_SOURCE_TREE = _build_tree({**SERVER_DEFAULTS, **WORKSPACE_SOURCE_DEFAULTS})
+
+def _strip_defaults(value, tree: dict):
+    if isinstance(value, list):
+        entry_tree = tree.get('*')
+        return [_strip_defaults(item, entry_tree) for item in value] if entry_tree else value
+    if not isinstance(value, dict):
+        return value
+
+    result = {}
+    for key, item in value.items():
+        node = tree.get(key)
+        if node is None:
+            result[key] = item
+        elif _DEFAULT in node and item == node[_DEFAULT]:
+            continue
+        else:
+            result[key] = _strip_defaults(item, node)
+    return result
+
+def normalize_job_settings(settings: dict) -> dict:
+    """Return a copy of the job settings without the values equal to their server-side default
+    (the input is not modified, unchanged sub-structures are shared)"""
+    tree = _SERVER_DEFAULTS_TREE if settings.get('git_source') else _SERVER_DEFAULTS_WITHOUT_GIT_SOURCE_TREE
+    return _strip_defaults(settings, tree)
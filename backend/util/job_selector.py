@@ -0,0 +1,121 @@
+import re
+import fnmatch
+from typing import List, Optional
+
+
+class JobSelector:
+    """
+    Selects the subset of jobs a workflow run applies to.
+
+    All given criteria must match (AND), a criterion with several values matches any of them (OR):
+        name_patterns: glob patterns on the job name (e.g. "team-a-*")
+        name_regex: regular expression searched in the job name
+        tags: "key" (tag present) or "key=value" (tag with this value)
+        creators: creator user names
+        run_as: run-as user names or service principal application IDs
+    An empty selector matches all jobs.
+    """
+
+    def __init__(self, name_patterns: Optional[List[str]] = None, name_regex: Optional[str] = None,
+                 tags: Optional[List[str]] = None, creators: Optional[List[str]] = None,
+                 run_as: Optional[List[str]] = None):
+        self.name_patterns = list(name_patterns or [])
+        self.name_regex = re.compile(name_regex) if name_regex else None
+        self.tags = [tag.split('=', 1) if '=' in tag else [tag, None] for tag in (tags or [])]
+        self.creators = set(creators or [])
+        self.run_as = set(run_as or [])
+
+    @classmethod
+    def from_request(cls, selector_request) -> 'JobSelector':
+        if selector_request is None:
+            return cls()
+        return cls(
+            name_patterns=selector_request.namePatterns,
+            name_regex=selector_request.nameRegex,
+            tags=selector_request.tags,
+            creators=selector_request.creators,
+            run_as=selector_request.runAs
+        )
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.name_patterns or self.name_regex or self.tags or self.creators or self.run_as)
+
+    @property
+    def has_metadata_filters(self) -> bool:
+        """True if the selector needs more than the job name (i.e. the job definition) to decide"""
+        return bool(self.tags or self.creators or self.run_as)
+
+    def matches_name(self, job_name: Optional[str]) -> bool:
+        if job_name is None:
+            return self.is_empty
+        if self.name_patterns and not any(fnmatch.fnmatchcase(job_name, pattern) for pattern in self.name_patterns):
+            return False
+        if self.name_regex and not self.name_regex.search(job_name):
+            return False
+        return True
+
+    def matches_file_name(self, file_name: str) -> bool:
+        """Pre-download check on a job definition file name (<job name>.json)"""
+        job_name = file_name[:-len('.json')] if file_name.endswith('.json') else file_name
+        return self.matches_name(job_name)
+
+    def matches_job(self, job_dict: dict, allow_unknown_run_as: bool = False) -> bool:
+        """
+        Check a live job (as_dict() of a listed or fetched job), see matches_job_file for job definition files.
+        With allow_unknown_run_as, a job without run_as information is not excluded by the run_as criterion
+        (expanded listings only return run_as when it is set explicitly).
+        """
+        return self._matches(job_dict, allow_unknown_run_as, check_creators=True)
+
+    def matches_job_file(self, job_dict: dict, live_job_dict: Optional[dict] = None) -> bool:
+        """
+        Check a job definition file (exported file content), given the live job of the same name if there is one.
+        A file is selected when its live job is selected, or when its own content matches (e.g. tags or run_as
+        edited in Git, about to be imported). Files do not record their creator: with a creators criterion,
+        a file with a live job is only selected by its live job, and the criterion does not apply to files
+        without a live job (new or deleted jobs).
+        """
+        if live_job_dict is not None:
+            if self.matches_job(live_job_dict):
+                return True
+            if self.creators:
+                return False
+        return self._matches(job_dict, allow_unknown_run_as=False, check_creators=False)
+
+    def _matches(self, job_dict: dict, allow_unknown_run_as: bool, check_creators: bool) -> bool:
+        settings = job_dict.get('settings') or {}
+        if not self.matches_name(settings.get('name')):
+            return False
+
+        if self.tags:
+            job_tags = settings.get('tags') or {}
+            if not any(key in job_tags and (value is None or job_tags[key] == value) for key, value in self.tags):
+                return False
+
+        if check_creators and self.creators and job_dict.get('creator_user_name') not in self.creators:
+            return False
+
+        if self.run_as:
+            run_as = settings.get('run_as') or {}
+            identity = run_as.get('user_name') or run_as.get('service_principal_name') or job_dict.get('run_as_user_name')
+            if identity is None:
+                return allow_unknown_run_as
+            if identity not in self.run_as:
+                return False
+
+        return True
+
+    def describe(self) -> str:
+        parts = []
+        if self.name_patterns:
+            parts.append(f"name in {self.name_patterns}")
+        if self.name_regex:
+            parts.append(f"name ~ /{self.name_regex.pattern}/")
+        if self.tags:
+            parts.append("tags in " + str([f"{key}={value}" if value is not None else key for key, value in self.tags]))
+        if self.creators:
+            parts.append(f"creator in {sorted(self.creators)}")
+        if self.run_as:
+            parts.append(f"run_as in {sorted(self.run_as)}")
+        return " and ".join(parts) if parts else "all jobs"
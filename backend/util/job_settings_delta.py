@@ -0,0 +1,91 @@
+import json
+from typing import Optional
+
+from backend.util.canonical_job_json import canonicalize_job
+from backend.util.compare_job_configurations import KEYED_LISTS
+from backend.util.job_normalizer import SERVER_DEFAULTS
+
+# Lists that jobs.update merges entry by entry (by key), and whose entries fields_to_remove can remove
+MERGED_LISTS = {
+    'tasks': 'task_key',
+    'job_clusters': 'job_cluster_key',
+}
+
+# Top-level settings that cannot be removed by jobs.update (a delta removing them falls back to reset)
+NON_REMOVABLE_FIELDS = ('name', 'run_as')
+
+
+def _comparable(value, name=None):
+    """Value with keyed lists sorted by key, so that equal settings in another order compare equal"""
+    if isinstance(value, dict):
+        return {key: _comparable(item, key) for key, item in value.items()}
+    if isinstance(value, list):
+        items = [_comparable(item) for item in value]
+        key = KEYED_LISTS.get(name)
+        if key and all(isinstance(item, dict) and key in item for item in items):
+            return sorted(items, key=lambda item: str(item[key]))
+        return items
+    return value
+
+def _get_keyed_entries(items, key: str) -> Optional[dict]:
+    """Entries of a merged list by key, None if they are not all identified by a unique key"""
+    if not isinstance(items, list) or not all(isinstance(item, dict) and key in item for item in items):
+        return None
+    entries = {str(item[key]): item for item in items}
+    return entries if len(entries) == len(items) else None
+
+
+def compute_job_settings_delta(existing_job_dict: dict, new_job_dict: dict) -> Optional[dict]:
+    """
+    Minimal jobs.update request turning the existing job into the new job definition.
+
+    Both definitions are compared in their canonical form (see canonicalize_job). Changed top-level settings are
+    sent in new_settings, removed ones in fields_to_remove. tasks and job_clusters are merged by key by jobs.update:
+    only their changed entries are sent, and removed entries are listed as e.g. "tasks/<task_key>".
+
+    Returns: {'new_settings': dict, 'fields_to_remove': list}, or None when the delta cannot be expressed
+    as an update (a full reset is needed)
+    """
+    existing_settings = canonicalize_job(existing_job_dict).get('settings', {})
+    new_settings = canonicalize_job(new_job_dict).get('settings', {})
+
+    delta_settings = {}
+    fields_to_remove = []
+
+    for field in sorted(existing_settings.keys() | new_settings.keys()):
+        if field not in new_settings:
+            if field in SERVER_DEFAULTS:
+                # Removed or set to its default value (absent from the canonical form): both mean the default
+                delta_settings[field] = SERVER_DEFAULTS[field]
+            elif field in NON_REMOVABLE_FIELDS:
+                return None
+            else:
+                fields_to_remove.append(field)
+            continue
+        if field in existing_settings and _comparable(existing_settings[field], field) == _comparable(new_settings[field], field):
+            continue
+
+        if field in MERGED_LISTS and field in existing_settings:
+            key = MERGED_LISTS[field]
+            existing_entries = _get_keyed_entries(existing_settings[field], key)
+            new_entries = _get_keyed_entries(new_settings[field], key)
+            if existing_entries is None or new_entries is None:
+                return None
+            changed_entries = [
+                entry for entry_key, entry in new_entries.items()
+                if entry_key not in existing_entries or _comparable(existing_entries[entry_key]) != _comparable(entry)
+            ]
+            if changed_entries:
+                delta_settings[field] = changed_entries
+            fields_to_remove.extend(f"{field}/{entry_key}" for entry_key in sorted(existing_entries.keys() - new_entries.keys()))
+        elif isinstance(new_settings[field], list) and field in existing_settings:
+            # Other lists may be merged by jobs.update as well: removed entries could not be expressed
+            return None
+        else:
+            delta_settings[field] = new_settings[field]
+
+    return {'new_settings': delta_settings, 'fields_to_remove': fields_to_remove}
+
+def get_payload_size(payload: dict) -> int:
+    """Size in bytes of a request body, as sent by the SDK (JSON)"""
+    return len(json.dumps(payload).encode('utf-8'))
@@ -0,0 +1,101 @@
+import json
+import time
+import hashlib
+from typing import Dict, Optional
+
+from databricks.sdk import WorkspaceClient
+from databricks.sdk.errors import NotFound, ResourceDoesNotExist
+
+from backend.util.artifact_store import ArtifactSet, JOB_SNAPSHOT
+from backend.util.job_normalizer import normalize_job_settings
+
+# Changes of a job since the snapshot (see JobSnapshot.check_job)
+JOB_CREATED = 'created'
+JOB_DELETED = 'deleted'
+JOB_MODIFIED = 'modified'
+
+# Kind of API response a fingerprint was computed from: an expanded listing entry and a jobs.get response
+# do not return exactly the same settings, so a job is always checked with the same kind of response
+FINGERPRINT_FROM_LISTING = 'list'
+FINGERPRINT_FROM_GET = 'get'
+
+
+def compute_settings_fingerprint(settings: dict) -> str:
+    """Hash of the normalized settings of a job (server-side defaults ignored)"""
+    normalized = normalize_job_settings(settings or {})
+    return hashlib.sha256(json.dumps(normalized, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')).hexdigest()
+
+def find_live_job_id(client: WorkspaceClient, job_name: str) -> Optional[int]:
+    """ID of a job with the given name in the workspace (one filtered listing call), None if there is none"""
+    for job in client.jobs.list(name=job_name, limit=1):
+        return job.job_id
+    return None
+
+
+class JobSnapshot:
+    """
+    Immutable snapshot of the live jobs, published by validation in its artifact set and consumed by
+    import and delete, so that they do not list the jobs again.
+
+    Jobs are keyed by name, with their ID, the fingerprint of their settings (None when validation only had
+    a truncated listing of the job) and the kind of response it was computed from. Before writing a job, import
+    and delete check that it did not change since the snapshot (one call, of the same kind as the fingerprint),
+    so that jobs modified by someone else since validation are reported instead of being silently overwritten.
+    """
+
+    def __init__(self, jobs: Dict[str, dict], created_at: Optional[float] = None):
+        self._jobs = jobs
+        self.created_at = created_at or time.time()
+
+    @classmethod
+    def load(cls, artifact_set: ArtifactSet) -> Optional['JobSnapshot']:
+        """Snapshot published by validation, None for validations that did not publish one"""
+        data = artifact_set.get(JOB_SNAPSHOT, 'jobs')
+        if data is None:
+            return None
+        return cls(data['jobs'], data.get('created_at'))
+
+    @classmethod
+    def from_listing(cls, client: WorkspaceClient) -> 'JobSnapshot':
+        """Snapshot of job IDs only (no fingerprints), for validation results without a published snapshot"""
+        return cls({job.settings.name: {'job_id': job.job_id, 'fingerprint': None} for job in client.jobs.list()})
+
+    def save(self, artifact_set: ArtifactSet):
+        artifact_set.put(JOB_SNAPSHOT, 'jobs', {'created_at': self.created_at, 'jobs': self._jobs})
+
+    def __contains__(self, job_name: str) -> bool:
+        return job_name in self._jobs
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def job_names(self):
+        return self._jobs.keys()
+
+    def get_job_id(self, job_name: str) -> Optional[int]:
+        entry = self._jobs.get(job_name)
+        return entry['job_id'] if entry else None
+
+    def check_job(self, client: WorkspaceClient, job_name: str) -> Optional[str]:
+        """Change of the job since the snapshot (JOB_CREATED, JOB_DELETED or JOB_MODIFIED), None if unchanged"""
+        entry = self._jobs.get(job_name)
+        if entry is None:
+            return JOB_CREATED if find_live_job_id(client, job_name) is not None else None
+        fingerprint = entry.get('fingerprint')
+        from_listing = entry.get('fingerprint_source') == FINGERPRINT_FROM_LISTING
+        if fingerprint and from_listing:
+            for listed_job in client.jobs.list(name=job_name, expand_tasks=True):
+                if listed_job.job_id == entry['job_id']:
+                    if listed_job.has_more or compute_settings_fingerprint(listed_job.settings.as_dict()) != fingerprint:
+                        return JOB_MODIFIED
+                    return None
+            # Renamed or deleted
+        try:
+            job = client.jobs.get(entry['job_id'])
+        except (NotFound, ResourceDoesNotExist):
+            return JOB_DELETED
+        if fingerprint and from_listing:
+            return JOB_MODIFIED
+        if fingerprint and compute_settings_fingerprint(job.settings.as_dict() if job.settings else {}) != fingerprint:
+            return JOB_MODIFIED
+        return None
@@ -0,0 +1,19 @@
+import os
+import hashlib
+import tempfile
+
+# Local (per app instance) directory used to persist caches and state between runs
+APP_STATE_DIR = os.getenv(
+    'APP_STATE_DIR',
+    os.path.join(tempfile.gettempdir(), "dbr-workflow-jobs-sync-app")
+)
+
+def get_local_state_dir(*parts: str) -> str:
+    """Return a sub-directory of the local app state directory, creating it if needed"""
+    path = os.path.join(APP_STATE_DIR, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def get_state_key(*parts) -> str:
+    """Stable short key for a combination of values (e.g. workspace host and folder path)"""
+    return hashlib.sha1("|".join(str(part) for part in parts).encode('utf-8')).hexdigest()[:16]
@@ -0,0 +1,90 @@
+import os
+import re
+import time
+import logging
+import threading
+from typing import Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Maximal request rates (requests per second) by API family, shared by all tasks and endpoints of the app
+API_RATE_LIMITS = {
+    'jobs': float(os.getenv("JOBS_API_RATE_LIMIT", "20")),
+    'workspace': float(os.getenv("WORKSPACE_API_RATE_LIMIT", "10")),
+    'compute': float(os.getenv("COMPUTE_API_RATE_LIMIT", "10")),
+    'other': float(os.getenv("OTHER_API_RATE_LIMIT", "10")),
+}
+
+# First path segment (after /api/<version>/) of each API family
+API_FAMILIES = {
+    'jobs': 'jobs',
+    'workspace': 'workspace',
+    'workspace-files': 'workspace',
+    'fs': 'workspace',
+    'clusters': 'compute',
+    'sql': 'compute',
+}
+
+_API_PATH_PATTERN = re.compile(r'^/api/[^/]+/([^/]+)')
+
+def get_api_family(url: str) -> str:
+    match = _API_PATH_PATTERN.match(urlparse(url).path)
+    return API_FAMILIES.get(match.group(1), 'other') if match else 'other'
+
+
+class TokenBucket:
+    """Token bucket: 'rate' requests per second on average, bursts of up to 'capacity' requests"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+        self.waits = 0
+        self.wait_seconds = 0.0
+
+    def acquire(self):
+        """Take one token, waiting until one is available"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            # Tokens may go negative: each waiting caller reserves its own future token
+            self._tokens -= 1
+            wait_seconds = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            if wait_seconds:
+                self.waits += 1
+                self.wait_seconds += wait_seconds
+        if wait_seconds:
+            time.sleep(wait_seconds)
+
+
+class ApiRateLimiter:
+    """Process-wide request rate limit of the Databricks APIs, with one token bucket per API family"""
+
+    def __init__(self, rate_limits: dict = API_RATE_LIMITS):
+        self.buckets = {family: TokenBucket(rate) for family, rate in rate_limits.items() if rate > 0}
+
+    def acquire(self, url: str):
+        bucket = self.buckets.get(get_api_family(url))
+        if bucket is not None:
+            bucket.acquire()
+
+    def get_stats(self) -> dict:
+        return {
+            family: {'rate': bucket.rate, 'waits': bucket.waits, 'wait_seconds': round(bucket.wait_seconds, 3)}
+            for family, bucket in self.buckets.items()
+        }
+
+
+_rate_limiter: Optional[ApiRateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+def get_api_rate_limiter() -> ApiRateLimiter:
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = ApiRateLimiter()
+        return _rate_limiter
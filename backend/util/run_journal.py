@@ -0,0 +1,183 @@
+import os
+import json
+import time
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from backend.util.local_state import get_local_state_dir
+
+logger = logging.getLogger(__name__)
+
+# Journals not updated for this long are removed
+RUN_JOURNAL_RETENTION_SECONDS = 7 * 24 * 3600
+
+# Journal events
+EVENT_RUN = 'run'
+EVENT_RESUMED = 'resumed'
+EVENT_STARTED = 'started'
+EVENT_COMPLETED = 'completed'
+EVENT_FAILED = 'failed'
+EVENT_FINISHED = 'finished'
+
+def _get_journal_path(run_id: str) -> str:
+    return os.path.join(get_local_state_dir("run_journals"), f"{run_id}.jsonl")
+
+
+class RunJournalState:
+    """State of a run replayed from its journal events"""
+
+    def __init__(self, records: Optional[List[dict]] = None):
+        self.completed: Dict[str, dict] = {}
+        self.failed: Dict[str, str] = {}
+        # Jobs started but neither completed nor failed
+        self.in_flight: Dict[str, dict] = {}
+        self.finished_status: Optional[str] = None
+        for record in records or []:
+            self._apply(record)
+
+    def _apply(self, record: dict):
+        event, key = record.get('event'), record.get('key')
+        if event == EVENT_STARTED:
+            self.in_flight[key] = record.get('details', {})
+        elif event == EVENT_COMPLETED:
+            self.in_flight.pop(key, None)
+            self.failed.pop(key, None)
+            self.completed[key] = record.get('details', {})
+        elif event == EVENT_FAILED:
+            self.in_flight.pop(key, None)
+            self.failed[key] = record.get('error')
+        elif event == EVENT_FINISHED:
+            self.finished_status = record.get('status')
+        elif event == EVENT_RESUMED:
+            self.finished_status = None
+
+
+class RunJournal(RunJournalState):
+    """
+    Append-only journal of the per-job operations of an import or export run, in the local app state.
+
+    Each line is a JSON event: the run parameters first, then started / completed / failed events of the
+    jobs (keyed by job name for imports, job ID for exports), and the final status of the run. Events are
+    flushed to disk before the next operation starts, so that after a crash or restart the run can be
+    resumed: completed jobs are skipped, and jobs that were in flight (started but neither completed nor
+    failed) are checked again.
+    """
+
+    def __init__(self, run_id: str, kind: str, params: dict, records: Optional[List[dict]] = None):
+        # The replayed state is the one of the previous runs of the journal (empty for a new run)
+        super().__init__(records)
+        self.run_id = run_id
+        self.kind = kind
+        self.params = params
+        self.path = _get_journal_path(run_id)
+        self._lock = threading.Lock()
+        self._file = open(self.path, 'a', encoding='utf-8')
+        if self._file.tell() > 0 and not _ends_with_newline(self.path):
+            # Terminate the record partially written when the app stopped
+            self._file.write("\n")
+
+    @classmethod
+    def create(cls, run_id: str, kind: str, params: dict) -> 'RunJournal':
+        _prune_expired_journals()
+        journal = cls(run_id, kind, params)
+        journal._append({'event': EVENT_RUN, 'kind': kind, 'params': params})
+        return journal
+
+    @classmethod
+    def open_existing(cls, run_id: str) -> Optional['RunJournal']:
+        """Load the journal of a previous run to resume it, None if there is none"""
+        records = _read_records(_get_journal_path(run_id))
+        if not records or records[0].get('event') != EVENT_RUN:
+            return None
+        return cls(run_id, records[0]['kind'], records[0].get('params', {}), records[1:])
+
+    @property
+    def is_resumed(self) -> bool:
+        return bool(self.completed or self.failed or self.in_flight)
+
+    def _append(self, record: dict):
+        record['time'] = round(time.time(), 3)
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def record_resumed(self):
+        self._append({'event': EVENT_RESUMED})
+
+    def record_started(self, key: str, **details):
+        self._append({'event': EVENT_STARTED, 'key': str(key), 'details': details})
+
+    def record_completed(self, key: str, **details):
+        self._append({'event': EVENT_COMPLETED, 'key': str(key), 'details': details})
+
+    def record_failed(self, key: str, error: str):
+        self._append({'event': EVENT_FAILED, 'key': str(key), 'error': error})
+
+    def record_finished(self, status: str):
+        self._append({'event': EVENT_FINISHED, 'status': status})
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def _ends_with_newline(path: str) -> bool:
+    with open(path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+def _read_records(path: str) -> List[dict]:
+    records = []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Last line partially written when the app stopped
+                    logger.warning(f"Ignoring truncated record in run journal {path}")
+    except FileNotFoundError:
+        pass
+    return records
+
+def list_resumable_runs(kind: str) -> List[dict]:
+    """Runs of the given kind ('import' or 'export') that did not finish successfully, most recent first"""
+    runs = []
+    journals_dir = get_local_state_dir("run_journals")
+    for file_name in os.listdir(journals_dir):
+        if not file_name.endswith('.jsonl'):
+            continue
+        path = os.path.join(journals_dir, file_name)
+        records = _read_records(path)
+        if not records or records[0].get('event') != EVENT_RUN or records[0].get('kind') != kind:
+            continue
+        journal_state = RunJournalState(records[1:])
+        if journal_state.finished_status == 'completed':
+            continue
+        runs.append({
+            'runId': file_name[:-len('.jsonl')],
+            'startedAt': records[0].get('time'),
+            'updatedAt': records[-1].get('time'),
+            'finishedStatus': journal_state.finished_status,
+            'completedJobs': len(journal_state.completed),
+            'failedJobs': len(journal_state.failed),
+            'inFlightJobs': len(journal_state.in_flight)
+        })
+    return sorted(runs, key=lambda run: run['updatedAt'] or 0, reverse=True)
+
+def _prune_expired_journals():
+    journals_dir = get_local_state_dir("run_journals")
+    expired_before = time.time() - RUN_JOURNAL_RETENTION_SECONDS
+    for file_name in os.listdir(journals_dir):
+        path = os.path.join(journals_dir, file_name)
+        try:
+            if os.path.getmtime(path) < expired_before:
+                os.remove(path)
+        except OSError as e:
+            logger.warning(f"Could not remove expired run journal {path}: {str(e)}")
+
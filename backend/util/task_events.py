@@ -0,0 +1,77 @@
+# Incremental task events for push-based progress streaming (SSE / WebSocket)
+#
+# A TaskEventDiffer compares consecutive status snapshots of a task (the same payload that the
+# /status endpoints return) and produces only the changes: status fields, changed progress counters,
+# per-job status transitions, appended output text and new log records.
+
+# Top-level list fields holding per-job statuses, with a function computing the key of an entry
+KEYED_LIST_FIELDS = {
+    'jobStatuses': lambda entry: entry.get('file_name') or f"job:{entry.get('job_name')}",
+    'jobImportStatuses': lambda entry: entry.get('jobName'),
+    'jobDeleteStatuses': lambda entry: entry.get('jobName'),
+}
+
+# Top-level list fields that only ever grow
+APPEND_ONLY_FIELDS = ('logRecords', 'taskIssues')
+
+FINAL_STATUSES = ('completed', 'completed_with_errors', 'completed_with_warnings', 'completed_no_changes', 'failed')
+
+
+class TaskEventDiffer:
+
+    def __init__(self):
+        self.previous = None
+
+    def _snapshot_event(self, state: dict) -> dict:
+        keys = {
+            field: [key_fn(entry) for entry in state.get(field) or []]
+            for field, key_fn in KEYED_LIST_FIELDS.items()
+            if field in state
+        }
+        return {'type': 'snapshot', 'state': state, 'keys': keys}
+
+    def next_events(self, state: dict) -> list:
+        """Return the events describing the transition from the previous snapshot to this one"""
+        previous, self.previous = self.previous, state
+        if previous is None:
+            events = [self._snapshot_event(state)]
+            if state.get('status') in FINAL_STATUSES:
+                events.append({'type': 'done', 'status': state.get('status')})
+            return events
+
+        events = []
+        status_fields = {}
+
+        for field, value in state.items():
+            old_value = previous.get(field)
+            if value == old_value:
+                continue
+
+            if field == 'progress' and isinstance(value, dict) and isinstance(old_value, dict):
+                changes = {key: counter for key, counter in value.items() if old_value.get(key) != counter}
+                events.append({'type': 'progress', 'changes': changes})
+
+            elif field == 'output' and isinstance(value, str) and isinstance(old_value, str) and value.startswith(old_value):
+                events.append({'type': 'output', 'text': value[len(old_value):]})
+
+            elif field in APPEND_ONLY_FIELDS and isinstance(old_value, list) and len(value) >= len(old_value):
+                events.append({'type': 'append', 'field': field, 'items': value[len(old_value):]})
+
+            elif field in KEYED_LIST_FIELDS and isinstance(old_value, list):
+                key_fn = KEYED_LIST_FIELDS[field]
+                old_entries = {key_fn(entry): entry for entry in old_value}
+                for entry in value:
+                    key = key_fn(entry)
+                    if old_entries.get(key) != entry:
+                        events.append({'type': 'upsert', 'field': field, 'key': key, 'entry': entry})
+
+            else:
+                status_fields[field] = value
+
+        if status_fields:
+            events.insert(0, {'type': 'status', 'fields': status_fields})
+
+        if state.get('status') in FINAL_STATUSES:
+            events.append({'type': 'done', 'status': state.get('status')})
+
+        return events
@@ -0,0 +1,225 @@
+import os
+import json
+import time
+import socket
+import sqlite3
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from backend.util.local_state import get_local_state_dir
+
+logger = logging.getLogger(__name__)
+
+# Task store implementation: 'sqlite' (shared by all the app processes on this host) or 'memory' (this process only)
+TASK_STORE = os.getenv("TASK_STORE", "sqlite").lower()
+# A running task (or run lock) whose owner did not send a heartbeat for this long is considered abandoned
+TASK_HEARTBEAT_TIMEOUT_SECONDS = float(os.getenv("TASK_HEARTBEAT_TIMEOUT_SECONDS", "30"))
+
+def get_process_owner() -> str:
+    """Identifier of this app process, recorded with the tasks and run locks it owns"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class TaskStore(ABC):
+    """
+    Store of the task states (status responses, with progress and per-job statuses) and of the run locks.
+
+    A run lock ensures that only one task of a kind (import, delete, export) runs at a time, across all app
+    processes sharing the store. Locks and running tasks are kept alive by heartbeats from their owner process:
+    when the owner stops (crash, restart), they are considered abandoned after TASK_HEARTBEAT_TIMEOUT_SECONDS.
+    """
+
+    @abstractmethod
+    def save_task(self, task_id: str, task_type: str, status: str, task_state: dict):
+        pass
+
+    @abstractmethod
+    def load_task(self, task_id: str) -> Optional[dict]:
+        """{'task_type', 'status', 'task_state', 'updated_at', 'heartbeat_at'}, None if the task is unknown"""
+        pass
+
+    @abstractmethod
+    def delete_task(self, task_id: str):
+        pass
+
+    @abstractmethod
+    def heartbeat(self, task_ids: list):
+        pass
+
+    @abstractmethod
+    def acquire_run_lock(self, kind: str, task_id: str) -> bool:
+        """Take the run lock of a kind of task for the given task, False if a running task (even the same one) holds it"""
+        pass
+
+    @abstractmethod
+    def release_run_lock(self, kind: str, task_id: str):
+        pass
+
+    @abstractmethod
+    def prune(self, updated_before: float):
+        """Forget the tasks not updated since the given time"""
+        pass
+
+
+class InMemoryTaskStore(TaskStore):
+    """Task store of a single process (the app must run with one worker)"""
+
+    def __init__(self):
+        self._tasks = {}
+        self._run_locks = {}
+        self._lock = threading.Lock()
+
+    def save_task(self, task_id: str, task_type: str, status: str, task_state: dict):
+        now = time.time()
+        with self._lock:
+            self._tasks[task_id] = {'task_type': task_type, 'status': status, 'task_state': task_state,
+                                    'updated_at': now, 'heartbeat_at': now}
+
+    def load_task(self, task_id: str) -> Optional[dict]:
+        with self._lock:
+            stored = self._tasks.get(task_id)
+            return dict(stored) if stored else None
+
+    def delete_task(self, task_id: str):
+        with self._lock:
+            self._tasks.pop(task_id, None)
+
+    def heartbeat(self, task_ids: list):
+        now = time.time()
+        with self._lock:
+            for task_id in task_ids:
+                if task_id in self._tasks:
+                    self._tasks[task_id]['heartbeat_at'] = now
+            for kind, (lock_task_id, _) in list(self._run_locks.items()):
+                if lock_task_id in task_ids:
+                    self._run_locks[kind] = (lock_task_id, now)
+
+    def acquire_run_lock(self, kind: str, task_id: str) -> bool:
+        now = time.time()
+        with self._lock:
+            holder = self._run_locks.get(kind)
+            if holder and now - holder[1] < TASK_HEARTBEAT_TIMEOUT_SECONDS:
+                return False
+            self._run_locks[kind] = (task_id, now)
+            return True
+
+    def release_run_lock(self, kind: str, task_id: str):
+        with self._lock:
+            if self._run_locks.get(kind, (None,))[0] == task_id:
+                del self._run_locks[kind]
+
+    def prune(self, updated_before: float):
+        with self._lock:
+            for task_id in [task_id for task_id, stored in self._tasks.items() if stored['updated_at'] < updated_before]:
+                del self._tasks[task_id]
+
+
+class SQLiteTaskStore(TaskStore):
+    """Task store in a SQLite database (WAL mode) of the local app state, shared by the app processes of the host"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(get_local_state_dir("task_store"), "tasks.sqlite")
+        self.owner = get_process_owner()
+        self._lock = threading.Lock()
+        # Autocommit: transactions are explicit (BEGIN IMMEDIATE) where reads and writes must be atomic
+        self._connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=10)
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS tasks ("
+                "task_id TEXT PRIMARY KEY, task_type TEXT NOT NULL, status TEXT, task_state TEXT NOT NULL, "
+                "owner TEXT NOT NULL, updated_at REAL NOT NULL, heartbeat_at REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS run_locks ("
+                "kind TEXT PRIMARY KEY, task_id TEXT NOT NULL, owner TEXT NOT NULL, heartbeat_at REAL NOT NULL)"
+            )
+
+    def save_task(self, task_id: str, task_type: str, status: str, task_state: dict):
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO tasks (task_id, task_type, status, task_state, owner, updated_at, heartbeat_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (task_id, task_type, status, json.dumps(task_state, default=str), self.owner, now, now)
+            )
+
+    def load_task(self, task_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT task_type, status, task_state, updated_at, heartbeat_at FROM tasks WHERE task_id = ?", (task_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'task_type': row[0], 'status': row[1], 'task_state': json.loads(row[2]), 'updated_at': row[3], 'heartbeat_at': row[4]}
+
+    def delete_task(self, task_id: str):
+        with self._lock:
+            self._connection.execute("DELETE FROM tasks WHERE task_id = ?", (task_id,))
+
+    def heartbeat(self, task_ids: list):
+        if not task_ids:
+            return
+        now = time.time()
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.executemany(
+                    "UPDATE tasks SET heartbeat_at = ? WHERE task_id = ? AND owner = ?", [(now, task_id, self.owner) for task_id in task_ids]
+                )
+                self._connection.executemany(
+                    "UPDATE run_locks SET heartbeat_at = ? WHERE task_id = ? AND owner = ?", [(now, task_id, self.owner) for task_id in task_ids]
+                )
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+
+    def acquire_run_lock(self, kind: str, task_id: str) -> bool:
+        now = time.time()
+        with self._lock:
+            # The write lock of the database is taken before reading, so that two processes cannot both take the run lock
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._connection.execute("SELECT task_id, owner, heartbeat_at FROM run_locks WHERE kind = ?", (kind,)).fetchone()
+                if row and now - row[2] < TASK_HEARTBEAT_TIMEOUT_SECONDS:
+                    self._connection.execute("ROLLBACK")
+                    return False
+                if row:
+                    logger.warning(f"Taking over the {kind} run lock of task {row[0]}, abandoned by {row[1]}")
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO run_locks (kind, task_id, owner, heartbeat_at) VALUES (?, ?, ?, ?)",
+                    (kind, task_id, self.owner, now)
+                )
+                self._connection.execute("COMMIT")
+                return True
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+
+    def release_run_lock(self, kind: str, task_id: str):
+        with self._lock:
+            self._connection.execute("DELETE FROM run_locks WHERE kind = ? AND task_id = ?", (kind, task_id))
+
+    def prune(self, updated_before: float):
+        with self._lock:
+            self._connection.execute("DELETE FROM tasks WHERE updated_at < ?", (updated_before,))
+
+
+_task_store: Optional[TaskStore] = None
+_task_store_lock = threading.Lock()
+
+def get_task_store() -> TaskStore:
+    global _task_store
+    with _task_store_lock:
+        if _task_store is None:
+            if TASK_STORE == 'memory':
+                _task_store = InMemoryTaskStore()
+            elif TASK_STORE == 'sqlite':
+                _task_store = SQLiteTaskStore()
+            else:
+                raise ValueError(f"Unknown TASK_STORE '{TASK_STORE}' (expected 'sqlite' or 'memory')")
+        return _task_store
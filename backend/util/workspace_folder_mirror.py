@@ -0,0 +1,127 @@
+import json
+import os
+import logging
+import threading
+from databricks.sdk import WorkspaceClient
+
+from backend.util.local_state import get_local_state_dir, get_state_key
+
+logger = logging.getLogger(__name__)
+
+# The manifest is stored next to the directory of the mirrored files, so that no workspace file name can overwrite it
+MANIFEST_FILE_NAME = "manifest.json"
+FILES_DIR_NAME = "files"
+
+
+def _get_temp_path(path: str) -> str:
+    """Temporary file name for an atomic write of path, unique to the process and thread (app workers share the mirror)"""
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+class WorkspaceFolderMirror:
+    """
+    Persistent local mirror of the job definitions Git folder.
+
+    Files are keyed by name and (modified_at, size) from the workspace folder listing: an entry is
+    only downloaded when it is missing locally or its modified_at / size changed since it was mirrored,
+    otherwise it is served from local disk. Mirrored files are stored in the files/ directory, the
+    manifest of their (modified_at, size) beside it.
+    """
+
+    def __init__(self, client: WorkspaceClient, workspace_folder: str):
+        self.client = client
+        self.workspace_folder = workspace_folder
+        self.local_dir = get_local_state_dir("workspace_mirror", get_state_key(client.config.host, workspace_folder))
+        self.files_dir = get_local_state_dir("workspace_mirror", get_state_key(client.config.host, workspace_folder), FILES_DIR_NAME)
+        self.manifest_path = os.path.join(self.local_dir, MANIFEST_FILE_NAME)
+        self._lock = threading.Lock()
+        self._manifest = self._load_manifest()
+
+    def _load_manifest(self) -> dict:
+        try:
+            with open(self.manifest_path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable mirror manifest {self.manifest_path}: {str(e)}")
+            return {}
+
+    def _local_path(self, file_name: str) -> str:
+        return os.path.join(self.files_dir, file_name)
+
+    def _write_local(self, file_name: str, content: bytes):
+        local_path = self._local_path(file_name)
+        tmp_path = _get_temp_path(local_path)
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, local_path)
+
+    def is_current(self, entry) -> bool:
+        file_name = os.path.basename(entry.path)
+        with self._lock:
+            mirrored = self._manifest.get(file_name)
+        return (mirrored is not None
+                and entry.modified_at is not None
+                and mirrored.get('modified_at') == entry.modified_at
+                and mirrored.get('size') == entry.size
+                and os.path.exists(self._local_path(file_name)))
+
+    def read(self, entry) -> tuple[bytes, bool]:
+        """
+        Return the content of a listed workspace file entry.
+        Returns: (content, downloaded) - downloaded is False when served from the local mirror
+        """
+        file_name = os.path.basename(entry.path)
+
+        if self.is_current(entry):
+            try:
+                with open(self._local_path(file_name), 'rb') as f:
+                    return f.read(), False
+            except OSError as e:
+                logger.warning(f"Failed to read mirrored file {file_name}, downloading it again: {str(e)}")
+
+        with self.client.workspace.download(entry.path) as file:
+            content = file.read()
+
+        self.store(file_name, content, entry.modified_at, entry.size)
+        return content, True
+
+    def store(self, file_name: str, content: bytes, modified_at, size):
+        """Record content known to match the workspace file (e.g. right after uploading it)"""
+        self._write_local(file_name, content)
+        with self._lock:
+            self._manifest[file_name] = {'modified_at': modified_at, 'size': size}
+
+    def prune(self, listed_file_names):
+        """Remove mirrored files that are no longer present in the workspace folder"""
+        listed_file_names = set(listed_file_names)
+        with self._lock:
+            removed = [file_name for file_name in self._manifest if file_name not in listed_file_names]
+            for file_name in removed:
+                del self._manifest[file_name]
+        for file_name in removed:
+            try:
+                os.remove(self._local_path(file_name))
+            except FileNotFoundError:
+                pass
+
+    def save(self):
+        """Persist the manifest (call once at the end of a run)"""
+        tmp_path = _get_temp_path(self.manifest_path)
+        with self._lock:
+            with open(tmp_path, 'w') as f:
+                json.dump(self._manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+
+
+_mirrors = {}
+_mirrors_lock = threading.Lock()
+
+def get_workspace_folder_mirror(client: WorkspaceClient, workspace_folder: str) -> WorkspaceFolderMirror:
+    """Process-wide mirror instance per workspace folder, shared by export and validation tasks"""
+    key = (client.config.host, workspace_folder)
+    with _mirrors_lock:
+        if key not in _mirrors:
+            _mirrors[key] = WorkspaceFolderMirror(client, workspace_folder)
+        return _mirrors[key]
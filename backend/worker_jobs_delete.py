@@ -1,13 +1,18 @@
 import os
+import threading
 from concurrent.futures import ThreadPoolExecutor
 from databricks.sdk import WorkspaceClient
 from backend.util.job_logger import setup_job_logger, log_exception
+from backend.util.adaptive_concurrency import get_worker_pool_size
+from backend.util.api_call_controls import get_api_call_stats
+from backend.util.job_snapshot import JobSnapshot, JOB_DELETED
+from backend.util.artifact_store import ArtifactSet
 
 class JobDeleteTaskComponent:
-    def __init__(self, delete_task_id: str, client: WorkspaceClient, temp_dir: str, job_statuses: list):
+    def __init__(self, delete_task_id: str, client: WorkspaceClient, artifact_set: ArtifactSet, job_statuses: list):
         self.delete_task_id = delete_task_id
         self.client = client
-        self.temp_dir = temp_dir
+        self.artifact_set = artifact_set
         self.job_statuses = job_statuses
         
         self.logger, self.log_handler = setup_job_logger(f"{delete_task_id}")
@@ -16,12 +21,17 @@ class JobDeleteTaskComponent:
         self.output = 'Delete initialized'
         self.progress = {
             "deleted": 0,
-            "failed_jobs": 0
+            "failed_jobs": 0,
+            "stale_jobs": 0
         }
         
-        self.num_threads = int(os.getenv("NUM_THREADS", "4"))
+        # Progress counters updated by the worker threads
+        self.progress_lock = threading.Lock()
         
-        self.existing_jobs = {job.settings.name: job for job in self.client.jobs.list()}
+        self.num_threads = get_worker_pool_size()
+        
+        # Live jobs seen by validation (loaded by the task, the start request does not wait for it)
+        self.snapshot = None
         
         # Only initialize status for jobs marked for deletion
         self.job_delete_statuses = {
@@ -40,6 +50,11 @@ class JobDeleteTaskComponent:
         self.output = 'Starting deletion...'
         
         try:
+            self.snapshot = JobSnapshot.load(self.artifact_set)
+            if self.snapshot is None:
+                self.logger.warning("Validation results without job snapshot, listing jobs (jobs are not checked for concurrent changes)")
+                self.snapshot = JobSnapshot.from_listing(self.client)
+
             # Filter jobs to process - only delete jobs that are marked for deletion
             jobs_to_process = [
                 job_status for job_status in self.job_statuses 
@@ -58,6 +73,7 @@ class JobDeleteTaskComponent:
                 
                 for future in future_to_job:
                     job = future_to_job[future]
+                    self.progress.update(get_api_call_stats())
                     try:
                         success = future.result()
                         if success:
@@ -72,6 +88,8 @@ class JobDeleteTaskComponent:
             if self.progress['failed_jobs'] > 0:
                 self.status = 'completed_with_errors'
                 self.output = f"Deletion completed with {self.progress['failed_jobs']} failures"
+                if self.progress['stale_jobs'] > 0:
+                    self.output += f" ({self.progress['stale_jobs']} jobs changed in the workspace since validation)"
             else:
                 self.status = 'completed'
                 self.output = 'Deletion completed successfully'
@@ -94,17 +112,30 @@ class JobDeleteTaskComponent:
             # Set status to in_progress when we actually start deleting
             self._update_job_status(job_name, "in_progress")
             
-            if job_name in self.existing_jobs:
-                existing_job = self.existing_jobs[job_name]
-                self.client.jobs.delete(job_id=existing_job.job_id)
-                self.logger.info(f"Deleted job: {job_name}")
-                self._update_job_status(job_name, "completed")
-                return True
-            else:
+            if job_name not in self.snapshot:
                 error_msg = f"Job {job_name} not found in workspace"
                 self.logger.warning(error_msg)
                 self._update_job_status(job_name, "error", error_msg)
                 return False
+
+            # Optimistic concurrency: the job must not have changed since validation
+            change = self.snapshot.check_job(self.client, job_name)
+            if change == JOB_DELETED:
+                self.logger.info(f"Job already deleted: {job_name}")
+                self._update_job_status(job_name, "completed")
+                return True
+            if change is not None:
+                error_msg = f"Job was {change} in the workspace since validation, please validate again"
+                self.logger.warning(f"Skipping job {job_name}: {error_msg}")
+                with self.progress_lock:
+                    self.progress['stale_jobs'] += 1
+                self._update_job_status(job_name, "stale", error_msg)
+                return False
+
+            self.client.jobs.delete(job_id=self.snapshot.get_job_id(job_name))
+            self.logger.info(f"Deleted job: {job_name}")
+            self._update_job_status(job_name, "completed")
+            return True
             
         except Exception as e:
             error_msg = f"Failed to delete job: {str(e)}"
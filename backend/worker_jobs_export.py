@@ -1,45 +1,32 @@
 import json, os, sys
 from databricks.sdk import WorkspaceClient
+from databricks.sdk.service.jobs import Job
 from databricks.sdk.service.workspace import ImportFormat
 import logging
 from threading import Thread
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from backend.task_manager import TaskManager
 from backend.util.compare_job_configurations import compare_job_configurations
+from backend.util.canonical_job_json import dumps_canonical
+from backend.util.adaptive_concurrency import get_worker_pool_size
+from backend.util.api_call_controls import get_api_call_stats
+from backend.util.dbr_workspace_utils import ResourceNameResolver, list_jobs_expanded, complete_job_definitions
+from backend.util.job_selector import JobSelector
+from backend.util.export_fingerprints import ExportFingerprintStore, compute_job_fingerprint
+from backend.util.workspace_folder_mirror import WorkspaceFolderMirror, get_workspace_folder_mirror
+from backend.util.run_journal import RunJournal
 
 logger = logging.getLogger(__name__)
 
 task_manager = TaskManager()
 
-def get_cluster_name_by_id(w, cluster_id):
-    try:
-        cluster = w.clusters.get(cluster_id=cluster_id)
-        return cluster.cluster_name
-    except:
-        return None
-    
-def get_warehouse_name_by_id(w, warehouse_id):
-    try:
-        warehouse = w.warehouses.get(id=warehouse_id)
-        return warehouse.name
-    except:
-        return None
-
-def get_job_name_by_id(w, job_id):
-    try:
-        job = w.jobs.get(job_id=job_id)
-        return job.settings.name
-    except:
-        return None
-
-
-def replace_ids_with_names(job_dict, w):
+def replace_ids_with_names(job_dict, resolver: ResourceNameResolver):
     if 'tasks' in job_dict['settings']:
         for task in job_dict['settings']['tasks']:
 
             # Replace cluster IDs
             if 'existing_cluster_id' in task:
-                cluster_name = get_cluster_name_by_id(w, task['existing_cluster_id'])
+                cluster_name = resolver.get_cluster_name(task['existing_cluster_id'])
                 if cluster_name:
                     task['existing_cluster_id'] = f"__CLUSTER__{cluster_name}__"
                 else:
@@ -47,7 +34,7 @@ def replace_ids_with_names(job_dict, w):
 
             # Replace warehouse IDs in sql_task
             if 'sql_task' in task and 'warehouse_id' in task['sql_task']:
-                warehouse_name = get_warehouse_name_by_id(w, task['sql_task']['warehouse_id'])
+                warehouse_name = resolver.get_warehouse_name(task['sql_task']['warehouse_id'])
                 if warehouse_name:
                     task['sql_task']['warehouse_id'] = f"__WAREHOUSE__{warehouse_name}__"
                 else:
@@ -55,7 +42,7 @@ def replace_ids_with_names(job_dict, w):
 
             # Replace job IDs in run_job_task
             if 'run_job_task' in task and 'job_id' in task['run_job_task']:
-                job_name = get_job_name_by_id(w, task['run_job_task']['job_id'])
+                job_name = resolver.get_job_name(task['run_job_task']['job_id'])
                 if job_name:
                     task['run_job_task']['job_id'] = f"__JOB__{job_name}__"
                 else:
@@ -66,18 +53,17 @@ def replace_ids_with_names(job_dict, w):
 def sanitize_job_name(name):
     return name
 
-def export_job_configuration(client, job):
+def export_job_configuration(client, job: Job, resolver: ResourceNameResolver):
     """
-    Export a single job configuration.
+    Export a single job configuration from its full definition (see list_jobs_full).
     Returns: (success, job_dict, message)
     """
     try:
         logger.info(f"Exporting job configuration for '{job.settings.name}'")
-        job_object = client.jobs.get(job_id=job.job_id)
-        job_dict = job_object.as_dict()
+        job_dict = job.as_dict()
         
         # Replace IDs with names
-        job_dict = replace_ids_with_names(job_dict, client)
+        job_dict = replace_ids_with_names(job_dict, resolver)
         
         return True, job_dict, f"Exported job configuration for '{job.settings.name}'"
     
@@ -86,28 +72,47 @@ def export_job_configuration(client, job):
         return False, None, f"Failed to export job configuration for '{job.settings.name}': {str(e)}"
 
 
-def upload_job_configuration(client, job_name, job_dict, workspace_folder):
+def upload_job_configuration(client, job_name, job_dict, workspace_folder,
+                             mirror: WorkspaceFolderMirror = None, file_entry=None):
     """
     Upload a job configuration to the Databricks workspace.
-    Returns: (success, message, was_modified)
+    When a folder mirror is given, the existing file is read through it (file_entry is the listing entry,
+    None if the file does not exist yet) and the mirror is refreshed after upload.
+    Returns: (success, message, was_modified, file_modified_at)
     """
     try:
-        workspace_path = f'{workspace_folder}/{job_name}.json'
-        new_content = json.dumps(job_dict, indent=2)
+        file_name = f'{job_name}.json'
+        workspace_path = f'{workspace_folder}/{file_name}'
+        new_content = dumps_canonical(job_dict)
         
         # Check if file exists and compare contents
         try:
+            if mirror is not None and file_entry is None:
+                raise FileNotFoundError(f"{workspace_path} is not present in the folder listing")
+
             logger.info(f"Downloading existing configuration for job '{job_name}'")
-            with client.workspace.download(workspace_path) as file:
-                existing_content = file.read().decode('utf-8')
+            if mirror is not None:
+                existing_content, downloaded = mirror.read(file_entry)
+                existing_content = existing_content.decode('utf-8')
+                if not downloaded:
+                    logger.info(f"Using locally mirrored configuration for job '{job_name}'")
+            else:
+                with client.workspace.download(workspace_path) as file:
+                    existing_content = file.read().decode('utf-8')
             logger.info(f"Successfully downloaded existing configuration for job '{job_name}'")
 
+            # Files written by this app are canonical: byte equality means unchanged
+            if existing_content == new_content:
+                logger.info(f"No changes detected for job '{job_name}'")
+                return True, f"Job '{job_name}' is unchanged", False, file_entry.modified_at if file_entry else None
+
+            # Files in another format (older exports, hand edits) are compared semantically
             existing_job_dict = json.loads(existing_content)
             
             is_different, difference_details = compare_job_configurations(existing_job_dict, job_dict)
             if not is_different:
                 logger.info(f"No changes detected for job '{job_name}'")
-                return True, f"Job '{job_name}' is unchanged", False
+                return True, f"Job '{job_name}' is unchanged", False, file_entry.modified_at if file_entry else None
             
             # Log the differences
             logger.info(f"Changes detected for job '{job_name}':\n{difference_details}")
@@ -125,56 +130,104 @@ def upload_job_configuration(client, job_name, job_dict, workspace_folder):
             overwrite=True,
             format=ImportFormat.RAW
         )
+
+        file_modified_at = None
+        try:
+            uploaded_file = client.workspace.get_status(workspace_path)
+            file_modified_at = uploaded_file.modified_at
+            if mirror is not None:
+                mirror.store(file_name, new_content.encode('utf-8'), uploaded_file.modified_at, uploaded_file.size)
+        except Exception as e:
+            logger.warning(f"Could not refresh local state for uploaded job '{job_name}': {str(e)}")
         
-        return True, f"Uploaded modified job '{job_name}' to {workspace_path}", True
+        return True, f"Uploaded modified job '{job_name}' to {workspace_path}", True, file_modified_at
     
     except Exception as e:
         logger.error(f"Failed to upload job '{job_name}': {str(e)}", exc_info=True)
-        return False, f"Failed to upload job '{job_name}': {str(e)}", False
+        return False, f"Failed to upload job '{job_name}': {str(e)}", False, None
 
-def export_single_job(client, job, workspace_folder):
-    """
-    Export a single job to the Databricks workspace.
-    Returns: (export_success, upload_success, export_message, upload_message)
-    """
-    job_name = sanitize_job_name(job.settings.name)
-    
-    # Export the job configuration
-    export_success, job_dict, export_message = export_job_configuration(client, job)
-    
-    # If export was successful, proceed to upload
-    if export_success:
-        upload_success, upload_message, was_modified = upload_job_configuration(client, job_name, job_dict, workspace_folder)
-    else:
-        upload_success, upload_message, was_modified = False, "Upload skipped due to export failure.", False
-    
-    return export_success, upload_success, export_message, upload_message
+def list_job_definition_files(client, workspace_folder) -> dict:
+    """List job definition json files in the workspace folder, keyed by file name"""
+    return {entry.path.split('/')[-1]: entry
+            for entry in client.workspace.list(workspace_folder)
+            if entry.path.endswith('.json')}
+
+
+def is_orphan_file_selected(selector: JobSelector, mirror: WorkspaceFolderMirror, file_entry) -> bool:
+    """Check whether an orphaned job definition file belongs to the jobs selected for this export"""
+    if not selector.matches_file_name(file_entry.path.split('/')[-1]):
+        return False
+    if not selector.has_metadata_filters:
+        return True
+    try:
+        content, _ = mirror.read(file_entry)
+        # Its job no longer exists: the file is checked on its own content
+        return selector.matches_job_file(json.loads(content))
+    except Exception as e:
+        logger.warning(f"Could not read {file_entry.path} to check it against the job selector, keeping it: {str(e)}")
+        return False
 
 
-def export_task(export_task_id: str, client: WorkspaceClient):
+def export_task(export_task_id: str, client: WorkspaceClient, incremental: bool = True, selector: JobSelector = None,
+                journal: RunJournal = None):
+    export_task = task_manager.get_task(export_task_id)
     try:
+        # Journal of the exported jobs; when resuming, it holds the state of the previous runs
+        journal = journal or RunJournal.create(export_task_id, 'export', {'incremental': incremental})
+
         workspace_folder = os.getenv("WORKSPACE_GIT_FOLDER_PATH")
 
-        export_task = task_manager.get_task(export_task_id)
+        # List existing job definition files once: used for incremental skips and orphan cleanup
+        try:
+            existing_files = list_job_definition_files(client, workspace_folder)
+        except Exception as e:
+            logger.warning(f"Task {export_task_id}: could not list {workspace_folder}, exporting all jobs: {str(e)}")
+            existing_files = None
+
+        fingerprints = ExportFingerprintStore(client.config.host, workspace_folder)
+        mirror = get_workspace_folder_mirror(client, workspace_folder) if existing_files is not None else None
 
-        # Get list of all current jobs and their names
-        jobs_list = list(client.jobs.list())
-        current_job_files = {f"{sanitize_job_name(job.settings.name)}.json" for job in jobs_list}
+        selector = selector or JobSelector()
+        export_task['output'] += f"Exporting {selector.describe()}\n"
+
+        # List all current jobs with expanded tasks, and keep only the selected ones
+        all_listed_jobs = list_jobs_expanded(client)
+        current_job_files = {f"{sanitize_job_name(job.settings.name)}.json" for job in all_listed_jobs}
+        selected_jobs = [job for job in all_listed_jobs if selector.matches_job(job.as_dict(), allow_unknown_run_as=True)]
+
+        # Get full definitions of the selected jobs (jobs.get only for truncated listings)
+        jobs_list, failed_jobs_list, fetch_stats = complete_job_definitions(client, selected_jobs, get_worker_pool_size())
+        if selector.run_as:
+            jobs_list = [job for job in jobs_list if selector.matches_job(job.as_dict())]
         
-        total_jobs = len(jobs_list)
+        total_jobs = len(jobs_list) + len(failed_jobs_list)
         task_manager.update_task(export_task_id, progress={
             'total_jobs': total_jobs,
-            'processed_jobs': 0,
+            'processed_jobs': len(failed_jobs_list),
             'exported_modified': 0,
             'exported_unchanged': 0,
-            'failed_jobs': 0,
-            'deleted_files': 0
+            'failed_jobs': len(failed_jobs_list),
+            'deleted_files': 0,
+            'api_calls_saved': fetch_stats['api_calls_saved'],
+            'skipped_by_fingerprint': 0,
+            'files_from_mirror': 0,
+            'resolver_cache_hits': 0,
+            'resolver_cache_misses': 0,
+            'resumed_completed': 0
         })
-        export_task['output'] += f"Found {total_jobs} jobs to export\n"
+        export_task['output'] += f"Found {total_jobs} jobs to export ({fetch_stats['api_calls_saved']} jobs.get calls saved by expanded listing)\n"
+        for job in failed_jobs_list:
+            export_task['output'] += f"Failed to get job definition for '{job.settings.name}'\n"
         logger.info(f"Found {total_jobs} jobs to export for task {export_task_id}")
+        if journal.is_resumed:
+            export_task['output'] += (f"Resuming export: {len(journal.completed)} jobs already exported, "
+                                      f"{len(journal.in_flight)} in flight to check again\n")
+
+        # List clusters, warehouses and jobs once to resolve IDs to names for all jobs
+        resolver = ResourceNameResolver(client, all_listed_jobs)
 
         def process_job(job, idx):
-            export_success, job_dict, export_message = export_job_configuration(client, job)
+            export_success, job_dict, export_message = export_job_configuration(client, job, resolver)
             upload_success, upload_message, was_modified = False, "Upload skipped due to export failure.", False
 
             # Log export step
@@ -183,9 +236,36 @@ def export_task(export_task_id: str, client: WorkspaceClient):
             logger.info(f"Task {export_task_id}: {export_status_message.strip()}")
 
             if export_success:
-                upload_success, upload_message, was_modified = upload_job_configuration(
-                    client, sanitize_job_name(job.settings.name), job_dict, workspace_folder
-                )
+                job_file_name = f"{sanitize_job_name(job.settings.name)}.json"
+                file_entry = existing_files.get(job_file_name) if existing_files else None
+                fingerprint = compute_job_fingerprint(job_dict)
+
+                completed = journal.completed.get(str(job.job_id))
+                if completed and completed.get('fingerprint') == fingerprint:
+                    # Exported by a previous run of this task, and not changed since
+                    upload_success, upload_message, was_modified = True, f"Job '{job.settings.name}' was already exported before resuming", completed.get('modified', False)
+                    file_modified_at = completed.get('file_modified_at')
+                    export_task['progress']['resumed_completed'] += 1
+                elif incremental and file_entry and fingerprints.is_unchanged(job.job_id, fingerprint, file_entry.modified_at):
+                    upload_success, upload_message, was_modified = True, f"Job '{job.settings.name}' is unchanged since last export (fingerprint match)", False
+                    file_modified_at = file_entry.modified_at
+                    export_task['progress']['skipped_by_fingerprint'] += 1
+                    journal.record_completed(job.job_id, fingerprint=fingerprint, file_modified_at=file_modified_at, modified=False)
+                else:
+                    if file_entry and mirror is not None and mirror.is_current(file_entry):
+                        export_task['progress']['files_from_mirror'] += 1
+                    journal.record_started(job.job_id)
+                    upload_success, upload_message, was_modified, file_modified_at = upload_job_configuration(
+                        client, sanitize_job_name(job.settings.name), job_dict, workspace_folder,
+                        mirror=mirror, file_entry=file_entry
+                    )
+                    if upload_success:
+                        journal.record_completed(job.job_id, fingerprint=fingerprint, file_modified_at=file_modified_at, modified=was_modified)
+                    else:
+                        journal.record_failed(job.job_id, upload_message)
+
+                if upload_success and file_modified_at is not None:
+                    fingerprints.record(job.job_id, fingerprint, file_modified_at)
 
                 # Log upload step
                 upload_status_message = f"[{idx}/{total_jobs}] {upload_message}\n"
@@ -202,8 +282,10 @@ def export_task(export_task_id: str, client: WorkspaceClient):
                     progress['exported_unchanged'] += 1
             else:
                 progress['failed_jobs'] += 1
+            progress.update(resolver.get_stats())
+            progress.update(get_api_call_stats())
 
-        with ThreadPoolExecutor(max_workers=int(os.getenv("NUM_THREADS"))) as executor:
+        with ThreadPoolExecutor(max_workers=get_worker_pool_size()) as executor:
             futures = {executor.submit(process_job, job, idx): idx 
                         for idx, job in enumerate(jobs_list, 1)}
             for future in as_completed(futures):
@@ -212,13 +294,26 @@ def export_task(export_task_id: str, client: WorkspaceClient):
                 except Exception as e:
                     logger.error(f"Error processing job: {str(e)}", exc_info=True)
 
+        try:
+            # Keep fingerprints of jobs that were not part of this (selective) export
+            exported_job_ids = {job.job_id for job in jobs_list + failed_jobs_list}
+            fingerprints.retain(job.job_id for job in all_listed_jobs if job.job_id not in exported_job_ids)
+            fingerprints.save()
+            if mirror is not None:
+                mirror.prune(existing_files.keys() | current_job_files)
+                mirror.save()
+        except Exception as e:
+            logger.warning(f"Task {export_task_id}: failed to persist export fingerprints or folder mirror: {str(e)}")
+
         # Delete orphaned JSON files for jobs that no longer exist in the workspace
         try:
-            existing_files = [entry.path.split('/')[-1] 
-                            for entry in client.workspace.list(workspace_folder)
-                            if entry.path.endswith('.json')]
+            if existing_files is None:
+                existing_files = list_job_definition_files(client, workspace_folder)
             
             files_to_delete = set(existing_files) - current_job_files
+            if not selector.is_empty:
+                files_to_delete = {file_name for file_name in files_to_delete
+                                   if is_orphan_file_selected(selector, mirror or get_workspace_folder_mirror(client, workspace_folder), existing_files[file_name])}
             
             for file_name in files_to_delete:
                 file_path = f"{workspace_folder}/{file_name}"
@@ -241,9 +336,15 @@ def export_task(export_task_id: str, client: WorkspaceClient):
         task_manager.update_task(export_task_id, task_type='export', status='completed')
         export_task['output'] += "Export completed successfully\n"
         logger.info(f"Task {export_task_id} completed successfully")
+        journal.record_finished('completed')
 
     except Exception as e:
         error_msg = f"Error: {str(e)}\n"
         task_manager.update_task(export_task_id, task_type='export', status='failed')
         export_task['output'] += error_msg
-        logger.error(f"Task {export_task_id} failed with error: {str(e)}", exc_info=True)
\ No newline at end of file
+        logger.error(f"Task {export_task_id} failed with error: {str(e)}", exc_info=True)
+        if journal is not None:
+            journal.record_finished('failed')
+    finally:
+        if journal is not None:
+            journal.close()
\ No newline at end of file
@@ -1,17 +1,37 @@
 import json, json5  
 import os, sys
+import time
+import threading
 from concurrent.futures import ThreadPoolExecutor
 from databricks.sdk import WorkspaceClient
 from databricks.sdk.service.jobs import JobSettings, Task, NotebookTask
 from backend.util.job_logger import setup_job_logger, log_exception
+from backend.util.adaptive_concurrency import get_worker_pool_size
+from backend.util.api_call_controls import get_api_call_stats
+from backend.util.import_planner import ImportPlan, OPERATION_CREATE, OPERATION_DELETE, OPERATION_NOOP, OPERATION_RESET, get_job_reference_name
+from backend.util.run_journal import RunJournal
+from backend.util.job_settings_delta import compute_job_settings_delta, get_payload_size
+from backend.util.job_snapshot import JobSnapshot, JOB_CREATED, JOB_DELETED, JOB_MODIFIED, find_live_job_id
+from backend.util.artifact_store import ArtifactSet, VALIDATED_JOBS, EXISTING_JOBS
 import random  
 
 class JobImportTaskComponent:
-    def __init__(self, import_task_id: str, client: WorkspaceClient, temp_dir: str, job_statuses: list):
+    def __init__(self, import_task_id: str, client: WorkspaceClient, artifact_set: ArtifactSet, job_statuses: list, include_deletes: bool = False,
+                 partial_updates: bool = False, journal: RunJournal = None):
         self.import_task_id = import_task_id
         self.client = client
-        self.temp_dir = temp_dir
+        self.artifact_set = artifact_set
         self.job_statuses = job_statuses
+        self.include_deletes = include_deletes
+        # Update changed jobs with only their changed settings (jobs.update) instead of full resets
+        self.partial_updates = partial_updates
+        # Journal of the completed operations; when resuming, it holds the state of the previous runs
+        self.journal = journal or RunJournal.create(import_task_id, 'import', {
+            'artifact_set_id': artifact_set.artifact_set_id,
+            'job_statuses': job_statuses,
+            'include_deletes': include_deletes,
+            'partial_updates': partial_updates
+        })
         
         self.logger, self.log_handler = setup_job_logger(f"{import_task_id}")
         
@@ -21,20 +41,38 @@ class JobImportTaskComponent:
             "imported": 0,
             "skipped_unchanged": 0,
             "deleted": 0,
-            "failed_jobs": 0
+            "failed_jobs": 0,
+            "waves": 0,
+            "current_wave": 0,
+            "resumed_completed": 0,
+            "stale_jobs": 0,
+            "partial_updates": 0,
+            "full_resets": 0,
+            "payload_bytes": 0,
+            "payload_bytes_saved": 0
         }
         self.log_records = []
+        # Progress counters updated by the worker threads
+        self.progress_lock = threading.Lock()
         
-        self.num_threads = int(os.getenv("NUM_THREADS", "4"))
+        self.num_threads = get_worker_pool_size()
         
-        self.existing_jobs = {job.settings.name: job for job in self.client.jobs.list()}
+        # Live jobs seen by validation (loaded by the task, the start request does not wait for it)
+        self.snapshot = None
+        # IDs of the jobs created by this import, used to resolve references of jobs in later waves
+        self.created_job_ids = {}
         
         self.job_import_statuses = {
             job_status["job_name"]: {
                 "job_name": job_status["job_name"],
                 "task_request": job_status,
                 "import_status": "pending",
-                "error_message": None
+                "error_message": None,
+                "operation": None,
+                "wave": None,
+                "update_method": None,
+                "payload_bytes": None,
+                "latency_ms": None
             }
             for job_status in job_statuses
         }
@@ -45,42 +83,86 @@ class JobImportTaskComponent:
         self.log_records = self.log_handler.get_logs()
         
         try:
-            # Filter jobs to process
-            jobs_to_process = []
-            for job_status in self.job_statuses:
-                if job_status['status'] in ['unchanged', 'error', 'deleted']:
+            self.snapshot = JobSnapshot.load(self.artifact_set)
+            if self.snapshot is None:
+                self.logger.warning("Validation results without job snapshot, listing jobs (jobs are not checked for concurrent changes)")
+                self.snapshot = JobSnapshot.from_listing(self.client)
+
+            # Plan the operations in waves of independent jobs
+            plan = ImportPlan(self.job_statuses, self.snapshot.job_names(), self.include_deletes)
+            self.progress['waves'] = len(plan.waves)
+            self.logger.info(f"Import plan: {plan.describe()}")
+            if self.journal.is_resumed:
+                self.logger.info(f"Resuming import: {len(self.journal.completed)} jobs already done, "
+                                 f"{len(self.journal.in_flight)} in flight to check again")
+                for job_name, completed in self.journal.completed.items():
+                    if completed.get('operation') == OPERATION_CREATE and completed.get('job_id'):
+                        self.created_job_ids[job_name] = completed['job_id']
+
+            for job_name, operation in plan.operations.items():
+                if job_name in self.job_import_statuses:
+                    self.job_import_statuses[job_name]["operation"] = operation['operation']
+                if operation['operation'] == OPERATION_NOOP:
                     self.progress['skipped_unchanged'] += 1
-                    self._update_job_status(job_status['job_name'], "skipped")
-                    continue
-                if job_status['status'] in ['new', 'changed']:
-                    jobs_to_process.append(job_status)
+                    self._update_job_status(job_name, "skipped")
 
-            # Sort jobs by name before processing
-            jobs_to_process.sort(key=lambda x: x['job_name'])
+            for job_name, reason in plan.unplannable.items():
+                self.progress['failed_jobs'] += 1
+                self.logger.error(f"Cannot import job {job_name}: {reason}")
+                self._update_job_status(job_name, "error", reason)
 
-            # Process jobs in parallel
             with ThreadPoolExecutor(max_workers=self.num_threads) as executor:
-                future_to_job = {
-                    executor.submit(self.import_single_job, job, mode='update'): job 
-                    for job in jobs_to_process
-                }
-                
-                for future in future_to_job:
-                    job = future_to_job[future]
-                    try:
-                        success = future.result()
-                        if success:
-                            self.progress['imported'] += 1
-                        else:
+                for wave_number, wave in enumerate(plan.waves, start=1):
+                    self.progress['current_wave'] = wave_number
+                    self.logger.info(f"Processing wave {wave_number} of {len(plan.waves)} ({len(wave)} jobs)")
+
+                    # Process the jobs of a wave in parallel
+                    future_to_operation = {}
+                    for job_name in wave:
+                        operation = plan.get_operation(job_name)
+                        self.job_import_statuses[job_name]["wave"] = wave_number
+                        if job_name in self.journal.completed:
+                            self.progress['resumed_completed'] += 1
+                            if self.journal.completed[job_name].get('operation') == OPERATION_DELETE:
+                                self.progress['deleted'] += 1
+                            else:
+                                self.progress['imported'] += 1
+                            self._update_job_status(job_name, "completed")
+                            continue
+                        if job_name in self.journal.in_flight:
+                            # A job whose creation was in flight and that exists now is planned as reset,
+                            # which applies the validated settings again instead of creating a duplicate
+                            self.logger.info(f"Checking job {job_name} again: its {self.journal.in_flight[job_name].get('operation')} was in flight when the previous run stopped")
+                        not_created = [name for name in operation['depends_on'] if name not in self.created_job_ids]
+                        if not_created:
+                            error_msg = f"Referenced job(s) not created: {', '.join(not_created)}"
+                            self.progress['failed_jobs'] += 1
+                            self.logger.error(f"Skipping job {job_name}: {error_msg}")
+                            self._update_job_status(job_name, "error", error_msg)
+                            continue
+                        future_to_operation[executor.submit(self.import_single_job, operation)] = operation
+                    
+                    for future in future_to_operation:
+                        operation = future_to_operation[future]
+                        self.progress.update(get_api_call_stats())
+                        try:
+                            success = future.result()
+                            if not success:
+                                self.progress['failed_jobs'] += 1
+                            elif operation['operation'] == OPERATION_DELETE:
+                                self.progress['deleted'] += 1
+                            else:
+                                self.progress['imported'] += 1
+                        except Exception as e:
                             self.progress['failed_jobs'] += 1
-                    except Exception as e:
-                        self.progress['failed_jobs'] += 1
-                        log_exception(self.logger, f"Error importing job {job['job_name']}", e)
+                            log_exception(self.logger, f"Error importing job {operation['job_name']}", e)
 
             # Set final status
             if self.progress['failed_jobs'] > 0:
                 self.status = 'completed_with_errors'
                 self.output = f"Import completed with {self.progress['failed_jobs']} failures"
+                if self.progress['stale_jobs'] > 0:
+                    self.output += f" ({self.progress['stale_jobs']} jobs changed in the workspace since validation)"
             else:
                 self.status = 'completed'
                 self.output = 'Import completed successfully'
@@ -89,6 +171,9 @@ class JobImportTaskComponent:
             self.status = 'failed'
             self.output = f'Import failed: {str(e)}'
             log_exception(self.logger, "Import task failed", e)
+        finally:
+            self.journal.record_finished(self.status)
+            self.journal.close()
 
     def _update_job_status(self, job_name: str, status: str, error_message: str = None):
         if job_name in self.job_import_statuses:
@@ -96,46 +181,162 @@ class JobImportTaskComponent:
             if error_message:
                 self.job_import_statuses[job_name]["error_message"] = error_message
 
-    def import_single_job(self, job_status: dict, mode: str = 'update') -> bool:
-        job_name = job_status['job_name']
-        validated_job_path = os.path.join(self.temp_dir, "validated_jobs", f"{job_name}.json")
+    def inject_job_references(self, job_dict: dict):
+        """Replace job reference placeholders left by validation with the IDs of jobs created by this import"""
+        for task in job_dict.get('settings', {}).get('tasks', []):
+            if "run_job_task" in task and "job_id" in task["run_job_task"]:
+                referenced_job_name = get_job_reference_name(task["run_job_task"]["job_id"])
+                if referenced_job_name is None:
+                    continue
+                if referenced_job_name in self.created_job_ids:
+                    task["run_job_task"]["job_id"] = self.created_job_ids[referenced_job_name]
+                elif referenced_job_name in self.snapshot:
+                    task["run_job_task"]["job_id"] = self.snapshot.get_job_id(referenced_job_name)
+                else:
+                    raise ValueError(f"Referenced job '{referenced_job_name}' not found in this workspace")
+
+    def load_existing_job_definition(self, job_name: str):
+        """Definition of the existing job saved by validation for changed jobs, None if not available"""
+        return self.artifact_set.get(EXISTING_JOBS, job_name)
+
+    def update_existing_job(self, job_name: str, job_id: int, job_dict: dict, job_settings: JobSettings):
+        """Apply the validated settings to an existing job, with a partial update when possible, else a full reset"""
+        reset_payload_bytes = get_payload_size({'job_id': job_id, 'new_settings': job_settings.as_dict()})
+        delta = None
+        if self.partial_updates:
+            existing_job_dict = self.load_existing_job_definition(job_name)
+            if existing_job_dict is not None:
+                delta = compute_job_settings_delta(existing_job_dict, job_dict)
+            if delta is None:
+                self.logger.info(f"Changes of job {job_name} cannot be applied as a partial update, resetting it")
+
+        started_at = time.monotonic()
+        if delta is not None and not delta['new_settings'] and not delta['fields_to_remove']:
+            # Differences in the definition files only (e.g. order of tasks), nothing to send
+            payload_bytes = 0
+            self.logger.info(f"Job {job_name} has no effective settings changes, not updated")
+            update_method = 'none'
+        elif delta is not None:
+            payload = {'job_id': job_id, 'new_settings': delta['new_settings'], 'fields_to_remove': delta['fields_to_remove']}
+            payload_bytes = get_payload_size(payload)
+            # jobs.update replaces each sent tasks / job_clusters entry in full (entries are not merged field by
+            # field), so a changed entry is sent with all its fields and fields removed from it are not left behind
+            self.client.jobs.update(
+                job_id=job_id,
+                new_settings=JobSettings.from_dict(delta['new_settings']),
+                fields_to_remove=delta['fields_to_remove'] or None
+            )
+            changed_fields = sorted(delta['new_settings']) + delta['fields_to_remove']
+            self.logger.info(f"Updated job: {job_name} (partial update of {', '.join(changed_fields) or 'no fields'})")
+            update_method = 'update'
+        else:
+            payload_bytes = reset_payload_bytes
+            self.client.jobs.reset(job_id=job_id, new_settings=job_settings)
+            self.logger.info(f"Updated job: {job_name}")
+            update_method = 'reset'
+        latency_ms = round((time.monotonic() - started_at) * 1000)
+
+        with self.progress_lock:
+            self.progress['full_resets' if update_method == 'reset' else 'partial_updates'] += 1
+            self.progress['payload_bytes'] += payload_bytes
+            self.progress['payload_bytes_saved'] += max(reset_payload_bytes - payload_bytes, 0)
+        self.job_import_statuses[job_name].update({
+            "update_method": update_method,
+            "payload_bytes": payload_bytes,
+            "latency_ms": latency_ms
+        })
+
+    def import_single_job(self, operation: dict) -> bool:
+        job_name = operation['job_name']
         
         try:
             # Set status to in_progress when we actually start importing
             self._update_job_status(job_name, "in_progress")
+
+            # Optimistic concurrency: the job must not have changed since validation
+            operation_name = operation['operation']
+            job_id = self.snapshot.get_job_id(job_name)
+            # Creation of the interrupted run recovered by resetting the job it created
+            recovered_create = False
+            change = self.snapshot.check_job(self.client, job_name)
+            if change == JOB_DELETED and operation_name == OPERATION_DELETE:
+                # Deleted by someone else, or by a previous run that stopped before recording it
+                self.logger.info(f"Job already deleted: {job_name}")
+                self.journal.record_completed(job_name, operation=OPERATION_DELETE)
+                self._update_job_status(job_name, "completed")
+                return True
+            elif change == JOB_CREATED and operation_name == OPERATION_CREATE and job_name in self.journal.in_flight:
+                # Created by a previous run that stopped before recording it: apply the settings again
+                job_id = find_live_job_id(self.client, job_name)
+                if job_id is None:
+                    raise ValueError("Job created by the interrupted run was not found in the workspace, please validate again")
+                operation_name = OPERATION_RESET
+                recovered_create = True
+                self.logger.info(f"Job {job_name} was created by the interrupted run, resetting it")
+            elif change == JOB_MODIFIED and job_name in self.journal.in_flight:
+                # The change may be the write of the interrupted run itself
+                pass
+            elif change is not None:
+                error_msg = f"Job was {change} in the workspace since validation, please validate again"
+                self.logger.warning(f"Skipping job {job_name}: {error_msg}")
+                with self.progress_lock:
+                    self.progress['stale_jobs'] += 1
+                self.journal.record_failed(job_name, error_msg)
+                self._update_job_status(job_name, "stale", error_msg)
+                return False
+
+            if operation_name == OPERATION_DELETE:
+                self.journal.record_started(job_name, operation=OPERATION_DELETE)
+                self.client.jobs.delete(job_id=job_id)
+                self.logger.info(f"Deleted job: {job_name}")
+                self.journal.record_completed(job_name, operation=OPERATION_DELETE)
+                self._update_job_status(job_name, "completed")
+                return True
             
             # Load validated job definition
-            with open(validated_job_path, 'r') as f:
-                job_dict = json.load(f)
+            job_dict = self.artifact_set.get(VALIDATED_JOBS, job_name)
+            if job_dict is None:
+                raise ValueError(f"No validated definition of job {job_name}")
+            self.inject_job_references(job_dict)
+            job_settings = JobSettings.from_dict(job_dict['settings'])
                 
-            if job_name in self.existing_jobs:
+            self.journal.record_started(job_name, operation=operation_name)
+            if operation_name == OPERATION_RESET:
                 # Update existing job
-                existing_job = self.existing_jobs[job_name]
-                job_settings = JobSettings.from_dict(job_dict['settings'])
-                if mode == 'update':
-                    self.client.jobs.reset(job_id=existing_job.job_id, new_settings=job_settings)
-                    self.logger.info(f"Updated job: {job_name}")
+                self.update_existing_job(job_name, job_id, job_dict, job_settings)
+                if recovered_create:
+                    # Still a creation in the plan: jobs of later waves (and later resumes) reference its ID
+                    self.created_job_ids[job_name] = job_id
+                    self.journal.record_completed(job_name, operation=OPERATION_CREATE, job_id=job_id)
+                else:
+                    self.journal.record_completed(job_name, operation=OPERATION_RESET, job_id=job_id)
             else:
                 # Create new job
-                job_settings = JobSettings.from_dict(job_dict['settings'])
-                if mode == 'update':
-                    self.client.jobs.create(**job_settings.__dict__)
-                    self.logger.info(f"Created new job: {job_name}")
+                started_at = time.monotonic()
+                created_job = self.client.jobs.create(**job_settings.__dict__)
+                self.job_import_statuses[job_name].update({
+                    "payload_bytes": get_payload_size(job_settings.as_dict()),
+                    "latency_ms": round((time.monotonic() - started_at) * 1000)
+                })
+                self.created_job_ids[job_name] = created_job.job_id
+                self.journal.record_completed(job_name, operation=OPERATION_CREATE, job_id=created_job.job_id)
+                self.logger.info(f"Created new job: {job_name}")
                 
             self._update_job_status(job_name, "completed")
             return True
             
         except Exception as e:
-            error_msg = f"Failed to import job: {str(e)}"
+            error_msg = f"Failed to {operation['operation']} job: {str(e)}"
             if hasattr(e, 'response') and hasattr(e.response, 'json'):
                 try:
                     error_details = e.response.json()
                     if 'error' in error_details:
-                        error_msg = f"Failed to import job: {error_details['error']}"
+                        error_msg = f"Failed to {operation['operation']} job: {error_details['error']}"
                     elif 'message' in error_details:
-                        error_msg = f"Failed to import job: {error_details['message']}"
+                        error_msg = f"Failed to {operation['operation']} job: {error_details['message']}"
                 except:
                     pass  # If we can't parse the error response, stick with the original error message
             self.logger.error(f"Failed to import job {job_name}: {str(e)}")
+            self.journal.record_failed(job_name, error_msg)
             self._update_job_status(job_name, "error", error_msg)
             return False
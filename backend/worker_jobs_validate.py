@@ -1,8 +1,7 @@
 import json  
 import os, sys
 import logging
-import tempfile 
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from typing import Dict, List, Optional, Tuple
 from databricks.sdk import WorkspaceClient
 from databricks.sdk.service.jobs import Job, JobSettings, Task, NotebookTask
@@ -11,13 +10,27 @@ from databricks.sdk.service.workspace import ImportFormat
 from backend.resource_name_mappings import RESOURCE_NAME_MAPPINGS_FILE_PATH, get_resource_name_mappings
 from backend.util.job_logger import setup_job_logger, log_exception
 from backend.util.compare_job_configurations import compare_job_configurations
-from backend.util.dbr_workspace_utils import get_all_clusters_and_warehouses
+from backend.util.dbr_workspace_utils import get_all_clusters_and_warehouses, list_jobs_expanded, complete_job_definition
+from backend.util.job_selector import JobSelector
+from backend.util.job_definition_cache import JobDefinitionCache
+from backend.util.import_planner import get_job_reference_name
+from backend.util.job_snapshot import JobSnapshot, compute_settings_fingerprint, FINGERPRINT_FROM_GET, FINGERPRINT_FROM_LISTING
+from backend.util.artifact_store import get_artifact_store, VALIDATED_JOBS, EXISTING_JOBS
+from backend.util.adaptive_concurrency import get_worker_pool_size
+from backend.util.api_call_controls import get_api_call_stats
+from backend.util.workspace_folder_mirror import get_workspace_folder_mirror
 
 class JobimportValidationTaskComponent:
 
-    def __init__(self, import_task_id: str, client: WorkspaceClient):
+    def __init__(self, import_task_id: str, client: WorkspaceClient, selector: JobSelector = None, force_refresh: bool = False):
         self.import_task_id = import_task_id
         self.client = client
+        self.selector = selector or JobSelector()
+        self.force_refresh = force_refresh
+        self.job_definition_cache = None
+        self.artifact_set = None
+        self.all_job_ids_by_name = {}
+        self.all_listed_jobs = []
 
         self.logger, self.log_handler = setup_job_logger(f"{import_task_id}")
 
@@ -27,7 +40,7 @@ class JobimportValidationTaskComponent:
         self.validation_task_issues = []
         self.job_validation_statuses = [] 
 
-        self.num_threads = int(os.getenv("NUM_THREADS", "4"))
+        self.num_threads = get_worker_pool_size()
 
         self.progress_stats = {
             'total_items': 0,
@@ -35,98 +48,59 @@ class JobimportValidationTaskComponent:
             'files_to_transfer': 0,
             'files_transferred': 0,
             'jobs_to_validate': 0,
-            'jobs_validated': 0
+            'jobs_validated': 0,
+            'files_from_mirror': 0,
+            'api_calls_saved': 0,
+            'fetches_avoided': 0,
+            'definitions_from_cache': 0
         }
 
-    def download_job_definition_files(self, workspace_git_folder: str, temp_dir: str) -> list:
-        """Download a all json file from workspace folder to temp_dir"""
-
-        self.logger.info("Transferring job definition json files from Workspace to local folder...")
-        successful_downloads = []
-
-        # Check if workspace folder exists
+    def load_job_definition_file(self, mirror, entry) -> tuple:
+        """Read a json file from the workspace folder (through the local mirror) and parse it once.
+        Returns (file name, job definition dict or None, parse exception or None)"""
+        filename = os.path.basename(entry.path)
+        content, downloaded = mirror.read(entry)
+        # Update progress
+        if not downloaded:
+            self.progress_stats['files_from_mirror'] += 1
+        self.progress_stats['files_transferred'] += 1
+        self.progress_stats['processed_items'] += 1
         try:
-            self.client.workspace.get_status(workspace_git_folder)
+            return filename, json.loads(content), None
         except Exception as e:
-            raise ValueError(f"Folder not found in workspace: {workspace_git_folder}")
-
-        # Get list of files to process
-        entries = list(self.client.workspace.list(workspace_git_folder))
-        json_files = [entry for entry in entries if entry.path.endswith('.json')]
-        
-        if not json_files:
-            raise ValueError(f"No .json files found in workspace folder: {workspace_git_folder}")
-
-        self.logger.info(f"Using {self.num_threads} threads for parallel processing...")
-
-        def download_single_file(file_name, temp_dir: str) -> tuple[str, str, bool]:
-                
-            local_path = os.path.join(temp_dir, os.path.basename(file_name.path))
-            filename = os.path.basename(file_name.path)
-            
-            try:
-                with self.client.workspace.download(file_name.path) as file:
-                    with open(local_path, 'wb') as f:
-                        f.write(file.read())
-                # Update progress
-                self.progress_stats['files_transferred'] += 1
-                self.progress_stats['processed_items'] += 1
-                return filename, local_path, True
-            except Exception as e:
-                self.validation_task_issues.append({
-                    "file": filename,
-                    "issue": f"Error during transferring from workspace folder: {str(e)}",
-                    'level': 'Error'
-                })
-                log_exception(self.logger, f"Error transferring {filename}", e)
-                return filename, None, False
-        
-        with ThreadPoolExecutor(max_workers=self.num_threads) as executor:
-            future_to_entry = {
-                executor.submit(download_single_file, entry, temp_dir): entry
-                for entry in json_files
+            return filename, None, e
+
+    def load_compute_resources(self) -> tuple[dict, dict, dict]:
+        """Load compute resource name mappings and the clusters and warehouses of this workspace"""
+        self.logger.info(f"Loading compute resource mappings from {RESOURCE_NAME_MAPPINGS_FILE_PATH}...")
+        resource_name_mappings = get_resource_name_mappings(self.client)
+        if not resource_name_mappings:
+            warning = {
+                'issue': "No compute resource mappings found. Some jobs may fail to import if clusters or warehouses with exact original names do not exist in this workspace.",
+                'file': None,
+                'level': 'warning'
             }
-            
-            for future in future_to_entry:
-                entry = future_to_entry[future]
-                try:
-                    filename, local_path, success = future.result()
-                    if success:
-                        successful_downloads.append((filename, local_path))
-                        self.logger.info( f"Transferred {filename}")
-                    else:
-                        self.validation_task_issues.append({
-                            "file": os.path.basename(entry.path),
-                            "issue": "Failed to transfer file from workspace folder",
-                            'level': 'Error'
-                        })
-                        self.logger.info( f"Failed to transfer {os.path.basename(entry.path)}")
-                except Exception as e:
-                    self.validation_task_issues.append({
-                        "file": os.path.basename(entry.path),
-                        "issue": f"Error during transferring from workspace folder: {str(e)}",
-                        'level': 'Error'
-                    })
-                    log_exception(self.logger, f"Error transferring {os.path.basename(entry.path)}", e)
-        
-        if not successful_downloads:
-            raise ValueError("No files were successfully downloaded")
-        
-        return successful_downloads
+            self.validation_task_issues.append(warning)
+            self.logger.info( f"Warning: {warning['issue']}")
+
+        self.logger.info( "Getting compute resources definitions (clusters and warehouses)...")
+        all_clusters_dict, all_warehouses_dict = get_all_clusters_and_warehouses(self.client)
+        return resource_name_mappings, all_clusters_dict, all_warehouses_dict
 
     def validate_single_job(self,
-                        json_file_basename: str, local_file_path: str, 
+                        json_file_basename: str, importing_job_dict: dict, 
                         resource_name_mappings: dict, all_clusters_dict: dict, all_warehouses_dict: dict,
-                        all_importing_jobs_list: set, all_existing_jobs_dict: dict) -> list:
-        """Validate a single job definition file and return any validation issues"""
+                        all_importing_jobs_list: set, existing_job_dict: Optional[dict]) -> list:
+        """Validate a single (parsed) job definition file and return any validation issues"""
 
         validation_issues = []
         
         # Sets to track unique resource validation issues
         cluster_issues = set()
         warehouse_issues = set()
-        job_ref_issues = set()
         run_as_issues = set()
+        job_references = set()
+        unresolved_job_references = set()
 
         job_status = {
             'file_name': json_file_basename,
@@ -137,9 +111,6 @@ class JobimportValidationTaskComponent:
         }
         
         try:
-            with open(local_file_path, 'r') as f:
-                importing_job_dict = json.load(f)
-
             #Job name from the definition file content (more reliable then the file name)
             job_name = importing_job_dict.get("settings", {}).get("name")
             job_status['job_name'] = job_name
@@ -272,46 +243,42 @@ class JobimportValidationTaskComponent:
                 
                 # Job reference validation
                 if "run_job_task" in task and "job_id" in task["run_job_task"]:
-                    job_ref = task["run_job_task"]["job_id"]
-                    if isinstance(job_ref, str) and job_ref.startswith("__JOB__"):
-
-                        referenced_job_name = job_ref.replace("__JOB__", "").replace("__", "")
+                    referenced_job_name = get_job_reference_name(task["run_job_task"]["job_id"])
+                    if referenced_job_name is not None:
+                        job_references.add(referenced_job_name)
                        
-                        job_ref_id = all_existing_jobs_dict.get(referenced_job_name, {}).get("job_id", None)
+                        # A job that does not exist yet may be created by the same import (checked once all files are read),
+                        # the placeholder is then replaced by the import task
+                        job_ref_id = self.all_job_ids_by_name.get(referenced_job_name)
                         if not job_ref_id:
-                            job_ref_issues.add(f"Referenced job '{referenced_job_name}' not found in this workspace")
+                            unresolved_job_references.add(referenced_job_name)
                             continue
 
                         task["run_job_task"]["job_id"] = job_ref_id
 
             # Compare with existing workflow Job object (if present)
-            if job_name in all_existing_jobs_dict.keys():
-                existing_job = all_existing_jobs_dict[job_name]
+            if existing_job_dict is not None:
                 is_different, differences = compare_job_configurations(
-                    existing_job, 
+                    existing_job_dict, 
                     importing_job_dict
                 )
 
                 if is_different:
                     job_status['status'] = 'changed'
                     job_status['differences'] = differences
+                    # The existing definition lets the import send only the changed settings (jobs.update)
+                    self.artifact_set.put(EXISTING_JOBS, job_name, existing_job_dict)
                 else:
                     job_status['status'] = 'unchanged'
             else:
                 job_status['status'] = 'new'
 
-            # Persist updated job config to a new json file
-
-            validated_jobs_dir = os.path.join(self.temp_dir, "validated_jobs")
-            os.makedirs(validated_jobs_dir, exist_ok=True)
-            
-            updated_job_config_path = os.path.join(validated_jobs_dir, f"{job_name}.json")
-            self.logger.info(f"Persisting updated job config to {updated_job_config_path}")
-            with open(updated_job_config_path, 'w') as f:
-                if ("t1a-job-v2-KTO_KANDIDAAT_BVV" in json_file_basename):
-                    pass
+            job_status['job_references'] = sorted(job_references)
+            job_status['unresolved_job_references'] = sorted(unresolved_job_references)
 
-                json.dump(importing_job_dict, f, indent=4)
+            # Persist updated job config in the artifact set of the validation
+            self.logger.info(f"Persisting updated job config of {job_name}")
+            self.artifact_set.put(VALIDATED_JOBS, job_name, importing_job_dict)
 
             # Add deduplicated issues (from the set) to validation_issues
             for issue in cluster_issues:
@@ -330,14 +297,6 @@ class JobimportValidationTaskComponent:
                 })
                 job_status['status'] = 'error'
                 
-            for issue in job_ref_issues:
-                validation_issues.append({
-                    "file": json_file_basename,
-                    "issue": issue,
-                    "type": "job_reference"
-                })
-                job_status['status'] = 'error'
-
             # Add run_as validation issues
             for issue in run_as_issues:
                 validation_issues.append({
@@ -362,60 +321,276 @@ class JobimportValidationTaskComponent:
             
         return job_status
         
-    def get_all_jobs(self) -> List[Job]:
-        """Get list of all jobs in the workspace"""
-        try:
-            self.logger.info("Getting list of all jobs in workspace...")
-            return list(self.client.jobs.list())
-        except Exception as e:
-            self.logger.error(f"Failed to get jobs list: {str(e)}")
-            raise
+    def check_unresolved_job_references(self, all_importing_job_names: set):
+        """Job references not found in the workspace must be to jobs of the imported files (created by the import)"""
+        for job_status in self.job_validation_statuses:
+            for referenced_job_name in job_status.pop('unresolved_job_references', []):
+                if referenced_job_name in all_importing_job_names:
+                    continue
+                job_status['validation_issues'].append({
+                    "file": job_status['file_name'],
+                    "issue": f"Referenced job '{referenced_job_name}' not found in this workspace",
+                    "type": "job_reference"
+                })
+                job_status['status'] = 'error'
+
+    def list_existing_jobs(self) -> list:
+        """List all jobs in the workspace (expanded listing) and return the selected ones"""
+        self.logger.info("Listing all jobs in workspace...")
+        all_listed_jobs = list_jobs_expanded(self.client)
+
+        # Job references (run_job_task) are resolved against all jobs, not only the selected ones
+        self.all_job_ids_by_name = {job.settings.name: job.job_id for job in all_listed_jobs}
+        self.all_listed_jobs = all_listed_jobs
+
+        self.job_definition_cache.retain(job.job_id for job in all_listed_jobs)
+
+        selected_jobs = [job for job in all_listed_jobs if self.selector.matches_job(job.as_dict(), allow_unknown_run_as=True)]
+        self.logger.info(f"Listed {len(all_listed_jobs)} jobs, {len(selected_jobs)} selected ({self.selector.describe()})")
+        return selected_jobs
+
+    def publish_job_snapshot(self, existing_job_definitions: dict):
+        """Publish the live jobs seen by validation for import and delete (see JobSnapshot)"""
+        jobs = {}
+        for listed_job in self.all_listed_jobs:
+            existing_job_dict = existing_job_definitions.get(listed_job.job_id)
+            if not listed_job.has_more:
+                fingerprint_source = FINGERPRINT_FROM_LISTING
+                fingerprint = compute_settings_fingerprint(listed_job.settings.as_dict())
+            elif existing_job_dict is not None:
+                # Truncated listing entry, completed with jobs.get (or its cached response)
+                fingerprint_source = FINGERPRINT_FROM_GET
+                fingerprint = compute_settings_fingerprint(existing_job_dict.get('settings'))
+            else:
+                fingerprint_source, fingerprint = None, None
+            jobs[listed_job.settings.name] = {'job_id': listed_job.job_id, 'fingerprint': fingerprint, 'fingerprint_source': fingerprint_source}
+        JobSnapshot(jobs).save(self.artifact_set)
+        self.logger.info(f"Published snapshot of {len(jobs)} jobs for import and delete")
+
+    def validate_job_definition_files(self, workspace_git_folder: str, json_files: list, all_json_files: list) -> tuple[set, set, set]:
+        """
+        Transfer, compare and validate the job definition files, with all phases overlapping in one thread pool:
+        - Phase 1: transfer and parse of each file
+        - Phase 2: listing of existing jobs, then full definition of each job that has a matching file
+        - compute resource mappings, clusters and warehouses
+        - Phase 3: validation of each file, as soon as the file, its existing job definition (if any)
+          and the compute resources are available
+        Returns: (names of the importing jobs, names of the jobs of all parsed files, names of all existing selected jobs)
+        """
+        # Only entries whose modified_at or size changed since the last run are downloaded
+        mirror = get_workspace_folder_mirror(self.client, workspace_git_folder)
+
+        all_importing_job_names = set()
+        # Jobs that have a definition file, even if excluded by the metadata filters: never reported as deleted
+        defined_job_names = set()
+        existing_job_names = set()
+        num_loaded_files = 0
+        listed_jobs_by_name = None          # selected live jobs
+        all_listed_jobs_by_name = None      # all live jobs, the counterparts of the files
+        compute_resources = None
+
+        files_waiting_for_listing = []      # (file name, job dict)
+        files_waiting_for_resources = []    # (file name, job dict, existing job dict)
+        files_waiting_for_definition = {}   # job_id -> [(file name, job dict)]
+        existing_job_definitions = {}       # job_id -> existing job dict (None if not available)
+        fetched_job_ids = set()
+        fetch_stats = {'get_calls': 0, 'api_calls_saved': 0}
+
+        self.logger.info(f"Using {self.num_threads} threads for parallel processing...")
+
+        with ThreadPoolExecutor(max_workers=self.num_threads) as executor:
+            pending = {}
+
+            def submit(kind, payload, fn, *args, **kwargs):
+                pending[executor.submit(fn, *args, **kwargs)] = (kind, payload)
+
+            def fetch_definition(listed_job):
+                if listed_job.job_id not in fetched_job_ids:
+                    fetched_job_ids.add(listed_job.job_id)
+                    submit('definition', listed_job, complete_job_definition, self.client, listed_job, self.job_definition_cache)
+
+            def file_ready(file_name, job_dict, existing_job_dict):
+                if compute_resources is None:
+                    files_waiting_for_resources.append((file_name, job_dict, existing_job_dict))
+                    return
+                resource_name_mappings, all_clusters_dict, all_warehouses_dict = compute_resources
+                submit('validation', file_name, self.validate_single_job,
+                    json_file_basename=file_name,
+                    importing_job_dict=job_dict,
+                    resource_name_mappings=resource_name_mappings,
+                    all_clusters_dict=all_clusters_dict,
+                    all_warehouses_dict=all_warehouses_dict,
+                    all_importing_jobs_list=all_importing_job_names,
+                    existing_job_dict=existing_job_dict
+                )
+
+            def file_selected(file_name, job_dict, live_job_dict, existing_job_dict):
+                """Validate a file if it is selected, by its live job or by its own content (see JobSelector.matches_job_file)"""
+                if self.selector.has_metadata_filters and not self.selector.matches_job_file(job_dict, live_job_dict):
+                    self.logger.info(f"Skipping {file_name}: neither the file nor its job match {self.selector.describe()}")
+                    return
+                job_name = job_dict.get("settings", {}).get("name")
+                if job_name:
+                    all_importing_job_names.add(job_name)
+                file_ready(file_name, job_dict, existing_job_dict)
+
+            def file_parsed(file_name, job_dict):
+                if all_listed_jobs_by_name is None:
+                    files_waiting_for_listing.append((file_name, job_dict))
+                    return
+                listed_job = all_listed_jobs_by_name.get(job_dict.get("settings", {}).get("name"))
+                if listed_job is None:
+                    file_selected(file_name, job_dict, None, None)
+                elif listed_job.job_id in existing_job_definitions:
+                    live_job_dict = existing_job_definitions[listed_job.job_id]
+                    file_selected(file_name, job_dict, live_job_dict or listed_job.as_dict(), live_job_dict)
+                elif (self.selector.has_metadata_filters and not self.selector.matches_job_file(job_dict, listed_job.as_dict())
+                        and not (self.selector.run_as and not listed_job.settings.run_as)):
+                    # Not selected, and the listing has all the information needed to tell: not fetched
+                    self.logger.info(f"Skipping {file_name}: neither the file nor its job match {self.selector.describe()}")
+                else:
+                    files_waiting_for_definition.setdefault(listed_job.job_id, []).append((file_name, job_dict))
+                    fetch_definition(listed_job)
+
+            submit('listing', None, self.list_existing_jobs)
+            submit('resources', None, self.load_compute_resources)
+            for entry in json_files:
+                submit('file', entry, self.load_job_definition_file, mirror, entry)
+
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    self.progress_stats.update(get_api_call_stats())
+                    for future in done:
+                        kind, payload = pending.pop(future)
+
+                        if kind == 'listing':
+                            listed_jobs = future.result()
+                            listed_jobs_by_name = {job.settings.name: job for job in listed_jobs}
+                            all_listed_jobs_by_name = {job.settings.name: job for job in self.all_listed_jobs}
+                            num_jobs = len(listed_jobs)
+                            self.progress_stats['jobs_to_validate'] = num_jobs
+                            self.progress_stats['jobs_validated'] = num_jobs
+                            self.progress_stats['total_items'] += num_jobs
+                            self.progress_stats['processed_items'] += num_jobs
+                            for listed_job in listed_jobs:
+                                # Without run_as in the listing, the run_as criterion of the selector needs the full definition
+                                if self.selector.run_as and not listed_job.settings.run_as:
+                                    fetch_definition(listed_job)
+                                else:
+                                    existing_job_names.add(listed_job.settings.name)
+                            for file_name, job_dict in files_waiting_for_listing:
+                                file_parsed(file_name, job_dict)
+                            files_waiting_for_listing.clear()
+
+                        elif kind == 'resources':
+                            compute_resources = future.result()
+                            for waiting_file in files_waiting_for_resources:
+                                file_ready(*waiting_file)
+                            files_waiting_for_resources.clear()
+
+                        elif kind == 'file':
+                            file_name = os.path.basename(payload.path)
+                            try:
+                                file_name, job_dict, parse_error = future.result()
+                            except Exception as e:
+                                self.validation_task_issues.append({
+                                    "file": file_name,
+                                    "issue": f"Error during transferring from workspace folder: {str(e)}",
+                                    'level': 'Error'
+                                })
+                                log_exception(self.logger, f"Error transferring {file_name}", e)
+                                continue
+                            num_loaded_files += 1
+                            self.logger.info( f"Transferred {file_name}")
+                            if parse_error is not None:
+                                self.validation_task_issues.append({
+                                    "file": file_name,
+                                    "issue": f"Error reading job name from file: {str(parse_error)}",
+                                    "level": "Error"
+                                })
+                                self.logger.error(f"Error reading job name from {file_name}: {str(parse_error)}")
+                                # Report the file with an error status
+                                self.job_validation_statuses.append({
+                                    'file_name': file_name,
+                                    'job_name': None,
+                                    'status': 'error',
+                                    'differences': [],
+                                    'validation_issues': [{
+                                        "file": file_name,
+                                        "issue": f"Validation error: {str(parse_error)}",
+                                        "type": "validation_error"
+                                    }]
+                                })
+                                continue
+                            job_name = job_dict.get("settings", {}).get("name")
+                            # Every file counts against the jobs to delete, the metadata filters only select the files to import
+                            if job_name:
+                                defined_job_names.add(job_name)
+                            file_parsed(file_name, job_dict)
+
+                        elif kind == 'definition':
+                            listed_job = payload
+                            existing_job_dict = None
+                            live_job_dict = listed_job.as_dict()
+                            try:
+                                job, used_get = future.result()
+                                fetch_stats['get_calls' if used_get else 'api_calls_saved'] += 1
+                                live_job_dict = existing_job_dict = job.as_dict()
+                                # Files are compared with their live job whether or not it is selected,
+                                # only the selected jobs can be deleted
+                                if listed_job.settings.name in listed_jobs_by_name and (not self.selector.run_as or self.selector.matches_job(live_job_dict)):
+                                    existing_job_names.add(listed_job.settings.name)
+                            except Exception as e:
+                                fetch_stats['get_calls'] += 1
+                                self.logger.error(f"Failed to download job '{listed_job.settings.name}': {str(e)}")
+                            existing_job_definitions[listed_job.job_id] = existing_job_dict
+                            for file_name, job_dict in files_waiting_for_definition.pop(listed_job.job_id, []):
+                                file_selected(file_name, job_dict, live_job_dict, existing_job_dict)
+
+                        elif kind == 'validation':
+                            try:
+                                job_status = future.result()
+                                self.job_validation_statuses.append(job_status)
+                                self.logger.info(f"Completed validation for {payload}, status: {job_status['status']}")
+                            except Exception as e:
+                                self.validation_task_issues.append({
+                                    "file": payload,
+                                    "issue": f"Validation for {payload} has failed with an error."
+                                })
+                                log_exception(self.logger, f"Error validating {payload}", e)
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
 
-    def download_job_definition(self, job: Job) -> Optional[Tuple[str, dict]]:
-        """Download full job definition for a single job"""
         try:
-            self.logger.info(f"Downloading current-state job definition '{job.settings.name}'...")
-            job_full = self.client.jobs.get(job_id=job.job_id).as_dict()
-            return job.settings.name, job_full
+            mirror.prune(os.path.basename(entry.path) for entry in all_json_files)
+            mirror.save()
         except Exception as e:
-            self.logger.error(f"Failed to download job '{job.settings.name}': {str(e)}")
-            return None
+            self.logger.warning(f"Failed to persist local mirror of {workspace_git_folder}: {str(e)}")
 
-    def get_all_jobs_full(self, jobs_list: Optional[List[Job]] = None) -> dict:
-        """Download all job definitions in parallel"""
-        if jobs_list is None:
-            jobs_list = self.get_all_jobs()
-        
-        all_jobs = {}
-        
-        self.logger.info(f"Downloading {len(jobs_list)} job definitions...")
-        
-        with ThreadPoolExecutor(max_workers=self.num_threads) as executor:
-            future_to_job = {
-                executor.submit(self.download_job_definition, job): job 
-                for job in jobs_list
-            }
-            
-            for future in as_completed(future_to_job):
-                result = future.result()
-                if result:
-                    job_name, job_full = result
-                    all_jobs[job_name] = job_full
-                    # Update progress as each job is downloaded
-                    self.progress_stats['jobs_validated'] += 1
-                    self.progress_stats['processed_items'] += 1
-                    self.logger.debug(f"Downloaded job definition for '{job_name}' ({self.progress_stats['jobs_validated']}/{self.progress_stats['jobs_to_validate']})")
-        
-        return all_jobs
+        if not num_loaded_files:
+            raise ValueError("No files were successfully downloaded")
+
+        self.publish_job_snapshot(existing_job_definitions)
+
+        self.progress_stats['api_calls_saved'] = fetch_stats['api_calls_saved']
+        self.progress_stats['fetches_avoided'] = len(all_listed_jobs_by_name) - len(fetched_job_ids)
+        self.progress_stats['definitions_from_cache'] = self.job_definition_cache.hits
+        self.logger.info(f"{self.progress_stats['files_from_mirror']} of {len(json_files)} files served from local mirror")
+        self.logger.info(f"Downloaded {len(fetched_job_ids)} of {len(all_listed_jobs_by_name)} job definitions "
+                         f"with {fetch_stats['get_calls']} jobs.get call(s), {self.progress_stats['fetches_avoided']} jobs without a selected file not fetched")
+        return all_importing_job_names, defined_job_names, existing_job_names
 
     def process_import_validation_task(self):
         self.status = 'in_progress'
         self.message = 'Validation Started...'
 
         try:
-            # Create temporary directory
-            self.temp_dir = tempfile.mkdtemp()
-            self.logger.info(f"Temporary local directory: {self.temp_dir}")
+            # Artifact set of the run (validated job definitions, for import and delete)
+            self.artifact_set = get_artifact_store().new_set()
+            self.logger.info(f"Artifact set: {self.artifact_set.artifact_set_id}")
             
             workspace_git_folder = os.getenv("WORKSPACE_GIT_FOLDER_PATH")
             if not workspace_git_folder:
@@ -423,103 +598,51 @@ class JobimportValidationTaskComponent:
                 
             self.logger.info(f"Using workspace folder: {workspace_git_folder}")
                     
-            # Get list of files and jobs upfront
-            entries = list(self.client.workspace.list(workspace_git_folder))
-            json_files = [entry for entry in entries if entry.path.endswith('.json')]
+            # Check if workspace folder exists
+            try:
+                self.client.workspace.get_status(workspace_git_folder)
+            except Exception as e:
+                raise ValueError(f"Folder not found in workspace: {workspace_git_folder}")
+
+            # Get list of files (listed once, for the whole task)
+            all_json_files = [entry for entry in self.client.workspace.list(workspace_git_folder) if entry.path.endswith('.json')]
+            json_files = [entry for entry in all_json_files if self.selector.matches_file_name(os.path.basename(entry.path))]
             
             if not json_files:
                 raise ValueError(f"No .json files found in workspace folder: {workspace_git_folder}")
 
-            # Get all jobs early to know total count and reuse later
-            all_jobs_list = self.get_all_jobs()
-            
-            # Set initial progress stats with actual totals
+            self.logger.info(f"Validating {self.selector.describe()}")
+
+            # Set initial progress stats (existing jobs are added once listed)
             num_files = len(json_files)
-            num_jobs = len(all_jobs_list)
-            self.progress_stats = {
+            self.progress_stats.update({
                 'files_to_transfer': num_files,
                 'files_transferred': 0,
-                'jobs_to_validate': num_jobs,
+                'files_from_mirror': 0,
+                'jobs_to_validate': 0,
                 'jobs_validated': 0,
-                'total_items': num_files + num_jobs,
+                'total_items': num_files,
                 'processed_items': 0
-            }
-            self.logger.info(f"Found {num_files} files and {num_jobs} jobs to process")
-            
-            # Load compute cluster mappings
-            self.logger.info(f"Loading compute resource mappings from {RESOURCE_NAME_MAPPINGS_FILE_PATH}...")
-            resource_name_mappings = get_resource_name_mappings(self.client)
-            if not resource_name_mappings:
-                warning = {
-                    'issue': "No compute resource mappings found. Some jobs may fail to import if clusters or warehouses with exact original names do not exist in this workspace.",
-                    'file': None,
-                    'level': 'warning'
-                }
-                self.validation_task_issues.append(warning)
-                self.logger.info( f"Warning: {warning['issue']}")
-            
-        
-            # Phase 1: Download of JSON files from workspace folder
-            job_definition_files = self.download_job_definition_files(workspace_git_folder, self.temp_dir)
-            
-            # Collect all job names from the downloaded files
-            all_importing_job_names = set()
-            for json_file_basename, local_file_path in job_definition_files:
-                try:
-                    with open(local_file_path, 'r') as f:
-                        job_config = json.load(f)
-                        job_name = job_config.get("settings", {}).get("name")
-                        if job_name:
-                            all_importing_job_names.add(job_name)
-                except Exception as e:
-                    self.validation_task_issues.append({
-                        "file": json_file_basename,
-                        "issue": f"Error reading job name from file: {str(e)}",
-                        "level": "Error"
-                    })
-                    self.logger.error(f"Error reading job name from {json_file_basename}: {str(e)}")
-            
-            # Cache compute resources mapping file
-            self.logger.info( "Getting compute resources definitions (clusters and warehouses)...")
-            all_clusters_dict, all_warehouses_dict = get_all_clusters_and_warehouses(self.client)
+            })
+            self.logger.info(f"Found {num_files} files to process")
 
-            # Phase 2: Download all existing job definitions (for comparison)
-            self.logger.info("Downloading existing jobs definitions for comparison (in parallel)...")
-            all_existing_jobs_dict = self.get_all_jobs_full(all_jobs_list)  # Pass the cached list
+            # Live job definitions that need jobs.get are cached between runs (unless a refresh is forced)
+            self.job_definition_cache = JobDefinitionCache(self.client.config.host, force_refresh=self.force_refresh)
 
-            # Phase 3: Validation of JSON files and comparison with existing job definitions
+            # Phases 1, 2 and 3 (overlapping)
             self.logger.info("Validating job definitions (in parallel)...")
+            try:
+                all_importing_job_names, defined_job_names, existing_job_names = self.validate_job_definition_files(workspace_git_folder, json_files, all_json_files)
+            finally:
+                self.job_definition_cache.close()
+
+            self.artifact_set.save()
+            self.logger.info(f"Stored {self.artifact_set.stored} new artifact(s), "
+                             f"{self.artifact_set.deduplicated} identical to already stored ones")
             
-            future_to_file = {}
-            with ThreadPoolExecutor(max_workers=self.num_threads) as executor:
-                # Submit each job for validation
-                for json_file_basename, local_file_path in job_definition_files:
-                    future = executor.submit(
-                        self.validate_single_job,
-                        json_file_basename=json_file_basename,
-                        local_file_path=local_file_path,
-                        resource_name_mappings=resource_name_mappings,
-                        all_clusters_dict=all_clusters_dict,
-                        all_warehouses_dict=all_warehouses_dict,
-                        all_importing_jobs_list=all_importing_job_names,
-                        all_existing_jobs_dict=all_existing_jobs_dict
-                    )
-                    future_to_file[future] = json_file_basename  # Store the basename instead of path
-                
-                # Process results as they arrive
-                for future in future_to_file:
-                    filename = future_to_file[future]  # Get filename from the dictionary
-                    try:
-                        job_status = future.result()
-                        self.job_validation_statuses.append(job_status)
-                        self.logger.info(f"Completed validation for {filename}, status: {job_status['status']}")
-                    except Exception as e:
-                        self.validation_task_issues.append({
-                            "file": filename,
-                            "issue": f"Validation for {filename} has failed with an error."
-                        })
-                        log_exception(self.logger, f"Error validating {filename}", e)
-            
+            # Job references to jobs that neither exist nor are imported are errors
+            self.check_unresolved_job_references(all_importing_job_names)
+
             # Check for deleted jobs
             deleted_jobs = [
                 {
@@ -528,8 +651,8 @@ class JobimportValidationTaskComponent:
                     'file': None,
                     'differences': []
                 }
-                for existing_job_name in all_existing_jobs_dict.keys()
-                if existing_job_name not in all_importing_job_names
+                for existing_job_name in sorted(existing_job_names)
+                if existing_job_name not in defined_job_names
             ]
 
             self.job_validation_statuses.extend(deleted_jobs)
@@ -8,6 +8,7 @@ window.deleteTask = function() {
         showJobStatuses: true,
         jobDeleteStatuses: [],
         pollingInterval: null,
+        queuePosition: null,
         logRecords: [],
         progressStats: {
             total: 0,
@@ -16,11 +17,12 @@ window.deleteTask = function() {
             failed: 0,
             percentComplete: 0
         },
-        tempDir: null,
+        artifactSetId: null,
         jobStatuses: null,
 
         get isInProgress() {
             return this.deleteStatus === 'running' || 
+                   this.deleteStatus === 'pending' || 
                    this.deleteStatus === 'Starting' || 
                    this.pollingInterval !== null;
         },
@@ -46,7 +48,7 @@ window.deleteTask = function() {
                     console.log('start-delete event received, event:', event);
 
                     if (event.detail && event.detail.jobStatuses) {
-                        this.tempDir = event.detail.tempDir;
+                        this.artifactSetId = event.detail.artifactSetId;
                         this.jobStatuses = event.detail.jobStatuses;
                         this.resetDelete();                        
                         this.startDeleteTask();
@@ -109,7 +111,7 @@ window.deleteTask = function() {
                 
                 const requestBody = { 
                     jobStatuses: this.jobStatuses,
-                    tempDir: this.tempDir
+                    artifactSetId: this.artifactSetId
                 };
                 
                 console.log('Sending delete request with data:', requestBody);
@@ -151,6 +153,61 @@ window.deleteTask = function() {
         async pollDeleteStatus() {
             this.stopPolling();
 
+            // Apply a status payload, returns true once the task reached a final state
+            const applyStatus = (data) => {
+                console.log('Delete status update:', data);
+                
+                if (!data.status) {
+                    throw new Error('Invalid status response: missing status field');
+                }
+                
+                this.deleteStatus = data.status;
+                // Position in the task queue while waiting to start
+                this.queuePosition = data.queuePosition || null;
+                this.deleteOutput = data.output || this.deleteOutput;
+                this.logRecords = data.logRecords || [];
+                this.jobDeleteStatuses = data.jobDeleteStatuses || [];
+                
+                if (data.progress) {
+                    this.progressStats = {
+                        total: this.progressStats.total,
+                        jobsToDelete: this.progressStats.jobsToDelete,
+                        deleted: data.progress.deleted || 0,
+                        failed: data.progress.failed_jobs || 0,
+                    };
+                    
+                    const processedJobs = this.progressStats.deleted + this.progressStats.failed;
+                    const totalJobsToProcess = this.progressStats.jobsToDelete;
+                    
+                    this.progressStats.percentComplete = totalJobsToProcess > 0 ? 
+                        Math.round((processedJobs / totalJobsToProcess) * 100) : 0;
+                }
+
+                if (['completed', 'failed', 'completed_with_errors'].includes(data.status)) {
+                    if (data.status === 'completed' && data.progress?.failed_jobs > 0) {
+                        this.deleteStatus = 'completed_with_errors';
+                    }
+                    
+                    console.log('Delete task finished with status:', data.status);
+                    this.stopPolling();
+                    // Dispatch event when delete is complete
+                    console.log('Dispatching delete-completed event');
+                    window.dispatchEvent(new CustomEvent('delete-completed', {
+                        detail: {
+                            status: data.status,
+                            output: data.output,
+                            jobDeleteStatuses: data.jobDeleteStatuses,
+                            progress: data.progress
+                        }
+                    }));
+                    // Dispatch event to refresh workspace info
+                    console.log('Dispatching refresh-workspace-info event');
+                    window.dispatchEvent(new CustomEvent('refresh-workspace-info'));
+                    return true;
+                }
+                return false;
+            };
+
             const poll = async () => {
                 if (!this.deleteTaskId) {
                     console.log('No delete task ID, stopping polling');
@@ -166,55 +223,7 @@ window.deleteTask = function() {
                         throw new Error(`Failed to fetch delete status: ${response.statusText}`);
                     }
                     
-                    const data = await response.json();
-                    console.log('Delete status update:', data);
-                    
-                    if (!data.status) {
-                        throw new Error('Invalid status response: missing status field');
-                    }
-                    
-                    this.deleteStatus = data.status;
-                    this.deleteOutput = data.output || this.deleteOutput;
-                    this.logRecords = data.logRecords || [];
-                    this.jobDeleteStatuses = data.jobDeleteStatuses || [];
-                    
-                    if (data.progress) {
-                        this.progressStats = {
-                            total: this.progressStats.total,
-                            jobsToDelete: this.progressStats.jobsToDelete,
-                            deleted: data.progress.deleted || 0,
-                            failed: data.progress.failed_jobs || 0,
-                        };
-                        
-                        const processedJobs = this.progressStats.deleted + this.progressStats.failed;
-                        const totalJobsToProcess = this.progressStats.jobsToDelete;
-                        
-                        this.progressStats.percentComplete = totalJobsToProcess > 0 ? 
-                            Math.round((processedJobs / totalJobsToProcess) * 100) : 0;
-                    }
-
-                    if (['completed', 'failed', 'completed_with_errors'].includes(data.status)) {
-                        if (data.status === 'completed' && data.progress?.failed_jobs > 0) {
-                            this.deleteStatus = 'completed_with_errors';
-                        }
-                        
-                        console.log('Delete task finished with status:', data.status);
-                        this.stopPolling();
-                        // Dispatch event when delete is complete
-                        console.log('Dispatching delete-completed event');
-                        window.dispatchEvent(new CustomEvent('delete-completed', {
-                            detail: {
-                                status: data.status,
-                                output: data.output,
-                                jobDeleteStatuses: data.jobDeleteStatuses,
-                                progress: data.progress
-                            }
-                        }));
-                        // Dispatch event to refresh workspace info
-                        console.log('Dispatching refresh-workspace-info event');
-                        window.dispatchEvent(new CustomEvent('refresh-workspace-info'));
-                        return;
-                    }
+                    applyStatus(await response.json());
                 } catch (err) {
                     console.error('Error polling delete status:', err);
                     this.deleteStatus = 'failed';
@@ -224,15 +233,27 @@ window.deleteTask = function() {
                 }
             };
 
-            // Initial poll
-            await poll();
+            const startPolling = async () => {
+                // Initial poll
+                await poll();
             
-            // Set up polling interval if not in final state
-            if (!['completed', 'failed', 'completed_with_errors'].includes(this.deleteStatus)) {
-                console.log('Setting up polling interval');
-                this.pollingInterval = setInterval(poll, 1000);
-            } else {
-                console.log('Not setting up polling - already in final state:', this.deleteStatus);
+                // Set up polling interval if not in final state
+                if (!['completed', 'failed', 'completed_with_errors'].includes(this.deleteStatus)) {
+                    console.log('Setting up polling interval');
+                    this.pollingInterval = setInterval(poll, 1000);
+                } else {
+                    console.log('Not setting up polling - already in final state:', this.deleteStatus);
+                }
+            };
+
+            // Prefer pushed incremental events, fall back to polling if streaming is unavailable
+            const streaming = window.streamTaskStatus(
+                `/api/delete/${this.deleteTaskId}/events`,
+                applyStatus,
+                startPolling
+            );
+            if (!streaming) {
+                await startPolling();
             }
         }
     }
@@ -6,6 +6,7 @@ window.exportTask = function() {
         exportOutput: '',
         showLog: false,
         pollingInterval: null,
+        queuePosition: null,
         progressStats: {
             total: 0,
             processed: 0,
@@ -107,6 +108,61 @@ window.exportTask = function() {
         async pollExportStatus() {
             this.stopPolling(); // Clear any existing polling
 
+            // Apply a status payload, returns true once the export reached a final state
+            const applyStatus = (data) => {
+                console.log('Export status update:', data);
+                
+                // Update status FIRST before other properties
+                this.exportStatus = data.status;
+                // Position in the task queue while waiting to start
+                this.queuePosition = data.queuePosition || null;
+                
+                // Then update other properties
+                this.exportOutput = data.output || this.exportOutput;
+                if (data.progress) {
+                    const processedJobs = (data.progress.exported_modified || 0) + 
+                                       (data.progress.exported_unchanged || 0) + 
+                                       (data.progress.failed_jobs || 0);
+                    
+                    this.progressStats = {
+                        total: data.progress.total_jobs || 0,
+                        processed: processedJobs,
+                        exported_modified: data.progress.exported_modified || 0,
+                        exported_unchanged: data.progress.exported_unchanged || 0,
+                        failed: data.progress.failed_jobs || 0,
+                        deleted: data.progress.deleted_files || 0,
+                        percentComplete: data.progress.total_jobs ? 
+                            Math.round((processedJobs / data.progress.total_jobs) * 100) : 0
+                    };
+                }
+
+                // If completed, ensure progress shows 100%
+                if (data.status === 'completed') {
+                    this.progressStats.processed = this.progressStats.total;
+                    this.progressStats.percentComplete = 100;
+                }
+
+                if (['completed', 'failed'].includes(data.status)) {
+                    console.log('Export finished with status:', data.status);
+                    
+                    if (data.status === 'completed' && data.progress?.failed_jobs > 0) {
+                        this.exportStatus = 'completed_with_errors';
+                    }
+                    
+                    // Dispatch completion event
+                    window.dispatchEvent(new CustomEvent('export-completed', {
+                        detail: {
+                            status: this.exportStatus,
+                            progress: this.progressStats
+                        }
+                    }));
+                    
+                    this.stopPolling();
+                    return true;
+                }
+                return false;
+            };
+
             const poll = async () => {
                 if (!this.exportTaskId) {
                     console.log('No export job ID, stopping polling');
@@ -122,55 +178,7 @@ window.exportTask = function() {
                         throw new Error(`Failed to fetch export status: ${response.statusText}`);
                     }
                     
-                    const data = await response.json();
-                    console.log('Export status update:', data);
-                    
-                    // Update status FIRST before other properties
-                    this.exportStatus = data.status;
-                    
-                    // Then update other properties
-                    this.exportOutput = data.output || this.exportOutput;
-                    if (data.progress) {
-                        const processedJobs = (data.progress.exported_modified || 0) + 
-                                           (data.progress.exported_unchanged || 0) + 
-                                           (data.progress.failed_jobs || 0);
-                        
-                        this.progressStats = {
-                            total: data.progress.total_jobs || 0,
-                            processed: processedJobs,
-                            exported_modified: data.progress.exported_modified || 0,
-                            exported_unchanged: data.progress.exported_unchanged || 0,
-                            failed: data.progress.failed_jobs || 0,
-                            deleted: data.progress.deleted_files || 0,
-                            percentComplete: data.progress.total_jobs ? 
-                                Math.round((processedJobs / data.progress.total_jobs) * 100) : 0
-                        };
-                    }
-
-                    // If completed, ensure progress shows 100%
-                    if (data.status === 'completed') {
-                        this.progressStats.processed = this.progressStats.total;
-                        this.progressStats.percentComplete = 100;
-                    }
-
-                    if (['completed', 'failed'].includes(data.status)) {
-                        console.log('Export finished with status:', data.status);
-                        
-                        if (data.status === 'completed' && data.progress?.failed_jobs > 0) {
-                            this.exportStatus = 'completed_with_errors';
-                        }
-                        
-                        // Dispatch completion event
-                        window.dispatchEvent(new CustomEvent('export-completed', {
-                            detail: {
-                                status: this.exportStatus,
-                                progress: this.progressStats
-                            }
-                        }));
-                        
-                        this.stopPolling();
-                        return;
-                    }
+                    applyStatus(await response.json());
                 } catch (err) {
                     console.error('Error polling export status:', err);
                     this.exportStatus = 'failed';
@@ -180,16 +188,28 @@ window.exportTask = function() {
                 }
             };
 
-            // Initial poll
-            await poll();
-            
-            // Only set up polling interval if not already in a final state
-            if (!['completed', 'failed', 'completed_with_errors'].includes(this.exportStatus)) {
-                console.log('Setting up export polling interval');
-                this.pollingInterval = setInterval(poll, 1000);
-            } else {
-                console.log('Not setting up polling - already in final state:', this.exportStatus);
+            const startPolling = async () => {
+                // Initial poll
+                await poll();
+                
+                // Only set up polling interval if not already in a final state
+                if (!['completed', 'failed', 'completed_with_errors'].includes(this.exportStatus)) {
+                    console.log('Setting up export polling interval');
+                    this.pollingInterval = setInterval(poll, 1000);
+                } else {
+                    console.log('Not setting up polling - already in final state:', this.exportStatus);
+                }
+            };
+
+            // Prefer pushed incremental events, fall back to polling if streaming is unavailable
+            const streaming = window.streamTaskStatus(
+                `/api/export/${this.exportTaskId}/events`,
+                applyStatus,
+                startPolling
+            );
+            if (!streaming) {
+                await startPolling();
             }
         }
     }
-} 
\ No newline at end of file
+}
\ No newline at end of file
@@ -8,6 +8,7 @@ window.importTask = function() {
         showJobStatuses: true,
         jobImportStatuses: [],
         pollingInterval: null,
+        queuePosition: null,
         logRecords: [],
         progressStats: {
             total: 0,
@@ -17,11 +18,13 @@ window.importTask = function() {
             failed: 0,
             percentComplete: 0
         },
-        tempDir: null,
+        artifactSetId: null,
         jobStatuses: null,
+        partialUpdates: false,
 
         get isInProgress() {
             return this.importStatus === 'running' || 
+                   this.importStatus === 'pending' || 
                    this.importStatus === 'Starting' || 
                    this.pollingInterval !== null;
         },
@@ -49,7 +52,7 @@ window.importTask = function() {
 
                     if (event.detail && event.detail.jobStatuses) {
                         const numJobs = event.detail.jobStatuses.length;
-                        this.setTaskInfo(event.detail.tempDir, event.detail.jobStatuses);
+                        this.setTaskInfo(event.detail.artifactSetId, event.detail.jobStatuses, event.detail.partialUpdates);
                         this.resetImport(numJobs);
                         this.startImportTask();
                     }
@@ -75,7 +78,7 @@ window.importTask = function() {
             this.jobImportStatuses = [];
             this.logRecords = [];
             
-            // Reset only progress stats, preserve task information (tempDir and jobStatuses)
+            // Reset only progress stats, preserve task information (artifactSetId and jobStatuses)
             this.progressStats = {
                 total: totalJobs,
                 jobsToImport: totalJobs,
@@ -88,10 +91,11 @@ window.importTask = function() {
             console.log('Import task stats reset, totalJobs:', totalJobs);
         },
 
-        setTaskInfo(tempDir, jobStatuses) {
-            this.tempDir = tempDir;
+        setTaskInfo(artifactSetId, jobStatuses, partialUpdates = false) {
+            this.artifactSetId = artifactSetId;
             this.jobStatuses = jobStatuses;
-            console.log('Import task info set:', { tempDir, jobCount: jobStatuses.length });
+            this.partialUpdates = partialUpdates;
+            console.log('Import task info set:', { artifactSetId, jobCount: jobStatuses.length });
         },
 
         stopPolling() {
@@ -109,8 +113,8 @@ window.importTask = function() {
             }
 
             try {
-                if (!this.tempDir) {
-                    throw new Error('No temporary directory specified for import');
+                if (!this.artifactSetId) {
+                    throw new Error('No validation results specified for import');
                 }
                 if (!this.jobStatuses || !this.jobStatuses.length) {
                     throw new Error('No jobs specified for import');
@@ -128,7 +132,8 @@ window.importTask = function() {
                 
                 const requestBody = { 
                     jobStatuses: this.jobStatuses,
-                    tempDir: this.tempDir
+                    artifactSetId: this.artifactSetId,
+                    partialUpdates: this.partialUpdates
                 };
                 
                 console.log('Sending import request with data:', requestBody);
@@ -170,6 +175,57 @@ window.importTask = function() {
         async pollImportStatus() {
             this.stopPolling();
 
+            // Apply a status payload, returns true once the task reached a final state
+            const applyStatus = (data) => {
+                console.log('Import status update:', data);
+                
+                if (!data.status) {
+                    throw new Error('Invalid status response: missing status field');
+                }
+                
+                this.importStatus = data.status;
+                // Position in the task queue while waiting to start
+                this.queuePosition = data.queuePosition || null;
+                this.importOutput = data.output || this.importOutput;
+                this.logRecords = data.logRecords || [];
+                this.jobImportStatuses = data.jobImportStatuses || [];
+                
+                if (data.progress) {
+                    this.progressStats = {
+                        total: this.progressStats.total,
+                        jobsToImport: this.progressStats.jobsToImport,
+                        imported: data.progress.imported || 0,
+                        skipped_unchanged: 0, // We no longer track skipped jobs
+                        failed: data.progress.failed_jobs || 0,
+                    };
+                    
+                    const processedJobs = this.progressStats.imported + 
+                                        this.progressStats.failed;
+                    
+                    const totalJobsToProcess = this.progressStats.jobsToImport;
+                    
+                    this.progressStats.percentComplete = totalJobsToProcess > 0 ? 
+                        Math.round((processedJobs / totalJobsToProcess) * 100) : 0;
+                }
+
+                if (['completed', 'failed', 'completed_with_errors'].includes(data.status)) {
+                    if (data.status === 'completed' && data.progress?.failed_jobs > 0) {
+                        this.importStatus = 'completed_with_errors';
+                    }
+                    
+                    console.log('Import finished with status:', data.status);
+                    this.stopPolling();
+                    // Dispatch event when import is complete
+                    console.log('Dispatching import-completed event');
+                    window.dispatchEvent(new CustomEvent('import-completed', {"detail": data}));
+                    // Dispatch event to refresh workspace info
+                    console.log('Dispatching refresh-workspace-info event');
+                    window.dispatchEvent(new CustomEvent('refresh-workspace-info'));
+                    return true;
+                }
+                return false;
+            };
+
             const poll = async () => {
                 if (!this.importTaskId) {
                     console.log('No import job ID, stopping polling');
@@ -185,51 +241,7 @@ window.importTask = function() {
                         throw new Error(`Failed to fetch import status: ${response.statusText}`);
                     }
                     
-                    const data = await response.json();
-                    console.log('Import status update:', data);
-                    
-                    if (!data.status) {
-                        throw new Error('Invalid status response: missing status field');
-                    }
-                    
-                    this.importStatus = data.status;
-                    this.importOutput = data.output || this.importOutput;
-                    this.logRecords = data.logRecords || [];
-                    this.jobImportStatuses = data.jobImportStatuses || [];
-                    
-                    if (data.progress) {
-                        this.progressStats = {
-                            total: this.progressStats.total,
-                            jobsToImport: this.progressStats.jobsToImport,
-                            imported: data.progress.imported || 0,
-                            skipped_unchanged: 0, // We no longer track skipped jobs
-                            failed: data.progress.failed_jobs || 0,
-                        };
-                        
-                        const processedJobs = this.progressStats.imported + 
-                                            this.progressStats.failed;
-                        
-                        const totalJobsToProcess = this.progressStats.jobsToImport;
-                        
-                        this.progressStats.percentComplete = totalJobsToProcess > 0 ? 
-                            Math.round((processedJobs / totalJobsToProcess) * 100) : 0;
-                    }
-
-                    if (['completed', 'failed', 'completed_with_errors'].includes(data.status)) {
-                        if (data.status === 'completed' && data.progress?.failed_jobs > 0) {
-                            this.importStatus = 'completed_with_errors';
-                        }
-                        
-                        console.log('Import finished with status:', data.status);
-                        this.stopPolling();
-                        // Dispatch event when import is complete
-                        console.log('Dispatching import-completed event');
-                        window.dispatchEvent(new CustomEvent('import-completed', {"detail": data}));
-                        // Dispatch event to refresh workspace info
-                        console.log('Dispatching refresh-workspace-info event');
-                        window.dispatchEvent(new CustomEvent('refresh-workspace-info'));
-                        return;
-                    }
+                    applyStatus(await response.json());
                 } catch (err) {
                     console.error('Error polling import status:', err);
                     this.importStatus = 'failed';
@@ -239,15 +251,27 @@ window.importTask = function() {
                 }
             };
 
-            // Initial poll
-            await poll();
+            const startPolling = async () => {
+                // Initial poll
+                await poll();
             
-            // Set up polling interval if not in final state
-            if (!['completed', 'failed', 'completed_with_errors'].includes(this.importStatus)) {
-                console.log('Setting up polling interval');
-                this.pollingInterval = setInterval(poll, 1000);
-            } else {
-                console.log('Not setting up polling - already in final state:', this.importStatus);
+                // Set up polling interval if not in final state
+                if (!['completed', 'failed', 'completed_with_errors'].includes(this.importStatus)) {
+                    console.log('Setting up polling interval');
+                    this.pollingInterval = setInterval(poll, 1000);
+                } else {
+                    console.log('Not setting up polling - already in final state:', this.importStatus);
+                }
+            };
+
+            // Prefer pushed incremental events, fall back to polling if streaming is unavailable
+            const streaming = window.streamTaskStatus(
+                `/api/import/${this.importTaskId}/events`,
+                applyStatus,
+                startPolling
+            );
+            if (!streaming) {
+                await startPolling();
             }
         }
     }
@@ -11,6 +11,7 @@ window.importValidationTaskComponent = function() {
         jobStatuses: [],
         importMessage: '',
         pollingInterval: null,
+        queuePosition: null,
         importSummary: {
             new: 0,
             changed: 0,
@@ -126,6 +127,59 @@ window.importValidationTaskComponent = function() {
         async pollImportStatus() {
             this.stopPolling(); // Clear any existing polling
 
+            // Apply a status payload, returns true once the task reached a final state
+            const applyStatus = (data) => {
+                console.log('Import status update:', data);
+                
+                // Update status before other properties to ensure watcher triggers properly
+                this.importStatus = data.status;
+                // Position in the task queue while waiting to start
+                this.queuePosition = data.queuePosition || null;
+                
+                // Update other properties
+                this.importMessage = data.message || this.importMessage;
+                this.taskIssues = data.taskIssues || [];
+                this.jobStatuses = data.jobStatuses || [];
+                this.importOutput = data.logRecords?.join('') || '';
+
+                // Calculate summary counts
+                this.importSummary = {
+                    new: this.jobStatuses.filter(job => job.status === 'new').length,
+                    changed: this.jobStatuses.filter(job => job.status === 'changed').length,
+                    unchanged: this.jobStatuses.filter(job => job.status === 'unchanged').length,
+                    deleted: this.jobStatuses.filter(job => job.status === 'deleted').length,
+                    error: this.jobStatuses.filter(job => job.status === 'error').length
+                };
+
+                // Update progress stats
+                if (data.progress) {
+                    this.progressStats = data.progress;
+                }
+
+                // Stop polling if we're in a final state
+                if (['completed', 'completed_with_warnings', 'completed_with_errors', 'completed_no_changes'].includes(data.status)) {
+                    console.log('Import validation finished with status:', data.status);
+                    this.stopPolling();
+                    console.log('Dispatching pre-import-validation-completed event with details');
+                    window.dispatchEvent(new CustomEvent('pre-import-validation-completed', {
+                        detail: {
+                            status: data.status,
+                            message: data.message,
+                            taskIssues: data.taskIssues || [],
+                            jobStatuses: data.jobStatuses || [],
+                            summary: this.importSummary,
+                            artifactSetId: data.artifactSetId
+                        }
+                    }));
+                    return true;
+                } else if (data.status === 'failed') {
+                    console.log('Import validation failed');
+                    this.stopPolling();
+                    return true;
+                }
+                return false;
+            };
+
             const poll = async () => {
                 if (!this.importTaskId) {
                     console.log('No import job ID, stopping polling');
@@ -141,53 +195,7 @@ window.importValidationTaskComponent = function() {
                         throw new Error(`Failed to fetch import status: ${response.statusText}`);
                     }
                     
-                    const data = await response.json();
-                    console.log('Import status update:', data);
-                    
-                    // Update status before other properties to ensure watcher triggers properly
-                    this.importStatus = data.status;
-                    
-                    // Update other properties
-                    this.importMessage = data.message || this.importMessage;
-                    this.taskIssues = data.taskIssues || [];
-                    this.jobStatuses = data.jobStatuses || [];
-                    this.importOutput = data.logRecords?.join('') || '';
-
-                    // Calculate summary counts
-                    this.importSummary = {
-                        new: this.jobStatuses.filter(job => job.status === 'new').length,
-                        changed: this.jobStatuses.filter(job => job.status === 'changed').length,
-                        unchanged: this.jobStatuses.filter(job => job.status === 'unchanged').length,
-                        deleted: this.jobStatuses.filter(job => job.status === 'deleted').length,
-                        error: this.jobStatuses.filter(job => job.status === 'error').length
-                    };
-
-                    // Update progress stats
-                    if (data.progress) {
-                        this.progressStats = data.progress;
-                    }
-
-                    // Stop polling if we're in a final state
-                    if (['completed', 'completed_with_warnings', 'completed_with_errors', 'completed_no_changes'].includes(data.status)) {
-                        console.log('Import validation finished with status:', data.status);
-                        this.stopPolling();
-                        console.log('Dispatching pre-import-validation-completed event with details');
-                        window.dispatchEvent(new CustomEvent('pre-import-validation-completed', {
-                            detail: {
-                                status: data.status,
-                                message: data.message,
-                                taskIssues: data.taskIssues || [],
-                                jobStatuses: data.jobStatuses || [],
-                                summary: this.importSummary,
-                                tempDir: data.tempDir
-                            }
-                        }));
-                        return;
-                    } else if (data.status === 'failed') {
-                        console.log('Import validation failed');
-                        this.stopPolling();
-                        return;
-                    }
+                    applyStatus(await response.json());
                 } catch (err) {
                     console.error('Error polling import status:', err);
                     this.importStatus = 'failed';
@@ -198,15 +206,27 @@ window.importValidationTaskComponent = function() {
                 }
             };
 
-            // Initial poll
-            await poll();
+            const startPolling = async () => {
+                // Initial poll
+                await poll();
             
-            // Only set up polling interval if not already in a final state
-            if (!['completed', 'failed', 'completed_with_warnings', 'completed_with_errors', 'completed_no_changes'].includes(this.importStatus)) {
-                console.log('Setting up polling interval');
-                this.pollingInterval = setInterval(poll, 1000);
-            } else {
-                console.log('Not setting up polling - already in final state:', this.importStatus);
+                // Only set up polling interval if not already in a final state
+                if (!['completed', 'failed', 'completed_with_warnings', 'completed_with_errors', 'completed_no_changes'].includes(this.importStatus)) {
+                    console.log('Setting up polling interval');
+                    this.pollingInterval = setInterval(poll, 1000);
+                } else {
+                    console.log('Not setting up polling - already in final state:', this.importStatus);
+                }
+            };
+
+            // Prefer pushed incremental events, fall back to polling if streaming is unavailable
+            const streaming = window.streamTaskStatus(
+                `/api/pre-import-validation/${this.importTaskId}/events`,
+                applyStatus,
+                startPolling
+            );
+            if (!streaming) {
+                await startPolling();
             }
         }
     }
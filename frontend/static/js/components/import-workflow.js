@@ -10,6 +10,9 @@ window.importWorkflow = function() {
 
         currentStage: "NONE",
 
+        // Update changed jobs with only their changed settings instead of full resets
+        partialUpdates: false,
+
         stageResults: {
             PRE_VALIDATION: null,
             IMPORT: null,
@@ -191,7 +194,8 @@ window.importWorkflow = function() {
                         window.dispatchEvent(new CustomEvent('start-import', {
                             detail: {
                                 jobStatuses: jobsToImport,
-                                tempDir: validationResults.tempDir
+                                artifactSetId: validationResults.artifactSetId,
+                                partialUpdates: this.partialUpdates
                             }
                         }));
                     }
@@ -219,7 +223,7 @@ window.importWorkflow = function() {
                         window.dispatchEvent(new CustomEvent('start-delete', {
                             detail: {
                                 jobStatuses: validationResults.jobStatuses,
-                                tempDir: validationResults.tempDir
+                                artifactSetId: validationResults.artifactSetId
                             }
                         }));
                     }
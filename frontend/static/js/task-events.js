@@ -0,0 +1,78 @@
+// Push-based task status updates over Server-Sent Events.
+//
+// The server sends one 'snapshot' event with the full status payload (same shape as the /status endpoints)
+// followed by incremental events only. This helper applies them to a local copy of the status
+// and calls onStatus(status) with the updated copy after every event.
+// Returns false if EventSource is not available, so that the caller can fall back to polling.
+window.streamTaskStatus = function(url, onStatus, onFallback) {
+    if (!window.EventSource) {
+        return false;
+    }
+
+    const source = new EventSource(url);
+    let status = null;
+    let keyIndexes = {};
+    let finished = false;
+
+    const handle = (eventType, apply) => {
+        source.addEventListener(eventType, (event) => {
+            const data = JSON.parse(event.data);
+            if (eventType !== 'snapshot' && !status) {
+                return;
+            }
+            apply(data);
+            onStatus({ ...status });
+        });
+    };
+
+    handle('snapshot', (data) => {
+        status = data.state;
+        keyIndexes = {};
+        for (const [field, keys] of Object.entries(data.keys || {})) {
+            keyIndexes[field] = new Map(keys.map((key, idx) => [key, idx]));
+        }
+    });
+
+    handle('status', (data) => {
+        Object.assign(status, data.fields);
+    });
+
+    handle('progress', (data) => {
+        status.progress = { ...(status.progress || {}), ...data.changes };
+    });
+
+    handle('output', (data) => {
+        status.output = (status.output || '') + data.text;
+    });
+
+    handle('append', (data) => {
+        status[data.field] = (status[data.field] || []).concat(data.items);
+    });
+
+    handle('upsert', (data) => {
+        const entries = [...(status[data.field] || [])];
+        const indexes = keyIndexes[data.field] || (keyIndexes[data.field] = new Map());
+        if (indexes.has(data.key)) {
+            entries[indexes.get(data.key)] = data.entry;
+        } else {
+            indexes.set(data.key, entries.length);
+            entries.push(data.entry);
+        }
+        status[data.field] = entries;
+    });
+
+    handle('done', () => {
+        finished = true;
+        source.close();
+    });
+
+    source.onerror = () => {
+        source.close();
+        if (!finished) {
+            console.warn('Task event stream interrupted, falling back to polling:', url);
+            onFallback();
+        }
+    };
+
+    return true;
+};
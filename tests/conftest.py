@@ -0,0 +1,9 @@
+import os
+import tempfile
+
+# The local app state (artifact store, run journals, task store) of the tests goes to a scratch directory,
+# set before the backend modules read it
+os.environ.setdefault("APP_STATE_DIR", tempfile.mkdtemp(prefix="dbr-workflow-jobs-sync-tests-"))
+os.environ.setdefault("TASK_STORE", "memory")
+# Running tasks are synced (and their state published to event subscribers) faster than in the app
+os.environ.setdefault("TASK_STORE_SYNC_INTERVAL_SECONDS", "0.05")
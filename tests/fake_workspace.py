@@ -0,0 +1,120 @@
+import io
+import types
+from typing import Dict, Optional
+
+from databricks.sdk.errors import NotFound
+from databricks.sdk.service.jobs import BaseJob, Job, JobSettings
+from databricks.sdk.service.workspace import ObjectInfo, ObjectType
+
+
+class FakeJobsAPI:
+    """In-memory stand-in for WorkspaceClient.jobs, recording the calls made"""
+
+    def __init__(self, jobs: Optional[Dict[int, dict]] = None):
+        # Job ID -> settings (as dict)
+        self.jobs = jobs or {}
+        # Job ID -> creator, admin@example.com when not set
+        self.creators = {}
+        # Settings returned by jobs.get but not by the listing, like the real API (e.g. run_as when not set explicitly)
+        self.get_only_settings = {}
+        # Tasks returned per job by an expanded listing, the entry has has_more beyond it
+        self.max_listed_tasks = 100
+        self.calls = []
+
+    def list(self, expand_tasks: bool = False, name: Optional[str] = None, limit: Optional[int] = None, **kwargs):
+        self.calls.append(('list', name))
+        for job_id, settings in list(self.jobs.items()):
+            if name is not None and settings.get('name') != name:
+                continue
+            listed = dict(settings)
+            has_more = False
+            if not expand_tasks:
+                listed.pop('tasks', None)
+                listed.pop('job_clusters', None)
+            elif len(listed.get('tasks', [])) > self.max_listed_tasks:
+                listed['tasks'] = listed['tasks'][:self.max_listed_tasks]
+                has_more = True
+            yield BaseJob.from_dict({'job_id': job_id, 'creator_user_name': self.get_creator(job_id), 'settings': listed, 'has_more': has_more})
+
+    def get(self, job_id: int) -> Job:
+        self.calls.append(('get', job_id))
+        if job_id not in self.jobs:
+            raise NotFound(f"Job {job_id} does not exist")
+        settings = {**self.jobs[job_id], **self.get_only_settings}
+        return Job.from_dict({'job_id': job_id, 'creator_user_name': self.get_creator(job_id), 'settings': settings})
+
+    def get_creator(self, job_id: int) -> str:
+        return self.creators.get(job_id, 'admin@example.com')
+
+    def create(self, **kwargs):
+        self.calls.append(('create', kwargs.get('name')))
+        job_id = max(self.jobs, default=100) + 1
+        self.jobs[job_id] = JobSettings(**kwargs).as_dict()
+        return types.SimpleNamespace(job_id=job_id)
+
+    def reset(self, job_id: int, new_settings: JobSettings):
+        self.calls.append(('reset', job_id))
+        self.jobs[job_id] = new_settings.as_dict()
+
+    def update(self, job_id: int, new_settings: Optional[JobSettings] = None, fields_to_remove=None):
+        self.calls.append(('update', job_id))
+        self.jobs[job_id].update(new_settings.as_dict() if new_settings else {})
+        for field in fields_to_remove or []:
+            self.jobs[job_id].pop(field, None)
+
+    def delete(self, job_id: int):
+        self.calls.append(('delete', job_id))
+        del self.jobs[job_id]
+
+
+class FakeWorkspaceAPI:
+    """In-memory stand-in for WorkspaceClient.workspace, holding files only (folders exist implicitly)"""
+
+    def __init__(self):
+        # Path -> (content, modified_at)
+        self.files = {}
+        self.calls = []
+
+    def put(self, path: str, content: bytes):
+        modified_at = max((modified_at for _, modified_at in self.files.values()), default=0) + 1
+        self.files[path] = (content, modified_at)
+
+    def get_status(self, path: str) -> ObjectInfo:
+        self.calls.append(('get_status', path))
+        if path in self.files:
+            content, modified_at = self.files[path]
+            return ObjectInfo(path=path, object_type=ObjectType.FILE, modified_at=modified_at, size=len(content))
+        if any(file_path.startswith(path.rstrip('/') + '/') for file_path in self.files):
+            return ObjectInfo(path=path, object_type=ObjectType.DIRECTORY)
+        raise NotFound(f"Path ({path}) doesn't exist.")
+
+    def list(self, path: str, **kwargs):
+        self.calls.append(('list', path))
+        folder = path.rstrip('/') + '/'
+        return [ObjectInfo(path=file_path, object_type=ObjectType.FILE, modified_at=modified_at, size=len(content))
+                for file_path, (content, modified_at) in self.files.items()
+                if file_path.startswith(folder) and '/' not in file_path[len(folder):]]
+
+    def download(self, path: str, **kwargs):
+        self.calls.append(('download', path))
+        if path not in self.files:
+            raise NotFound(f"Path ({path}) doesn't exist.")
+        return io.BytesIO(self.files[path][0])
+
+    def upload(self, path: str, content, overwrite: bool = False, **kwargs):
+        self.calls.append(('upload', path))
+        self.put(path, content if isinstance(content, bytes) else content.read())
+
+    def delete(self, path: str, **kwargs):
+        self.calls.append(('delete', path))
+        del self.files[path]
+
+
+class FakeWorkspaceClient:
+    def __init__(self, jobs: Optional[Dict[int, dict]] = None):
+        self.jobs = FakeJobsAPI(jobs)
+        self.workspace = FakeWorkspaceAPI()
+        # No clusters or SQL warehouses in the workspace
+        self.clusters = types.SimpleNamespace(list=lambda: [])
+        self.warehouses = types.SimpleNamespace(list=lambda: [])
+        self.config = types.SimpleNamespace(host="https://example.cloud.databricks.com")
@@ -0,0 +1,80 @@
+import time
+import types
+import random
+
+import pytest
+
+from backend.util import adaptive_concurrency
+from backend.util.adaptive_concurrency import AdaptiveConcurrencyLimiter, get_concurrency_limiter, get_worker_pool_size
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(adaptive_concurrency, 'time', types.SimpleNamespace(monotonic=clock.monotonic, time=time.time))
+    return clock
+
+def send_requests(limiter, clock, latencies, family: str = 'jobs.get', overloaded: bool = False):
+    for latency in latencies:
+        limiter.acquire()
+        started_at = clock.now
+        clock.now += latency
+        limiter.release(family, started_at, overloaded)
+
+def count_decreases(limiter) -> int:
+    return sum(1 for entry in limiter.history if entry['reason'].startswith('decrease'))
+
+
+def test_limit_grows_under_steady_load(clock):
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=16, baseline_window_seconds=30)
+    rng = random.Random(7)
+    send_requests(limiter, clock, [rng.uniform(0.1, 0.18) for _ in range(2000)])
+    assert count_decreases(limiter) == 0
+    assert limiter.limit == 16
+
+def test_limit_is_cut_when_latency_climbs(clock):
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8, max_limit=8, baseline_window_seconds=30)
+    send_requests(limiter, clock, [0.1] * 50)
+    send_requests(limiter, clock, [0.4] * 5)
+    assert count_decreases(limiter) >= 1
+    assert limiter.limit < 8
+
+def test_limit_is_cut_when_throttled(clock):
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8, max_limit=8)
+    send_requests(limiter, clock, [0.1], overloaded=True)
+    assert limiter.limit == 4
+
+def test_sustained_latency_becomes_the_baseline_after_two_windows(clock):
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8, max_limit=8, baseline_window_seconds=30)
+    send_requests(limiter, clock, [0.1] * 50)
+    # The slower latency lasts longer than two baseline windows
+    send_requests(limiter, clock, [0.4] * 200)
+    decreases = count_decreases(limiter)
+    assert decreases >= 1
+    send_requests(limiter, clock, [0.4] * 200)
+    assert count_decreases(limiter) == decreases
+    assert limiter.history[-1]['reason'] == 'increase'
+
+def test_request_families_have_their_own_baseline(clock):
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=16, baseline_window_seconds=30)
+    for _ in range(100):
+        send_requests(limiter, clock, [0.05], family='jobs.get')
+        send_requests(limiter, clock, [1.0], family='jobs.list')
+    assert count_decreases(limiter) == 0
+
+def test_worker_pool_size_follows_the_configured_threads_and_the_limiter(monkeypatch):
+    monkeypatch.setattr(adaptive_concurrency, 'NUM_THREADS', 4)
+    monkeypatch.setattr(adaptive_concurrency, 'MAX_NUM_THREADS', 16)
+    monkeypatch.setattr(adaptive_concurrency, '_limiter', AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=16))
+    assert get_worker_pool_size() == 4
+    get_concurrency_limiter()._limit = 10.0
+    assert get_worker_pool_size() == 10
+    get_concurrency_limiter()._limit = 1.0
+    assert get_worker_pool_size() == 4
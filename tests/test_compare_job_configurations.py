@@ -0,0 +1,61 @@
+from backend.util.canonical_job_json import canonicalize_job
+from backend.util.compare_job_configurations import compare_job_configurations, compute_comparison_hash
+
+
+def make_job(job_id: int, referenced_job_id: int, reverse_tasks: bool = False) -> dict:
+    tasks = [
+        {'task_key': 'main', 'notebook_task': {'notebook_path': '/Jobs/etl'}},
+        {'task_key': 'trigger', 'depends_on': [{'task_key': 'main'}], 'run_job_task': {'job_id': referenced_job_id}},
+    ]
+    return {'job_id': job_id, 'settings': {'name': 'etl', 'tasks': list(reversed(tasks)) if reverse_tasks else tasks}}
+
+
+def test_task_order_and_job_ids_are_not_differences():
+    job = make_job(1, 10)
+    other = make_job(2, 20, reverse_tasks=True)
+    assert compute_comparison_hash(canonicalize_job(job)) == compute_comparison_hash(canonicalize_job(other))
+    assert compare_job_configurations(job, other) == (False, [])
+
+def test_changed_setting_is_a_difference():
+    job = make_job(1, 10)
+    other = make_job(1, 10)
+    other['settings']['tasks'][0]['notebook_task']['notebook_path'] = '/Jobs/other'
+    assert compute_comparison_hash(canonicalize_job(job)) != compute_comparison_hash(canonicalize_job(other))
+    is_different, differences = compare_job_configurations(job, other)
+    assert is_different
+    assert any('notebook_path' in difference for difference in differences)
+
+def test_inputs_are_not_modified():
+    job = make_job(1, 10, reverse_tasks=True)
+    other = make_job(2, 20)
+    compare_job_configurations(job, other)
+    assert job == make_job(1, 10, reverse_tasks=True)
+
+def make_pipeline_job(task_keys: list, upstream_task_keys: list) -> dict:
+    """Job whose last task 'report' depends on all the other tasks"""
+    tasks = [{'task_key': task_key, 'notebook_task': {'notebook_path': f'/Jobs/{task_key}'}} for task_key in task_keys]
+    tasks.append({'task_key': 'report', 'depends_on': [{'task_key': task_key} for task_key in upstream_task_keys],
+                  'notebook_task': {'notebook_path': '/Jobs/report'}})
+    return {'settings': {'name': 'pipeline', 'tasks': tasks}}
+
+def test_reordered_tasks_and_dependencies_are_equal():
+    job = make_pipeline_job(['ingest', 'clean', 'enrich'], ['ingest', 'clean', 'enrich'])
+    other = make_pipeline_job(['enrich', 'ingest', 'clean'], ['clean', 'enrich', 'ingest'])
+    other['settings']['tasks'].reverse()
+    assert compare_job_configurations(job, other) == (False, [])
+
+def test_tasks_are_compared_by_task_key():
+    job = make_pipeline_job(['ingest', 'clean', 'enrich'], ['ingest', 'clean', 'enrich'])
+    # clean is removed, publish is added and the notebook of enrich is changed, in another task order
+    other = make_pipeline_job(['publish', 'enrich', 'ingest'], ['ingest', 'enrich'])
+    other['settings']['tasks'][1]['notebook_task']['notebook_path'] = '/Jobs/enrich_v2'
+
+    is_different, differences = compare_job_configurations(job, other)
+
+    assert is_different
+    assert sorted(differences) == sorted([
+        "settings.tasks[task_key=clean]: {'task_key': 'clean', 'notebook_task': {'notebook_path': '/Jobs/clean'}} → (removed)",
+        "settings.tasks[task_key=enrich].notebook_task.notebook_path: /Jobs/enrich → /Jobs/enrich_v2",
+        "settings.tasks[task_key=publish]: (added) → {'task_key': 'publish', 'notebook_task': {'notebook_path': '/Jobs/publish'}}",
+        "settings.tasks[task_key=report].depends_on[task_key=clean]: {'task_key': 'clean'} → (removed)",
+    ])
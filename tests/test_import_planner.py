@@ -0,0 +1,70 @@
+from backend.util.import_planner import (
+    ImportPlan, OPERATION_CREATE, OPERATION_DELETE, OPERATION_NOOP, OPERATION_RESET, get_job_reference_name
+)
+
+
+def job_status(job_name: str, status: str, job_references=()) -> dict:
+    return {'job_name': job_name, 'status': status, 'job_references': list(job_references)}
+
+
+def test_operations_by_status():
+    plan = ImportPlan([
+        job_status('new_job', 'new'),
+        job_status('changed_job', 'changed'),
+        job_status('unchanged_job', 'unchanged'),
+        job_status('deleted_job', 'deleted'),
+    ], existing_job_names=['changed_job', 'unchanged_job', 'deleted_job'])
+
+    assert plan.get_operation('new_job')['operation'] == OPERATION_CREATE
+    assert plan.get_operation('changed_job')['operation'] == OPERATION_RESET
+    assert plan.get_operation('unchanged_job')['operation'] == OPERATION_NOOP
+    # Deletes only with include_deletes
+    assert plan.get_operation('deleted_job')['operation'] == OPERATION_NOOP
+    assert plan.waves == [['changed_job', 'new_job']]
+
+def test_waves_follow_references_to_created_jobs_and_deletes_come_last():
+    plan = ImportPlan([
+        job_status('orchestrator', 'new', ['pipeline', 'existing']),
+        job_status('pipeline', 'new', ['ingest']),
+        job_status('ingest', 'new'),
+        job_status('report', 'changed', ['pipeline']),
+        job_status('existing', 'unchanged'),
+        job_status('old', 'deleted'),
+    ], existing_job_names=['report', 'existing', 'old'], include_deletes=True)
+
+    assert plan.waves == [['ingest'], ['pipeline'], ['orchestrator', 'report'], ['old']]
+    # References to jobs that already exist do not constrain the order
+    assert plan.get_operation('orchestrator')['depends_on'] == ['pipeline']
+    assert not plan.unplannable
+    assert plan.describe() == "3 create, 1 delete, 1 noop, 1 reset in 4 wave(s)"
+
+def test_reference_cycle_between_created_jobs_is_unplannable():
+    plan = ImportPlan([
+        job_status('a', 'new', ['b']),
+        job_status('b', 'new', ['a']),
+        job_status('c', 'new'),
+        job_status('d', 'new', ['a']),
+    ], existing_job_names=[])
+
+    assert plan.waves == [['c']]
+    assert set(plan.unplannable) == {'a', 'b', 'd'}
+    assert 'cycle' in plan.unplannable['a']
+
+def test_self_reference_does_not_form_a_cycle():
+    plan = ImportPlan([job_status('loop', 'new', ['loop'])], existing_job_names=[])
+    assert plan.waves == [['loop']]
+
+def test_delete_of_a_job_still_referenced_is_unplannable():
+    plan = ImportPlan([
+        job_status('caller', 'changed', ['callee']),
+        job_status('callee', 'deleted'),
+        job_status('unused', 'deleted'),
+    ], existing_job_names=['caller', 'callee', 'unused'], include_deletes=True)
+
+    assert plan.get_operation('callee')['operation'] == OPERATION_DELETE
+    assert 'callee' in plan.unplannable
+    assert plan.waves == [['caller'], ['unused']]
+
+def test_job_reference_placeholders():
+    assert get_job_reference_name('__JOB__nightly-etl__') == 'nightly-etl'
+    assert get_job_reference_name(123) is None
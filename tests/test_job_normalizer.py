@@ -0,0 +1,40 @@
+from backend.util.canonical_job_json import canonicalize_job
+from backend.util.compare_job_configurations import compare_job_configurations
+from backend.util.job_normalizer import normalize_job_settings
+
+GIT_SOURCE = {'git_url': 'https://github.com/example/jobs', 'git_provider': 'gitHub', 'git_branch': 'main'}
+
+
+def make_settings(notebook_source=None, git_source=None) -> dict:
+    notebook_task = {'notebook_path': '/Shared/etl'}
+    if notebook_source:
+        notebook_task['source'] = notebook_source
+    settings = {'name': 'etl', 'max_concurrent_runs': 1, 'tasks': [{'task_key': 'main', 'notebook_task': notebook_task}]}
+    if git_source:
+        settings['git_source'] = git_source
+    return settings
+
+
+def test_server_defaults_are_removed():
+    normalized = normalize_job_settings(make_settings(notebook_source='WORKSPACE'))
+    assert 'max_concurrent_runs' not in normalized
+    assert normalized['tasks'][0]['notebook_task'] == {'notebook_path': '/Shared/etl'}
+
+def test_workspace_source_is_kept_for_jobs_with_git_source():
+    settings = make_settings(notebook_source='WORKSPACE', git_source=GIT_SOURCE)
+    assert normalize_job_settings(settings)['tasks'][0]['notebook_task']['source'] == 'WORKSPACE'
+    # Exported definitions keep it, so that importing them does not move the task to the Git source
+    assert canonicalize_job({'settings': settings})['settings']['tasks'][0]['notebook_task']['source'] == 'WORKSPACE'
+
+def test_workspace_task_differs_from_git_task_for_jobs_with_git_source():
+    workspace_task_job = {'settings': make_settings(notebook_source='WORKSPACE', git_source=GIT_SOURCE)}
+    git_task_job = {'settings': make_settings(git_source=GIT_SOURCE)}
+    is_different, differences = compare_job_configurations(workspace_task_job, git_task_job)
+    assert is_different
+    assert differences
+
+def test_normalization_does_not_modify_its_input():
+    settings = make_settings(notebook_source='WORKSPACE')
+    normalize_job_settings(settings)
+    assert settings['tasks'][0]['notebook_task']['source'] == 'WORKSPACE'
+    assert settings['max_concurrent_runs'] == 1
@@ -0,0 +1,42 @@
+import json
+import types
+
+from backend.util.canonical_job_json import dumps_canonical
+from backend.util.job_selector import JobSelector
+from backend.worker_jobs_export import is_orphan_file_selected
+
+
+def make_live_job(name: str, creator: str, **settings) -> dict:
+    return {'job_id': 1, 'creator_user_name': creator, 'settings': {'name': name, **settings}}
+
+def make_job_file(live_job: dict) -> dict:
+    """Content of the exported definition file of a live job"""
+    return json.loads(dumps_canonical(live_job))
+
+
+def test_creators_select_files_by_their_live_job():
+    selector = JobSelector(creators=['alice@example.com'])
+    alice_job = make_live_job('etl-a', 'alice@example.com')
+    bob_job = make_live_job('etl-b', 'bob@example.com')
+    assert 'creator_user_name' not in make_job_file(alice_job)
+
+    assert selector.matches_job_file(make_job_file(alice_job), alice_job)
+    assert not selector.matches_job_file(make_job_file(bob_job), bob_job)
+
+def test_file_content_selects_a_file_whose_live_job_does_not_match():
+    selector = JobSelector(tags=['team=data'])
+    live_job = make_live_job('etl', 'alice@example.com', tags={'team': 'web'})
+    job_file = make_job_file(make_live_job('etl', 'alice@example.com', tags={'team': 'data'}))
+
+    assert selector.matches_job_file(job_file, live_job)
+    assert not selector.matches_job_file(make_job_file(live_job), live_job)
+
+def test_orphan_files_are_checked_on_their_content():
+    job_file = dumps_canonical(make_live_job('etl', 'alice@example.com', tags={'team': 'data'}))
+    mirror = types.SimpleNamespace(read=lambda entry: (job_file.encode(), False))
+    file_entry = types.SimpleNamespace(path='/Workspace/Jobs/etl.json')
+
+    # Files do not record their creator, the creators criterion does not apply to them
+    assert is_orphan_file_selected(JobSelector(creators=['alice@example.com']), mirror, file_entry)
+    assert is_orphan_file_selected(JobSelector(tags=['team=data']), mirror, file_entry)
+    assert not is_orphan_file_selected(JobSelector(tags=['team=web']), mirror, file_entry)
@@ -0,0 +1,71 @@
+from backend.util.job_settings_delta import compute_job_settings_delta, get_payload_size
+
+
+def make_job(**settings) -> dict:
+    return {'job_id': 1, 'settings': {'name': 'etl', **settings}}
+
+def notebook_task(task_key: str, notebook_path: str = '/Jobs/etl', **fields) -> dict:
+    return {'task_key': task_key, 'notebook_task': {'notebook_path': notebook_path}, **fields}
+
+
+def test_identical_jobs_have_an_empty_delta():
+    job = make_job(tasks=[notebook_task('a'), notebook_task('b')], tags={'team': 'data'})
+    assert compute_job_settings_delta(job, job) == {'new_settings': {}, 'fields_to_remove': []}
+
+def test_task_order_is_not_a_change():
+    existing = make_job(tasks=[notebook_task('a'), notebook_task('b')])
+    new = make_job(tasks=[notebook_task('b'), notebook_task('a')])
+    assert compute_job_settings_delta(existing, new) == {'new_settings': {}, 'fields_to_remove': []}
+
+def test_changed_top_level_settings_are_sent():
+    existing = make_job(tags={'team': 'data'}, timeout_seconds=600)
+    new = make_job(tags={'team': 'platform'}, timeout_seconds=600)
+    assert compute_job_settings_delta(existing, new) == {'new_settings': {'tags': {'team': 'platform'}}, 'fields_to_remove': []}
+
+def test_keyed_lists_send_changed_entries_in_full_and_remove_missing_ones():
+    existing = make_job(
+        tasks=[notebook_task('a'), notebook_task('b'), notebook_task('c')],
+        job_clusters=[{'job_cluster_key': 'small', 'new_cluster': {'num_workers': 1}}]
+    )
+    new = make_job(
+        tasks=[notebook_task('a'), notebook_task('b', max_retries=3), notebook_task('d')],
+        job_clusters=[{'job_cluster_key': 'small', 'new_cluster': {'num_workers': 1}}]
+    )
+    delta = compute_job_settings_delta(existing, new)
+    # A changed task is sent with all its fields (jobs.update replaces each sent entry)
+    assert delta['new_settings'] == {'tasks': [notebook_task('b', max_retries=3), notebook_task('d')]}
+    assert delta['fields_to_remove'] == ['tasks/c']
+
+def test_removed_field_is_listed_in_fields_to_remove():
+    existing = make_job(tags={'team': 'data'}, description='Nightly ETL')
+    new = make_job(tags={'team': 'data'})
+    assert compute_job_settings_delta(existing, new) == {'new_settings': {}, 'fields_to_remove': ['description']}
+
+def test_removed_field_with_server_default_is_reset_to_the_default():
+    existing = make_job(max_concurrent_runs=5, timeout_seconds=600)
+    new = make_job()
+    delta = compute_job_settings_delta(existing, new)
+    assert delta == {'new_settings': {'max_concurrent_runs': 1, 'timeout_seconds': 0}, 'fields_to_remove': []}
+
+def test_removing_a_non_removable_field_needs_a_reset():
+    existing = make_job(run_as={'service_principal_name': '8a1b2c3d-0000-0000-0000-000000000000'})
+    new = make_job()
+    assert compute_job_settings_delta(existing, new) is None
+
+def test_keyed_list_without_unique_keys_needs_a_reset():
+    existing = make_job(tasks=[notebook_task('a'), notebook_task('b')])
+    new = make_job(tasks=[notebook_task('a'), notebook_task('a', '/Jobs/other')])
+    assert compute_job_settings_delta(existing, new) is None
+
+def test_other_changed_lists_need_a_reset():
+    existing = make_job(parameters=[{'name': 'env', 'default': 'dev'}], tasks=[notebook_task('a')])
+    new = make_job(parameters=[{'name': 'env', 'default': 'prod'}], tasks=[notebook_task('a')])
+    assert compute_job_settings_delta(existing, new) is None
+
+def test_new_list_is_sent_in_full():
+    existing = make_job(tasks=[notebook_task('a')])
+    new = make_job(tasks=[notebook_task('a')], parameters=[{'name': 'env', 'default': 'dev'}])
+    assert compute_job_settings_delta(existing, new)['new_settings'] == {'parameters': [{'name': 'env', 'default': 'dev'}]}
+
+def test_payload_size():
+    assert get_payload_size({'job_id': 1}) == len('{"job_id": 1}')
@@ -0,0 +1,62 @@
+import pytest
+
+from backend.util.artifact_store import ArtifactStore
+from backend.util.dbr_workspace_utils import list_jobs_expanded
+from backend.util.job_snapshot import JobSnapshot, JOB_CREATED, JOB_DELETED, JOB_MODIFIED
+from backend.worker_jobs_validate import JobimportValidationTaskComponent
+from tests.fake_workspace import FakeWorkspaceClient
+
+
+def make_tasks(count: int) -> list:
+    return [{'task_key': f'task_{index}', 'notebook_task': {'notebook_path': f'/Jobs/task_{index}'}} for index in range(count)]
+
+@pytest.fixture
+def client():
+    client = FakeWorkspaceClient({
+        # Complete in the listing
+        1: {'name': 'small', 'tasks': make_tasks(2)},
+        # Truncated in the listing, completed with jobs.get
+        2: {'name': 'large', 'tasks': make_tasks(5)},
+    })
+    client.jobs.max_listed_tasks = 3
+    # The listing and jobs.get responses of a job differ
+    client.jobs.get_only_settings = {'run_as': {'user_name': 'admin@example.com'}}
+    return client
+
+def publish_snapshot(tmp_path, client) -> JobSnapshot:
+    """Snapshot published by validation, loaded from its artifact set like import and delete do"""
+    validation = JobimportValidationTaskComponent('snapshot-test', client)
+    validation.artifact_set = ArtifactStore(root=str(tmp_path / "artifacts")).new_set()
+    validation.all_listed_jobs = list_jobs_expanded(client)
+    existing_job_definitions = {2: client.jobs.get(2).as_dict()}
+    validation.publish_job_snapshot(existing_job_definitions)
+    return JobSnapshot.load(validation.artifact_set)
+
+
+@pytest.mark.parametrize('job_name', ['small', 'large'])
+def test_unchanged_jobs_are_not_reported_modified(tmp_path, client, job_name):
+    snapshot = publish_snapshot(tmp_path, client)
+    assert snapshot.check_job(client, job_name) is None
+
+@pytest.mark.parametrize('job_id, job_name', [(1, 'small'), (2, 'large')])
+def test_modified_jobs_are_reported(tmp_path, client, job_id, job_name):
+    snapshot = publish_snapshot(tmp_path, client)
+    client.jobs.jobs[job_id]['max_concurrent_runs'] = 5
+    assert snapshot.check_job(client, job_name) == JOB_MODIFIED
+
+def test_renamed_job_is_reported_modified(tmp_path, client):
+    snapshot = publish_snapshot(tmp_path, client)
+    client.jobs.jobs[1]['name'] = 'renamed'
+    assert snapshot.check_job(client, 'small') == JOB_MODIFIED
+
+@pytest.mark.parametrize('job_id, job_name', [(1, 'small'), (2, 'large')])
+def test_deleted_jobs_are_reported(tmp_path, client, job_id, job_name):
+    snapshot = publish_snapshot(tmp_path, client)
+    del client.jobs.jobs[job_id]
+    assert snapshot.check_job(client, job_name) == JOB_DELETED
+
+def test_created_job_is_reported(tmp_path, client):
+    snapshot = publish_snapshot(tmp_path, client)
+    client.jobs.jobs[3] = {'name': 'new', 'tasks': make_tasks(1)}
+    assert snapshot.check_job(client, 'new') == JOB_CREATED
+    assert snapshot.check_job(client, 'missing') is None
@@ -0,0 +1,76 @@
+import uuid
+import asyncio
+import threading
+
+from backend.task_manager import TaskManager
+from backend.routers import api_task_events_router
+from backend.routers.api_task_events_router import TaskType, task_events
+from backend.routers.api_export_router import build_export_status
+
+task_manager = TaskManager()
+
+
+def add_export_task() -> tuple[str, dict]:
+    task_id = str(uuid.uuid4())
+    task = {
+        'task_id': task_id,
+        'type': 'export',
+        'status': 'running',
+        'output': 'Starting export process...\n',
+        'progress': {'total_jobs': 2, 'processed_jobs': 0, 'exported_modified': 0, 'exported_unchanged': 0,
+                     'failed_jobs': 0, 'deleted_files': 0}
+    }
+    task_manager.add_task(task_id, task, 'export', build_export_status)
+    return task_id, task
+
+async def collect_events(task_id: str) -> list:
+    return [event async for event in task_events(TaskType.EXPORT, task_id)]
+
+
+def test_published_state_version_changes_only_with_the_task_state():
+    task_id, task = add_export_task()
+    version, state = task_manager.get_published_task_state(task_id, 'export')
+    assert state['status'] == 'running'
+
+    task_manager._sync_task(task_id, task)
+    assert task_manager.get_published_task_state(task_id, 'export')[0] == version
+
+    task['progress']['exported_modified'] += 1
+    task_manager._sync_task(task_id, task)
+    new_version, new_state = task_manager.get_published_task_state(task_id, 'export')
+    assert new_version > version
+    assert new_state['progress']['exported_modified'] == 1
+    # Another task type does not get the state
+    assert task_manager.get_published_task_state(task_id, 'import') is None
+
+    task_manager.update_task(task_id, status='completed')
+    task_manager._sync_task(task_id, task)
+    assert task_manager.get_published_task_state(task_id, 'export') is None
+
+def test_events_stream_changes_until_the_task_is_done(monkeypatch):
+    monkeypatch.setattr(api_task_events_router, 'EVENTS_CHECK_INTERVAL_SECONDS', 0.01)
+    task_id, task = add_export_task()
+
+    def run_export():
+        for _ in range(2):
+            threading.Event().wait(0.1)
+            task['progress']['exported_modified'] += 1
+            task['output'] += "Exported job\n"
+        threading.Event().wait(0.1)
+        task_manager.update_task(task_id, status='completed')
+
+    worker = threading.Thread(target=run_export)
+    worker.start()
+    events = asyncio.run(collect_events(task_id))
+    worker.join()
+
+    assert events[0]['type'] == 'snapshot'
+    assert events[-1] == {'type': 'done', 'status': 'completed'}
+    progress_events = [event for event in events if event['type'] == 'progress']
+    assert progress_events and progress_events[-1]['changes']['exported_modified'] == 2
+    output = events[0]['state']['output'] + ''.join(event['text'] for event in events if event['type'] == 'output')
+    assert output == "Starting export process...\nExported job\nExported job\n"
+
+def test_events_of_an_unknown_task():
+    events = asyncio.run(collect_events(str(uuid.uuid4())))
+    assert events == [{'type': 'not_found', 'detail': 'Task not found'}]
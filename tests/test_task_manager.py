@@ -0,0 +1,21 @@
+import time
+import uuid
+
+from backend import task_manager as task_manager_module
+from backend.task_manager import TaskManager
+
+task_manager = TaskManager()
+
+
+def test_finished_task_expires_without_new_tasks(monkeypatch):
+    task_id = str(uuid.uuid4())
+    task_manager.add_task(task_id, {'task_id': task_id, 'type': 'export', 'status': 'running', 'output': ''})
+    monkeypatch.setattr(task_manager_module, 'TASK_COMPLETED_TTL_HOURS', 0.0)
+
+    task_manager.update_task(task_id, status='completed')
+
+    # Expired by the sync thread, with no other task added and no stats requested
+    deadline = time.time() + 5
+    while task_id in task_manager.tasks and time.time() < deadline:
+        time.sleep(0.05)
+    assert task_id not in task_manager.tasks
@@ -0,0 +1,101 @@
+import threading
+
+import pytest
+
+from backend.task_scheduler import TaskScheduler, TaskQueueFullError
+
+TIMEOUT_SECONDS = 5
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    """New scheduler (not the process-wide one), with one worker unless a test changes it before submitting"""
+    monkeypatch.setattr(TaskScheduler, '_instance', None)
+    scheduler = TaskScheduler()
+    scheduler.max_running_tasks = 1
+    return scheduler
+
+class BlockingTask:
+    """Task that runs until released"""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self):
+        self.started.set()
+        self.release.wait(TIMEOUT_SECONDS)
+
+def wait_until_done(scheduler, completed_tasks: int):
+    with scheduler._condition:
+        assert scheduler._condition.wait_for(lambda: scheduler.completed_tasks >= completed_tasks, TIMEOUT_SECONDS)
+
+
+def test_queued_tasks_start_by_priority_then_submission_order(scheduler):
+    blocker = BlockingTask()
+    scheduler.submit('blocker', 'export', blocker)
+    assert blocker.started.wait(TIMEOUT_SECONDS)
+
+    started = []
+    scheduler.submit('validation-1', 'pre-import-validation', started.append, 'validation-1')
+    scheduler.submit('export-1', 'export', started.append, 'export-1')
+    scheduler.submit('import-1', 'import', started.append, 'import-1')
+    scheduler.submit('validation-2', 'pre-import-validation', started.append, 'validation-2')
+
+    # Imports do not wait behind validations and exports
+    positions = [scheduler.get_queue_position(task_id) for task_id in ('import-1', 'validation-1', 'export-1', 'validation-2')]
+    assert positions == [1, 2, 3, 4]
+    assert scheduler.get_queue_position('blocker') is None
+    assert scheduler.get_queue_position('unknown') is None
+
+    blocker.release.set()
+    wait_until_done(scheduler, 5)
+    assert started == ['import-1', 'validation-1', 'export-1', 'validation-2']
+    assert scheduler.get_queue_position('validation-2') is None
+
+def test_tasks_of_a_type_at_its_limit_do_not_block_other_types(scheduler):
+    scheduler.max_running_tasks = 4
+    first_import, second_import, validation = BlockingTask(), BlockingTask(), BlockingTask()
+    scheduler.submit('import-1', 'import', first_import)
+    assert first_import.started.wait(TIMEOUT_SECONDS)
+    scheduler.submit('import-2', 'import', second_import)
+    scheduler.submit('validation-1', 'pre-import-validation', validation)
+
+    # One import at a time, the validation starts on a free worker
+    assert validation.started.wait(TIMEOUT_SECONDS)
+    assert not second_import.started.is_set()
+    assert scheduler.get_queue_position('import-2') == 1
+    assert scheduler.get_stats()['running_tasks_by_type'] == {'import': 1, 'pre-import-validation': 1}
+
+    first_import.release.set()
+    assert second_import.started.wait(TIMEOUT_SECONDS)
+    second_import.release.set()
+    validation.release.set()
+    wait_until_done(scheduler, 3)
+
+def test_tasks_are_rejected_when_the_queue_is_full(scheduler):
+    scheduler.max_queued_tasks = 1
+    blocker = BlockingTask()
+    scheduler.submit('blocker', 'export', blocker)
+    assert blocker.started.wait(TIMEOUT_SECONDS)
+    scheduler.submit('validation-1', 'pre-import-validation', lambda: None)
+
+    with pytest.raises(TaskQueueFullError):
+        scheduler.submit('validation-2', 'pre-import-validation', lambda: None)
+    assert scheduler.get_queue_position('validation-2') is None
+    assert scheduler.get_stats()['rejected_tasks'] == 1
+    assert scheduler.get_stats()['queued_tasks'] == 1
+
+    blocker.release.set()
+    wait_until_done(scheduler, 2)
+
+def test_failing_task_does_not_stop_its_worker(scheduler):
+    def fail():
+        raise RuntimeError("task failed")
+
+    done = threading.Event()
+    scheduler.submit('failing', 'export', fail)
+    scheduler.submit('next', 'export', done.set)
+    assert done.wait(TIMEOUT_SECONDS)
+    wait_until_done(scheduler, 2)
+    assert scheduler.get_stats()['running_tasks'] == 0
@@ -0,0 +1,51 @@
+import time
+
+import pytest
+
+from backend.util import task_store
+from backend.util.task_store import TaskStore, InMemoryTaskStore, SQLiteTaskStore
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store(request, tmp_path):
+    if request.param == 'memory':
+        return InMemoryTaskStore()
+    return SQLiteTaskStore(str(tmp_path / "tasks.sqlite"))
+
+
+def test_incomplete_store_cannot_be_created():
+    class IncompleteTaskStore(TaskStore):
+        def save_task(self, task_id, task_type, status, task_state):
+            pass
+
+    with pytest.raises(TypeError):
+        IncompleteTaskStore()
+
+def test_saved_task_state(store):
+    store.save_task('task-1', 'import', 'running', {'status': 'running', 'progress': {'imported': 2}})
+    stored = store.load_task('task-1')
+    assert stored['task_type'] == 'import'
+    assert stored['task_state'] == {'status': 'running', 'progress': {'imported': 2}}
+    store.delete_task('task-1')
+    assert store.load_task('task-1') is None
+
+def test_run_lock_is_held_until_released_or_abandoned(store, monkeypatch):
+    assert store.acquire_run_lock('import', 'task-1')
+    # Even the same task cannot take it twice
+    assert not store.acquire_run_lock('import', 'task-1')
+    assert not store.acquire_run_lock('import', 'task-2')
+    assert store.acquire_run_lock('delete', 'task-3')
+
+    store.release_run_lock('import', 'task-1')
+    assert store.acquire_run_lock('import', 'task-2')
+
+    # Without heartbeats, the lock is abandoned after the timeout
+    monkeypatch.setattr(task_store, 'TASK_HEARTBEAT_TIMEOUT_SECONDS', 0.05)
+    time.sleep(0.1)
+    assert store.acquire_run_lock('import', 'task-4')
+
+def test_prune_forgets_old_tasks(store):
+    store.save_task('old', 'export', 'completed', {})
+    pruned_before = time.time() + 1
+    store.prune(pruned_before)
+    assert store.load_task('old') is None
@@ -0,0 +1,75 @@
+import uuid
+
+from backend.util.artifact_store import ArtifactStore, VALIDATED_JOBS
+from backend.util.import_planner import OPERATION_CREATE
+from backend.util.job_snapshot import JobSnapshot, JOB_CREATED
+from backend.util.run_journal import RunJournal
+from backend.worker_jobs_import import JobImportTaskComponent
+from tests.fake_workspace import FakeWorkspaceClient
+
+
+def make_notebook_job(name: str, referenced_job_name: str = None) -> dict:
+    tasks = [{'task_key': 'main', 'notebook_task': {'notebook_path': f'/Jobs/{name}'}}]
+    if referenced_job_name:
+        tasks.append({'task_key': 'trigger', 'run_job_task': {'job_id': f'__JOB__{referenced_job_name}__'}})
+    return {'settings': {'name': name, 'tasks': tasks}}
+
+def make_artifact_set(tmp_path, validated_jobs: dict):
+    artifact_set = ArtifactStore(root=str(tmp_path / "artifacts")).new_set()
+    for name, job_dict in validated_jobs.items():
+        artifact_set.put(VALIDATED_JOBS, name, job_dict)
+    # Validation saw none of the jobs in the workspace
+    JobSnapshot({}).save(artifact_set)
+    artifact_set.save()
+    return artifact_set
+
+def start_interrupted_import(artifact_set, job_statuses: list, in_flight_job_name: str) -> RunJournal:
+    """Journal of an import that stopped while the creation of a job was in flight"""
+    import_task_id = uuid.uuid4().hex
+    journal = RunJournal.create(import_task_id, 'import', {'artifact_set_id': artifact_set.artifact_set_id, 'job_statuses': job_statuses})
+    journal.record_started(in_flight_job_name, operation=OPERATION_CREATE)
+    journal.close()
+    return RunJournal.open_existing(import_task_id)
+
+JOB_STATUSES = [
+    {'job_name': 'parent', 'status': 'new', 'job_references': []},
+    {'job_name': 'child', 'status': 'new', 'job_references': ['parent']},
+]
+
+
+def test_resume_recovers_create_in_flight_and_resolves_references(tmp_path):
+    artifact_set = make_artifact_set(tmp_path, {'parent': make_notebook_job('parent'), 'child': make_notebook_job('child', 'parent')})
+    journal = start_interrupted_import(artifact_set, JOB_STATUSES, 'parent')
+    # The interrupted run created the job but did not record it
+    client = FakeWorkspaceClient({101: {'name': 'parent', 'tasks': []}})
+
+    import_task = JobImportTaskComponent(journal.run_id, client, artifact_set, JOB_STATUSES, journal=journal)
+    import_task.process_import_task()
+
+    assert import_task.status == 'completed'
+    assert ('create', 'parent') not in client.jobs.calls
+    assert ('reset', 101) in client.jobs.calls
+    assert import_task.created_job_ids['parent'] == 101
+    child_settings = next(settings for settings in client.jobs.jobs.values() if settings['name'] == 'child')
+    assert child_settings['tasks'][1]['run_job_task']['job_id'] == 101
+
+    # A later resume sees the recovered job as created by the import
+    resumed = RunJournal.open_existing(journal.run_id)
+    assert resumed.completed['parent'] == {'operation': OPERATION_CREATE, 'job_id': 101}
+    resumed.close()
+
+def test_resume_fails_cleanly_when_created_job_is_gone(tmp_path, monkeypatch):
+    artifact_set = make_artifact_set(tmp_path, {'parent': make_notebook_job('parent'), 'child': make_notebook_job('child', 'parent')})
+    journal = start_interrupted_import(artifact_set, JOB_STATUSES, 'parent')
+    # Seen as created by the staleness check, deleted before it is looked up
+    monkeypatch.setattr(JobSnapshot, 'check_job', lambda self, client, job_name: JOB_CREATED)
+    client = FakeWorkspaceClient()
+
+    import_task = JobImportTaskComponent(journal.run_id, client, artifact_set, JOB_STATUSES, journal=journal)
+    import_task.process_import_task()
+
+    assert import_task.status == 'completed_with_errors'
+    assert import_task.job_import_statuses['parent']['import_status'] == 'error'
+    assert 'not found in the workspace' in import_task.job_import_statuses['parent']['error_message']
+    assert import_task.job_import_statuses['child']['import_status'] == 'error'
+    assert not [call for call in client.jobs.calls if call[0] in ('create', 'reset')]
@@ -0,0 +1,54 @@
+import uuid
+
+import pytest
+
+from backend.util.canonical_job_json import dumps_canonical
+from backend.util.job_selector import JobSelector
+from backend.worker_jobs_validate import JobimportValidationTaskComponent
+from tests.fake_workspace import FakeWorkspaceClient
+
+
+def make_notebook_job(name: str) -> dict:
+    return {'name': name, 'tasks': [{'task_key': 'main', 'notebook_task': {'notebook_path': f'/Jobs/{name}'}}]}
+
+@pytest.fixture
+def client(monkeypatch):
+    # One Git folder per test, the local mirror of the folder is shared by the whole process
+    folder = f"/Workspace/Jobs-{uuid.uuid4().hex}"
+    monkeypatch.setenv("WORKSPACE_GIT_FOLDER_PATH", folder)
+    client = FakeWorkspaceClient({1: make_notebook_job('etl-a'), 2: make_notebook_job('etl-b')})
+    client.jobs.creators = {1: 'alice@example.com', 2: 'bob@example.com'}
+    client.folder = folder
+    return client
+
+def export_job_file(client, job_id: int, **changed_settings):
+    """Write the definition file of a live job to the Git folder, with some settings changed"""
+    job_dict = client.jobs.get(job_id).as_dict()
+    job_dict['settings'].update(changed_settings)
+    client.workspace.put(f"{client.folder}/{job_dict['settings']['name']}.json", dumps_canonical(job_dict).encode())
+
+def validate(client, selector: JobSelector):
+    validation = JobimportValidationTaskComponent(uuid.uuid4().hex, client, selector=selector)
+    validation.process_import_validation_task()
+    return {status['job_name']: status for status in validation.job_validation_statuses}
+
+
+def test_creators_select_canonical_files_by_their_live_job(client):
+    export_job_file(client, 1, max_concurrent_runs=3)
+    export_job_file(client, 2, max_concurrent_runs=3)
+    client.workspace.put(f"{client.folder}/etl-new.json", dumps_canonical({'settings': make_notebook_job('etl-new')}).encode())
+
+    statuses = validate(client, JobSelector(creators=['alice@example.com']))
+
+    # The file of etl-b is skipped, its job is not reported as deleted; files without a live job have no creator to check
+    assert {name: status['status'] for name, status in statuses.items()} == {'etl-a': 'changed', 'etl-new': 'new'}
+
+def test_file_selected_by_run_as_is_compared_with_its_live_job(client):
+    client.jobs.jobs[1]['run_as'] = {'user_name': 'bob@example.com'}
+    # The run_as change about to be imported selects the file
+    export_job_file(client, 1, run_as={'user_name': 'alice@example.com'})
+
+    statuses = validate(client, JobSelector(run_as=['alice@example.com']))
+
+    assert statuses['etl-a']['status'] == 'changed'
+    assert any('run_as' in difference for difference in statuses['etl-a']['differences'])
@@ -0,0 +1,23 @@
+import uuid
+
+from backend.util.workspace_folder_mirror import WorkspaceFolderMirror
+from tests.fake_workspace import FakeWorkspaceClient
+
+
+def test_job_files_named_like_the_manifest_are_mirrored():
+    client = FakeWorkspaceClient()
+    folder = f"/Workspace/Jobs-{uuid.uuid4().hex}"
+    for name in ('_manifest', 'manifest', 'etl'):
+        client.workspace.put(f"{folder}/{name}.json", f'{{"settings": {{"name": "{name}"}}}}'.encode())
+
+    mirror = WorkspaceFolderMirror(client, folder)
+    for entry in client.workspace.list(folder):
+        assert mirror.read(entry)[1]
+    mirror.save()
+
+    # A new process reloads the manifest and serves all files from the local mirror
+    reloaded = WorkspaceFolderMirror(client, folder)
+    for entry in client.workspace.list(folder):
+        content, downloaded = reloaded.read(entry)
+        assert not downloaded
+        assert content == client.workspace.files[entry.path][0]